@@ -5,30 +5,48 @@ synthetic discussions between Large Language Model (LLM) user-agents.
 from .experiments import DiscussionExperiment, AnnotationExperiment
 from .actors import Actor
 from .jobs import Discussion, Annotation, Logs
-from .logging import logging_setup
-from .model import TransformersModel, OpenAIModel, BaseModel
+from .memory import SummaryMemory
+from .logging import logging_setup, log_context
+from .model import TransformersModel, OpenAIModel, RemoteModel, BaseModel
+from .server import ModelServer
+from .sweep import DiscussionSweep
+from .distributed import JobQueue
+from .archive import LogArchive
+from .personas import SQLitePersonaStore
 from .turn_manager import (
     RespondTurnManager,
     QueueTurnManager,
     RandomTurnManager,
+    WeightedTurnManager,
+    HawkesTurnManager,
     TurnManager,
 )
 
 __all__ = [
     "DiscussionExperiment",
     "AnnotationExperiment",
+    "DiscussionSweep",
+    "JobQueue",
+    "LogArchive",
     "Actor",
+    "SQLitePersonaStore",
     "Discussion",
     "Annotation",
     "Logs",
+    "SummaryMemory",
     "logging_setup",
+    "log_context",
     "BaseModel",
     "TransformersModel",
     "OpenAIModel",
+    "RemoteModel",
+    "ModelServer",
     "TurnManager",
     "RespondTurnManager",
     "RandomTurnManager",
     "QueueTurnManager",
+    "WeightedTurnManager",
+    "HawkesTurnManager",
 ]
 
 __version__ = "2.2.1"
@@ -0,0 +1,174 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module containing data structures for sampling speakers in constant or
+logarithmic time in the number of participants.
+"""
+
+import typing
+
+import numpy as np
+
+
+class AliasTable:
+    """
+    Samples indices with fixed probabilities in O(1) time, after O(n)
+    preprocessing (Vose's alias method).
+    """
+
+    def __init__(self, weights: typing.Sequence[float]):
+        """
+        Build the table.
+
+        :param weights: The non-negative, unnormalized weight of each index.
+        :type weights: Sequence[float]
+        :raises ValueError: if a weight is negative or all weights are zero.
+        """
+        weights = np.asarray(weights, dtype=float)
+        if len(weights) == 0:
+            raise ValueError("At least one weight is needed.")
+        if np.any(weights < 0) or not np.all(np.isfinite(weights)):
+            raise ValueError("Weights must be finite and non-negative.")
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("At least one weight must be positive.")
+
+        num_items = len(weights)
+        self.total = float(total)
+        self._prob = weights * num_items / total
+        self._alias = np.arange(num_items)
+
+        small = [i for i in range(num_items) if self._prob[i] < 1]
+        large = [i for i in range(num_items) if self._prob[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._alias[less] = more
+            self._prob[more] -= 1 - self._prob[less]
+            if self._prob[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # left over due to rounding errors
+        for i in small + large:
+            self._prob[i] = 1
+
+        self._num_items = num_items
+        # python lists are faster than arrays for single-element access
+        self._prob_list: list[float] = self._prob.tolist()
+        self._alias_list: list[int] = self._alias.tolist()
+
+    def __len__(self) -> int:
+        return self._num_items
+
+    def sample(self, rng: np.random.Generator) -> int:
+        """
+        Draw an index.
+
+        :param rng: The source of randomness.
+        :type rng: np.random.Generator
+        :return: The sampled index.
+        :rtype: int
+        """
+        column = int(rng.integers(self._num_items))
+        if rng.random() < self._prob_list[column]:
+            return column
+        return self._alias_list[column]
+
+
+class FenwickTree:
+    """
+    Non-negative values supporting point updates and sampling an index
+    proportionally to its value, both in O(log n) time (a binary indexed
+    tree of prefix sums).
+    """
+
+    def __init__(self, values: typing.Sequence[float]):
+        """
+        Build the tree in O(n) time.
+
+        :param values: The initial, non-negative values.
+        :type values: Sequence[float]
+        """
+        self._values = [float(value) for value in values]
+        self._num_items = len(self._values)
+        self._tree = [0.0] + self._values
+        for i in range(1, self._num_items + 1):
+            parent = i + (i & -i)
+            if parent <= self._num_items:
+                self._tree[parent] += self._tree[i]
+        self.total = sum(self._values)
+
+        self._top_bit = 1
+        while self._top_bit * 2 <= self._num_items:
+            self._top_bit *= 2
+
+    def __len__(self) -> int:
+        return self._num_items
+
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+    def values(self) -> list[float]:
+        """
+        Get all values.
+
+        :return: A copy of the values, in order.
+        :rtype: list[float]
+        """
+        return list(self._values)
+
+    def add(self, index: int, delta: float) -> None:
+        """
+        Add *delta* to the value at *index*.
+
+        :param index: The index of the value.
+        :type index: int
+        :param delta: The amount added, which must not make the value
+            negative.
+        :type delta: float
+        """
+        self._values[index] += delta
+        self.total += delta
+        i = index + 1
+        while i <= self._num_items:
+            self._tree[i] += delta
+            i += i & -i
+
+    def sample(self, rng: np.random.Generator) -> int:
+        """
+        Draw an index with probability proportional to its value.
+
+        :param rng: The source of randomness.
+        :type rng: np.random.Generator
+        :return: The sampled index.
+        :rtype: int
+        """
+        remaining = rng.random() * self.total
+        position = 0
+        bit = self._top_bit
+        while bit:
+            candidate = position + bit
+            if (
+                candidate <= self._num_items
+                and self._tree[candidate] <= remaining
+            ):
+                position = candidate
+                remaining -= self._tree[candidate]
+            bit //= 2
+        # only exceeds the last index due to rounding errors
+        return min(position, self._num_items - 1)
@@ -0,0 +1,167 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module serializing discussion logs with the fastest available JSON
+backend: orjson or msgspec if installed (``pip install syndisco[fast]``),
+the standard library otherwise. All backends produce and accept the same
+JSON documents.
+"""
+
+import json
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+_REQUIRED_ENTRY_KEYS = ("name", "text", "model")
+
+
+def get_backend() -> str:
+    """
+    Get the name of the library used to encode JSON.
+
+    :return: One of ``"orjson"``, ``"msgspec"`` and ``"json"``.
+    :rtype: str
+    """
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+def dumps(obj: typing.Any) -> bytes:
+    """
+    Encode an object as compact, UTF-8 encoded JSON.
+
+    :param obj: A JSON-serializable object.
+    :type obj: Any
+    :return: The encoded object.
+    :rtype: bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf8"
+    )
+
+
+def loads(data: bytes | str) -> typing.Any:
+    """
+    Decode a JSON document.
+
+    :param data: The JSON document.
+    :type data: bytes | str
+    :raises ValueError: if *data* is not valid JSON.
+    :return: The decoded object.
+    :rtype: Any
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        if msgspec is not None:
+            return msgspec.json.decode(data)
+        return json.loads(data)
+    # the errors of all backends subclass ValueError
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+
+
+def decode_log_entries(data: bytes | str) -> list[dict[str, str]]:
+    """
+    Decode and validate a document written by :meth:`Logs.export`.
+
+    :param data: The JSON document.
+    :type data: bytes | str
+    :raises ValueError: if *data* is not valid JSON, or does not match the
+        expected schema.
+    :return: The log entries, each with a ``name``, ``text``, ``model``
+        and ``prompt``.
+    :rtype: list[dict[str, str]]
+    """
+    if msgspec is not None:
+        # decoded and validated in a single pass
+        try:
+            document = _LOG_FILE_DECODER.decode(data)
+        except ValueError as e:
+            raise ValueError(f"Invalid log file: {e}") from e
+        return [
+            {
+                "name": entry.name,
+                "text": entry.text,
+                "model": entry.model,
+                "prompt": entry.prompt,
+            }
+            for entry in document.logs
+        ]
+
+    document = loads(data)
+    if not isinstance(document, dict) or "logs" not in document:
+        raise ValueError("Missing required key 'logs' in JSON schema.")
+    if not isinstance(document["logs"], list):
+        raise ValueError("'logs' must be a list.")
+
+    entries = []
+    for i, entry in enumerate(document["logs"]):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Log entry {i} is not an object.")
+
+        missing = [key for key in _REQUIRED_ENTRY_KEYS if key not in entry]
+        if missing:
+            raise ValueError(
+                f"Log entry {i} is missing required keys: {missing}."
+            )
+
+        prompt = entry.get("prompt", "")
+        values = [entry[key] for key in _REQUIRED_ENTRY_KEYS] + [prompt]
+        if not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Log entry {i} has non-string fields.")
+
+        entries.append(
+            {
+                "name": entry["name"],
+                "text": entry["text"],
+                "model": entry["model"],
+                "prompt": prompt,
+            }
+        )
+    return entries
+
+
+if msgspec is not None:
+
+    class _LogEntry(msgspec.Struct):
+        name: str
+        text: str
+        model: str
+        prompt: str = ""
+
+    class _LogFile(msgspec.Struct):
+        logs: list[_LogEntry]
+
+    _LOG_FILE_DECODER = msgspec.json.Decoder(_LogFile)
@@ -0,0 +1,358 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module containing rate limiting and retry utilities for remote LLM backends.
+"""
+
+import random
+import threading
+import time
+import typing
+import logging
+from pathlib import Path
+
+
+logger = logging.getLogger(Path(__file__).name)
+
+T = typing.TypeVar("T")
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket, refilled continuously at a fixed rate.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: typing.Callable[[], float] = time.monotonic,
+        sleep: typing.Callable[[float], None] = time.sleep,
+    ):
+        """
+        Create a full token bucket.
+
+        :param capacity: The maximum number of tokens the bucket holds.
+        :type capacity: float
+        :param refill_per_second: How many tokens are added every second.
+        :type refill_per_second: float
+        :param clock: Monotonic time source, in seconds.
+        :type clock: Callable[[], float]
+        :param sleep: Function used to wait for the bucket to refill.
+        :type sleep: Callable[[float], None]
+        """
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError(
+                "Token bucket capacity and refill rate must be positive."
+            )
+
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """
+        Remove *amount* tokens from the bucket, blocking until they are
+        available. Requests larger than the capacity are clamped to it, so
+        that they eventually go through instead of blocking forever.
+
+        :param amount: The number of tokens to remove.
+        :type amount: float
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_time = (amount - self._tokens) / self.refill_per_second
+            self._sleep(wait_time)
+
+    def release(self, amount: float) -> None:
+        """
+        Return unused tokens to the bucket, e.g. when a request used fewer
+        tokens than were reserved for it.
+
+        :param amount: The number of tokens to return.
+        :type amount: float
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self.refill_per_second
+        )
+        self._last_refill = now
+
+
+class RateLimiter:
+    """
+    Enforces requests-per-minute and tokens-per-minute budgets for an
+    API endpoint. Either budget may be omitted.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+        sleep: typing.Callable[[float], None] = time.sleep,
+    ):
+        """
+        Create a rate limiter.
+
+        :param requests_per_minute: Maximum requests per minute,
+            None for no limit.
+        :type requests_per_minute: int | None
+        :param tokens_per_minute: Maximum (prompt and completion) tokens per
+            minute, None for no limit.
+        :type tokens_per_minute: int | None
+        :param clock: Monotonic time source, in seconds.
+        :type clock: Callable[[], float]
+        :param sleep: Function used to wait for the budget to refill.
+        :type sleep: Callable[[float], None]
+        """
+        self._request_bucket = (
+            TokenBucket(
+                requests_per_minute, requests_per_minute / 60, clock, sleep
+            )
+            if requests_per_minute is not None
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(
+                tokens_per_minute, tokens_per_minute / 60, clock, sleep
+            )
+            if tokens_per_minute is not None
+            else None
+        )
+
+    def acquire(self, num_tokens: int) -> None:
+        """
+        Block until one request of (an estimated) *num_tokens* tokens fits
+        in the budget.
+
+        :param num_tokens: The estimated tokens used by the request.
+        :type num_tokens: int
+        """
+        if self._request_bucket is not None:
+            self._request_bucket.acquire(1)
+        if self._token_bucket is not None:
+            self._token_bucket.acquire(num_tokens)
+
+    def refund(self, num_tokens: int) -> None:
+        """
+        Return tokens which were reserved, but not used, by a request.
+
+        :param num_tokens: The number of unused tokens.
+        :type num_tokens: int
+        """
+        if self._token_bucket is not None and num_tokens > 0:
+            self._token_bucket.release(num_tokens)
+
+
+def retry_with_backoff(
+    func: typing.Callable[[], T],
+    is_retryable: typing.Callable[[Exception], bool],
+    max_retries: int,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    sleep: typing.Callable[[float], None] | None = None,
+    rng: random.Random | None = None,
+) -> T:
+    """
+    Call *func*, retrying with exponential backoff and full jitter when
+    it raises a retryable exception.
+
+    :param func: The function to call.
+    :type func: Callable[[], T]
+    :param is_retryable: Decides whether an exception warrants a retry.
+        Other exceptions are raised immediately.
+    :type is_retryable: Callable[[Exception], bool]
+    :param max_retries: How many times to retry before re-raising.
+    :type max_retries: int
+    :param base_delay: The backoff ceiling (seconds) of the first retry,
+        doubled on every subsequent retry.
+    :type base_delay: float
+    :param max_delay: The maximum delay between two attempts, in seconds.
+    :type max_delay: float
+    :param sleep: Function used to wait between attempts,
+        defaults to :func:`time.sleep`.
+    :type sleep: Callable[[float], None] | None
+    :param rng: Source of jitter, defaults to the global random generator.
+    :type rng: random.Random | None
+    :return: The return value of *func*.
+    :rtype: T
+    """
+    sleep = sleep if sleep is not None else time.sleep
+    uniform = rng.uniform if rng is not None else random.uniform
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+
+            # full jitter avoids synchronized retry bursts between workers
+            delay = uniform(0, min(max_delay, base_delay * 2**attempt))
+            attempt += 1
+            logger.warning(
+                f"Request failed ({e}). Retrying in {delay:.2f}s "
+                f"(attempt {attempt}/{max_retries})."
+            )
+            sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of in-flight requests to a backend, adapting the
+    limit with an additive-increase/multiplicative-decrease (AIMD) policy.
+
+    The limit grows by roughly one for every ``limit`` successful requests,
+    and is multiplied by ``backoff_factor`` when a request signals overload,
+    i.e. fails with a rate-limit/server error or exceeds the latency
+    threshold.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: int | None = None,
+        latency_threshold: float | None = None,
+        backoff_factor: float = 0.5,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """
+        Create an adaptive concurrency limiter.
+
+        :param max_limit: The maximum number of concurrent requests.
+        :type max_limit: int
+        :param min_limit: The minimum number of concurrent requests.
+        :type min_limit: int
+        :param initial_limit: The starting limit, defaults to *min_limit*.
+        :type initial_limit: int | None
+        :param latency_threshold: Requests slower than this many seconds
+            count as overload. None to only react to errors.
+        :type latency_threshold: float | None
+        :param backoff_factor: The factor by which the limit is multiplied
+            on overload.
+        :type backoff_factor: float
+        :param clock: Monotonic time source, in seconds.
+        :type clock: Callable[[], float]
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(
+                "Concurrency limits must satisfy 1 <= min_limit <= max_limit,"
+                f" but got min_limit={min_limit}, max_limit={max_limit}."
+            )
+        if not 0 < backoff_factor < 1:
+            raise ValueError(
+                f"backoff_factor must be in (0, 1), but is {backoff_factor}"
+            )
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold = latency_threshold
+        self.backoff_factor = backoff_factor
+        self._clock = clock
+
+        if initial_limit is None:
+            initial_limit = min_limit
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._last_decrease = -float("inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current maximum number of concurrent requests."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently holding a slot."""
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """
+        Block until a request slot is available, then take it.
+
+        :return: The time the slot was taken, to be passed to
+            :meth:`release`.
+        :rtype: float
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return self._clock()
+
+    def release(self, start_time: float, overloaded: bool = False) -> None:
+        """
+        Free a request slot and adapt the limit to the request's outcome.
+
+        :param start_time: The value returned by :meth:`acquire`.
+        :type start_time: float
+        :param overloaded: Whether the request failed due to the backend
+            being overloaded (e.g. a 429 or 5xx response).
+        :type overloaded: bool
+        """
+        with self._condition:
+            self._in_flight -= 1
+            latency = self._clock() - start_time
+            if self.latency_threshold is not None:
+                overloaded = overloaded or latency > self.latency_threshold
+
+            if overloaded:
+                # requests sent before the last decrease reflect the old
+                # limit, so they should not decrease it again
+                if start_time >= self._last_decrease:
+                    self._decrease()
+            else:
+                self._limit = min(
+                    self.max_limit, self._limit + 1 / self._limit
+                )
+            self._condition.notify_all()
+
+    def get_metrics(self) -> dict[str, float]:
+        """
+        Get the current state of the limiter.
+
+        :return: The current limit and number of in-flight requests.
+        :rtype: dict[str, float]
+        """
+        return {"concurrency_limit": self.limit, "in_flight": self.in_flight}
+
+    def _decrease(self) -> None:
+        old_limit = self.limit
+        self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+        self._last_decrease = self._clock()
+        logger.debug(
+            f"Backend overloaded, concurrency limit {old_limit} -> "
+            f"{self.limit}"
+        )
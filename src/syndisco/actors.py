@@ -19,6 +19,7 @@
 Module defining LLM users in discussions and their characteristics.
 """
 
+import sys
 import typing
 import json
 
@@ -33,8 +34,21 @@ class Actor:
     """
     An abstract class representing an actor which responds according to an
     underlying LLM instance.
+
+    Simulations may create thousands of actors, so actors have no
+    per-instance ``__dict__``, and the context and instructions, which are
+    usually shared by all actors, are interned.
     """
 
+    __slots__ = (
+        "_model",
+        "persona",
+        "context",
+        "instructions",
+        "is_annotator",
+        "name",
+    )
+
     def __init__(
         self,
         model: model.BaseModel | None = None,
@@ -72,8 +86,9 @@ class Actor:
         """
         self._model = model
         self.persona = persona if persona is not None else {}
-        self.context = context
-        self.instructions = instructions
+        # equal strings, e.g. read from different files, share one copy
+        self.context = sys.intern(context)
+        self.instructions = sys.intern(instructions)
         self.is_annotator = is_annotator
         self.name = name
 
@@ -139,6 +154,34 @@ class Actor:
         response = self._model.prompt(system_prompt, message_prompt)
         return response
 
+    @typing.final
+    def speak_multiple(
+        self, num_responses: int, history: list[str] | None = None
+    ) -> list[str]:
+        """
+        Sample multiple candidate messages from the actor, given the same
+        history of previous messages.
+
+        This method should not be modified. If you are subclassing Actor,
+        modify the :meth:get_user_prompt and :meth:get_system_prompt methods
+        instead.
+
+        :param num_responses: The number of candidate messages.
+        :type num_responses: int
+        :param history: A list of previous messages.
+        :type history: list[str]
+        :return: The actor's candidate messages
+        :rtype: list[str]
+        """
+        if self._model is None:
+            raise ValueError("No model provided for generation.")
+
+        system_prompt = self.get_system_prompt()
+        message_prompt = self.get_user_prompt(history)
+        return self._model.prompt_multiple(
+            system_prompt, message_prompt, num_responses
+        )
+
     @typing.final
     def get_actor_name(self) -> str:
         """
@@ -0,0 +1,249 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module storing the outputs of many jobs in a few compressed shards,
+instead of one file per job.
+
+Each job's output is compressed on its own and appended to a shard, while
+an index records where it was written, so that a single job can be read
+without decompressing the rest of its shard. Since compressed members can
+be concatenated, each shard is also a valid compressed JSON Lines file,
+readable with e.g. ``zcat``.
+"""
+
+import gzip
+import json
+import os
+import socket
+import time
+import typing
+import logging as pylog
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+logger = pylog.getLogger(Path(__file__).name)
+
+
+_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+class LogArchive:
+    """
+    A directory of rolling, compressed shards with an index for random
+    access by job ID.
+
+    Every writing process appends to its own shards and index file, so
+    that workers on different nodes may share an archive
+    (see :class:`JobQueue`). If a job is written more than once, by any
+    writer, its latest write is returned.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        compression: str = "gzip",
+        max_shard_bytes: int = 128 * 1024**2,
+        writer_id: str | None = None,
+    ):
+        """
+        Open (or create) an archive.
+
+        :param root: The directory of the archive.
+        :type root: str | Path
+        :param compression: ``"gzip"``, or ``"zstd"`` (requires the
+            zstandard package) for faster compression. Only affects new
+            shards; shards of either kind can always be read.
+        :type compression: str, defaults to "gzip"
+        :param max_shard_bytes: The size after which a new shard is
+            started.
+        :type max_shard_bytes: int, defaults to 128 MiB
+        :param writer_id: Name of this writer's shards and index.
+            Defaults to the host name and process ID.
+        :type writer_id: str | None
+        :raises ValueError: if the compression is unknown.
+        :raises ImportError: if zstd compression is requested, but
+            zstandard is not installed.
+        """
+        if compression not in _SUFFIXES:
+            raise ValueError(
+                f"Unknown compression {compression}, expected one of "
+                f"{list(_SUFFIXES)}."
+            )
+        if compression == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstd compression requires the zstandard package "
+                "(pip install zstandard)."
+            )
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.max_shard_bytes = max_shard_bytes
+        self.writer_id = writer_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        self._index: dict[str, dict[str, typing.Any]] | None = None
+        # continue from the last shard of a previous run of this writer
+        self._shard_num = max(
+            len(list(self.root.glob(self._shard_pattern()))) - 1, 0
+        )
+
+    def append(self, job_id: str, data: bytes) -> None:
+        """
+        Compress and store the output of a job.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :param data: The job's output, typically a single-line JSON
+            document.
+        :type data: bytes
+        """
+        member = _compress(data + b"\n", self.compression)
+        shard_path = self._current_shard()
+        with open(shard_path, "ab") as fout:
+            offset = fout.tell()
+            fout.write(member)
+
+        # the index is only updated once the data is written, so that it
+        # never points to incomplete data
+        location = {
+            "job_id": job_id,
+            "shard": shard_path.name,
+            "offset": offset,
+            "length": len(member),
+            "time": time.time(),
+        }
+        index_path = self.root / f"index-{self.writer_id}.jsonl"
+        with open(index_path, "a", encoding="utf8") as fout:
+            fout.write(json.dumps(location) + "\n")
+
+        if self._index is not None:
+            self._index[job_id] = location
+
+    def get(self, job_id: str) -> bytes:
+        """
+        Read the output of a single job.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :raises KeyError: if no job with this ID was archived.
+        :return: The job's output, as given to :meth:`append`.
+        :rtype: bytes
+        """
+        location = self._lookup(job_id)
+        if location is None:
+            raise KeyError(f"No job {job_id} in archive {self.root}")
+
+        with open(self.root / location["shard"], "rb") as fin:
+            fin.seek(location["offset"])
+            member = fin.read(location["length"])
+        return _decompress(member, location["shard"])[:-1]
+
+    def job_ids(self) -> list[str]:
+        """
+        List the archived jobs.
+
+        :return: The IDs of all archived jobs, sorted.
+        :rtype: list[str]
+        """
+        self._index = None
+        return sorted(self._get_index())
+
+    def __contains__(self, job_id: object) -> bool:
+        return isinstance(job_id, str) and self._lookup(job_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.job_ids())
+
+    def _current_shard(self) -> Path:
+        shard_path = self._shard_path(self._shard_num)
+        if (
+            shard_path.exists()
+            and shard_path.stat().st_size >= self.max_shard_bytes
+        ):
+            self._shard_num += 1
+            shard_path = self._shard_path(self._shard_num)
+        return shard_path
+
+    def _shard_path(self, shard_num: int) -> Path:
+        return (
+            self.root
+            / f"shard-{self.writer_id}-{shard_num:05d}"
+            f"{_SUFFIXES[self.compression]}"
+        )
+
+    def _shard_pattern(self) -> str:
+        return f"shard-{self.writer_id}-{'[0-9]' * 5}.*"
+
+    def _lookup(self, job_id: str) -> dict[str, typing.Any] | None:
+        location = self._get_index().get(job_id)
+        if location is None:
+            # may have been written by another process since the index
+            # was loaded
+            self._index = None
+            location = self._get_index().get(job_id)
+        return location
+
+    def _get_index(self) -> dict[str, dict[str, typing.Any]]:
+        if self._index is None:
+            self._index = _read_index(self.root)
+        return self._index
+
+
+def _read_index(root: Path) -> dict[str, dict[str, typing.Any]]:
+    """
+    Merge the index files of all writers of an archive, keeping the
+    latest write of each job.
+    """
+    index = {}
+    for index_path in sorted(root.glob("index-*.jsonl")):
+        with open(index_path, "r", encoding="utf8") as fin:
+            for line in fin:
+                try:
+                    location = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line of a crashed writer may be incomplete
+                    logger.warning(f"Skipping corrupt line in {index_path}")
+                    continue
+                previous = index.get(location["job_id"], {})
+                # entries of older archives have no write time, in which
+                # case the later index file wins
+                if location.get("time", 0) >= previous.get("time", 0):
+                    index[location["job_id"]] = location
+    return index
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, mtime=0)
+
+
+def _decompress(member: bytes, shard_name: str) -> bytes:
+    if shard_name.endswith(_SUFFIXES["zstd"]):
+        if zstandard is None:
+            raise ImportError(
+                f"Reading {shard_name} requires the zstandard package "
+                "(pip install zstandard)."
+            )
+        return zstandard.ZstdDecompressor().decompress(member)
+    return gzip.decompress(member)
@@ -0,0 +1,237 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module implementing a job queue shared between processes and nodes through
+a (shared) directory.
+
+A coordinator submits the jobs of an experiment to the queue
+(see :meth:`DiscussionExperiment.submit`), and any number of workers,
+possibly on different nodes mounting the same storage, claim and run them
+(see :meth:`DiscussionExperiment.work`). No service besides the file
+system is needed.
+"""
+
+import os
+import json
+import time
+import socket
+import typing
+import logging as pylog
+from pathlib import Path
+
+
+logger = pylog.getLogger(Path(__file__).name)
+
+
+_STATES = ("pending", "claimed", "done", "failed")
+
+
+class JobQueue:
+    """
+    A job queue stored in a directory, with one JSON file per job.
+
+    Jobs move between the ``pending``, ``claimed``, ``done`` and ``failed``
+    subdirectories through atomic renames, so that each job is claimed by
+    exactly one worker. Submitting or completing a job more than once has
+    no further effect.
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Open (or create) a job queue.
+
+        :param root: The directory of the queue, on storage shared by the
+            coordinator and all workers.
+        :type root: str | Path
+        """
+        self.root = Path(root)
+        for state in _STATES:
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def submit(self, job_id: str, spec: dict[str, typing.Any]) -> bool:
+        """
+        Add a job to the queue, unless a job with the same ID was already
+        submitted.
+
+        :param job_id: A unique, file-name safe job ID.
+        :type job_id: str
+        :param spec: The JSON-serializable description of the job.
+        :type spec: dict[str, Any]
+        :return: Whether the job was added.
+        :rtype: bool
+        """
+        if self.get_state(job_id) is not None:
+            return False
+
+        _atomic_write_json(self._path("pending", job_id), spec)
+        return True
+
+    def claim(
+        self, worker_id: str | None = None
+    ) -> tuple[str, dict[str, typing.Any]] | None:
+        """
+        Claim the next pending job.
+
+        :param worker_id: Name of the claiming worker, used in logs.
+            Defaults to the host name and process ID.
+        :type worker_id: str | None
+        :return: The ID and specification of the claimed job, or None if
+            no job is pending.
+        :rtype: tuple[str, dict[str, Any]] | None
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        for pending_path in sorted((self.root / "pending").glob("*.json")):
+            job_id = pending_path.stem
+            claimed_path = self._path("claimed", job_id)
+            try:
+                # only one worker can successfully rename the file
+                os.rename(pending_path, claimed_path)
+            except FileNotFoundError:
+                continue
+
+            # a requeued job may still have been finished by its slow
+            # worker, which does not remove the requeued copy
+            if (
+                self._path("done", job_id).exists()
+                or self._path("failed", job_id).exists()
+            ):
+                claimed_path.unlink(missing_ok=True)
+                continue
+
+            # renaming keeps the modification time, which is used to
+            # detect abandoned claims
+            os.utime(claimed_path)
+            logger.debug(f"Worker {worker_id} claimed job {job_id}")
+            with open(claimed_path, "r", encoding="utf8") as fin:
+                return job_id, json.load(fin)
+
+        return None
+
+    def release(self, job_id: str) -> None:
+        """
+        Return a claimed job to the pending jobs, e.g. when the claiming
+        worker can not run it.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        """
+        os.rename(self._path("claimed", job_id), self._path("pending", job_id))
+
+    def complete(
+        self, job_id: str, result: dict[str, typing.Any] | None = None
+    ) -> None:
+        """
+        Mark a claimed job as done. Completing a job which is already done
+        has no effect.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :param result: JSON-serializable information about the result,
+            e.g. the path of the output file.
+        :type result: dict[str, Any] | None
+        """
+        done_path = self._path("done", job_id)
+        if not done_path.exists():
+            _atomic_write_json(done_path, result or {})
+        self._path("claimed", job_id).unlink(missing_ok=True)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """
+        Mark a claimed job as failed, so that it is not retried.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :param error: A description of the error.
+        :type error: str
+        """
+        if self.get_state(job_id) == "done":
+            return
+        _atomic_write_json(self._path("failed", job_id), {"error": error})
+        self._path("claimed", job_id).unlink(missing_ok=True)
+
+    def requeue_stale(self, max_age: float) -> list[str]:
+        """
+        Return jobs claimed more than *max_age* seconds ago to the pending
+        jobs, e.g. because their worker crashed.
+
+        :param max_age: The maximum duration of a job, in seconds.
+        :type max_age: float
+        :return: The IDs of the requeued jobs.
+        :rtype: list[str]
+        """
+        requeued = []
+        now = time.time()
+        for claimed_path in (self.root / "claimed").glob("*.json"):
+            try:
+                if now - claimed_path.stat().st_mtime <= max_age:
+                    continue
+                os.rename(
+                    claimed_path, self._path("pending", claimed_path.stem)
+                )
+            except FileNotFoundError:
+                # completed or requeued in the meantime
+                continue
+            requeued.append(claimed_path.stem)
+
+        if requeued:
+            logger.warning(f"Requeued {len(requeued)} abandoned jobs.")
+        return requeued
+
+    def get_state(self, job_id: str) -> str | None:
+        """
+        Get the state of a job.
+
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :return: One of ``"pending"``, ``"claimed"``, ``"done"`` and
+            ``"failed"``, or None if the job was never submitted.
+        :rtype: str | None
+        """
+        # checked in the order jobs move through, so that a job moving
+        # concurrently is not missed
+        for state in _STATES:
+            if self._path(state, job_id).exists():
+                return state
+        return None
+
+    def counts(self) -> dict[str, int]:
+        """
+        Count the jobs in each state.
+
+        :return: The number of jobs per state.
+        :rtype: dict[str, int]
+        """
+        return {
+            state: sum(1 for _ in (self.root / state).glob("*.json"))
+            for state in _STATES
+        }
+
+    def _path(self, state: str, job_id: str) -> Path:
+        return self.root / state / f"{job_id}.json"
+
+
+def _atomic_write_json(path: Path, data: dict[str, typing.Any]) -> None:
+    """
+    Write a JSON file such that readers never observe a partial file.
+    """
+    tmp_path = path.with_name(
+        f".{path.name}.{socket.gethostname()}.{os.getpid()}.tmp"
+    )
+    with open(tmp_path, "w", encoding="utf8") as fout:
+        json.dump(data, fout)
+    os.replace(tmp_path, path)
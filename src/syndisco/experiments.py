@@ -20,17 +20,22 @@ Module automating and managing batches of discussion/annotation tasks defined
 in the syndisco.jobs module.
 """
 
-import random
 import typing
+import uuid
 import datetime
 import logging as pylog
 from pathlib import Path
 
+import numpy as np
 from tqdm.auto import tqdm
 
 from . import actors
 from . import turn_manager as tmanager
 from . import jobs
+from . import distributed
+from .archive import LogArchive
+from .memory import SummaryMemory
+from .logging import log_context
 
 
 logger = pylog.getLogger(Path(__file__).name)
@@ -53,12 +58,17 @@ class DiscussionExperiment:
         num_turns: int = 10,
         num_active_users: int = 2,
         num_discussions: int = 5,
+        seed: int | None = None,
+        memory: SummaryMemory | None = None,
     ):
         """
         Initialize a synthetic discussion experiment.
 
         :param users: List of all possible participants (LLM agents).
-        :type users: list[Actor]
+            Only the participants sampled for a discussion are accessed,
+            so large populations can be given as a
+            :class:`SQLitePersonaStore`, which creates them on demand.
+        :type users: Sequence[Actor]
         :param seed_opinions:
             Seed discussion segments used to open each
             synthetic discussion. Accepts either a nested sequence where each
@@ -91,6 +101,19 @@ class DiscussionExperiment:
         :type num_active_users: int
         :param num_discussions: Total number of synthetic discussions to run.
         :type num_discussions: int
+        :param seed: Seed from which an independent random stream is
+            derived for each discussion, determining its topic,
+            participants and (if set) its turn manager's generator. Each
+            discussion can thus be reproduced on its own
+            (see :meth:`get_discussion`). If None, a random seed is drawn
+            and stored in :attr:`seed`, and the turn manager's own
+            generator is used.
+        :type seed: int | None
+        :param memory: A configured memory summarizing the comments which
+            leave the context window. One empty copy is created per
+            discussion via :meth:`SummaryMemory.make_instance`. None to
+            forget them.
+        :type memory: SummaryMemory | None
         """
         if seed_opinions is None:
             self._seed_opinions = [[]]
@@ -116,15 +139,24 @@ class DiscussionExperiment:
             raise ValueError("num_active_users must be at least 2.")
 
         self._turn_manager_template = turn_manager
+        self._memory_template = memory
         self._history_ctx_len = history_ctx_len
         self._num_active_users = num_active_users
         self._num_discussions = num_discussions
         self._num_turns = num_turns
 
+        self._use_seeded_turn_managers = seed is not None
+        self.seed = (
+            seed if seed is not None else np.random.SeedSequence().entropy
+        )
+        # attached to the experiment's log records, see log_context
+        self.experiment_id = uuid.uuid4().hex
+
     def begin(
         self,
         discussions_output_dir: Path,
         verbose: bool = True,
+        archive: str | None = None,
     ) -> None:
         """
         Generate and run all configured discussions.
@@ -136,39 +168,229 @@ class DiscussionExperiment:
         :type discussions_output_dir: Path
         :param verbose: Whether to print intermediate progress and outputs.
         :type verbose: bool
+        :param archive: If given (``"gzip"`` or ``"zstd"``), discussions are
+            appended to compressed shards in this directory (see
+            :class:`LogArchive`), instead of being written to one JSON file
+            each.
+        :type archive: str | None
         """
         logger.info("Starting synthetic discussion generation.")
-        discussions = self._generate_discussions()
-        self._run_all_discussions(discussions, discussions_output_dir, verbose)
+        for _ in tqdm(
+            self.run_discussions(discussions_output_dir, verbose, archive),
+            total=self.num_discussions,
+        ):
+            pass
         logger.info("Finished synthetic discussion generation.")
 
-    def _generate_discussions(self) -> list[jobs.Discussion]:
+    @property
+    def num_discussions(self) -> int:
+        """The number of discussions in the experiment."""
+        return self._num_discussions
+
+    def run_discussions(
+        self,
+        output_dir: Path,
+        verbose: bool = True,
+        archive: str | None = None,
+        job_id_prefix: str | None = None,
+    ) -> typing.Iterator[str | None]:
+        """
+        Run the configured discussions one at a time, writing each one
+        upon completion. Each discussion is only created once the previous
+        one has been run. :meth:`begin` runs them all with a progress bar.
+
+        :param output_dir: Directory to place the serialized :class:Logs
+            of each discussion.
+        :type output_dir: Path
+        :param verbose: Whether to print intermediate progress and outputs.
+        :type verbose: bool
+        :param archive: If given (``"gzip"`` or ``"zstd"``), discussions are
+            appended to compressed shards in *output_dir* (see
+            :class:`LogArchive`), instead of being written to one JSON file
+            each.
+        :type archive: str | None
+        :param job_id_prefix: The *i*-th discussion's ID, attached to its
+            log records and used as its archive key, is
+            ``<job_id_prefix>-<i>``. Defaults to the experiment ID followed
+            by ``-discussion``, so that runs sharing an archive do not
+            overwrite each other.
+        :type job_id_prefix: str | None
+        :return: An iterator yielding the location of each discussion's
+            output once written, or None if the discussion failed.
+        :rtype: Iterator[str | None]
+        """
+        if job_id_prefix is None:
+            job_id_prefix = f"{self.experiment_id}-discussion"
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        log_archive = _open_archive(output_dir, archive)
+        for i, discussion in enumerate(self._generate_discussions()):
+            logger.info(
+                f"Running experiment {i + 1}/{self._num_discussions}..."
+            )
+            yield self._run_single_discussion(
+                discussion=discussion,
+                output_dir=output_dir,
+                verbose=verbose,
+                job_id=f"{job_id_prefix}-{i:06d}",
+                archive=log_archive,
+            )
+
+    def submit(self, queue: distributed.JobQueue) -> int:
+        """
+        Coordinator mode: add a job for every discussion of the experiment
+        to a shared queue, to be run by workers calling :meth:`work`.
+        Discussions already in the queue are not added again.
+
+        :param queue: The shared job queue.
+        :type queue: distributed.JobQueue
+        :raises ValueError: if the experiment was created without a seed.
+        :return: The number of added jobs.
+        :rtype: int
+        """
+        if not self._use_seeded_turn_managers:
+            raise ValueError(
+                "Distributed experiments need an explicit seed, so that "
+                "all workers create the same discussions."
+            )
+
+        num_submitted = 0
+        for i in range(self._num_discussions):
+            spec = {
+                "kind": "discussion",
+                "index": i,
+                "seed": self.seed,
+                "experiment_id": self.experiment_id,
+            }
+            num_submitted += queue.submit(f"discussion-{i:06d}", spec)
+        logger.info(f"Submitted {num_submitted} discussion jobs.")
+        return num_submitted
+
+    def work(
+        self,
+        queue: distributed.JobQueue,
+        output_dir: Path,
+        verbose: bool = True,
+        worker_id: str | None = None,
+        archive: str | None = None,
+    ) -> int:
+        """
+        Worker mode: claim and run discussion jobs from a shared queue
+        until none are pending. The experiment must be configured exactly
+        like the one which submitted the jobs (including the seed), but
+        its users may use different model backends.
+
+        Each discussion is written to ``output_dir/<job id>.json``, or
+        stored under its job ID in an archive.
+
+        :param queue: The shared job queue.
+        :type queue: distributed.JobQueue
+        :param output_dir: Directory to place the serialized :class:Logs
+            of each discussion.
+        :type output_dir: Path
+        :param verbose: Whether to print intermediate progress and outputs.
+        :type verbose: bool
+        :param worker_id: Name of the worker in the logs.
+        :type worker_id: str | None
+        :param archive: If given (``"gzip"`` or ``"zstd"``), discussions are
+            appended to compressed shards in *output_dir* (see
+            :class:`LogArchive`), instead of being written to one JSON file
+            each.
+        :type archive: str | None
+        :raises ValueError: if a job was not submitted by an experiment
+            with the same seed.
+        :return: The number of jobs this worker ran.
+        :rtype: int
+        """
+
+        def validate(spec: dict[str, typing.Any]) -> None:
+            if spec.get("kind") != "discussion" or spec["seed"] != self.seed:
+                raise ValueError(
+                    f"Job {spec} does not belong to a discussion experiment "
+                    f"with seed {self.seed}."
+                )
+
+        def run(job_id: str, spec: dict[str, typing.Any]) -> str:
+            logs = self._execute_discussion(
+                self.get_discussion(spec["index"]), verbose
+            )
+            return _write_logs(
+                logs, output_dir / f"{job_id}.json", job_id, log_archive
+            )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        log_archive = _open_archive(output_dir, archive)
+        return _process_jobs(queue, validate, run, worker_id)
+
+    def _generate_discussions(self) -> typing.Iterator[jobs.Discussion]:
         """
         Internal helper to generate Discussion objects from configuration.
+        Discussions are created lazily, only once the previous one has
+        been run, so that memory use does not grow with the number of
+        discussions.
+
+        :return: An iterator over the configured Discussion objects.
+        :rtype: Iterator[Discussion]
+        """
+        for i in range(self._num_discussions):
+            yield self.get_discussion(i)
 
-        :return: A list of configured Discussion objects.
-        :rtype: list[Discussion]
+    def get_discussion(self, index: int) -> jobs.Discussion:
         """
-        experiments = []
-        for _ in range(self._num_discussions):
-            experiments.append(self._create_synthetic_discussion())
-        return experiments
+        Create the *index*-th discussion of the experiment. The discussion
+        only depends on the experiment's configuration, seed and the index,
+        so it can be recreated independently of the other discussions
+        (e.g. in another process).
+
+        :param index: The index of the discussion,
+            in ``[0, num_discussions)``.
+        :type index: int
+        :raises IndexError: if the index is out of range.
+        :return: The configured (not yet started) discussion.
+        :rtype: Discussion
+        """
+        if not 0 <= index < self._num_discussions:
+            raise IndexError(
+                f"Discussion index {index} out of range for an experiment "
+                f"with {self._num_discussions} discussions."
+            )
+        return self._create_synthetic_discussion(index)
 
-    def _create_synthetic_discussion(self):
+    def _create_synthetic_discussion(self, index: int) -> jobs.Discussion:
         """
         Create and return a single randomized Discussion instance.
 
+        :param index: The index of the discussion, from which its random
+            stream is derived.
+        :type index: int
         :return: A synthetic Discussion object.
         :rtype: Discussion
         """
-        rand_topic = random.choice(self._seed_opinions)
-        rand_users = list(random.sample(self._users, k=self._num_active_users))
+        # equivalent to SeedSequence(seed).spawn(n)[index], without
+        # spawning the preceding sequences
+        seed_seq = np.random.SeedSequence(self.seed, spawn_key=(index,))
+        sampling_seq, turn_manager_seq = seed_seq.spawn(2)
+        rng = np.random.default_rng(sampling_seq)
+
+        rand_topic = (
+            self._seed_opinions[rng.integers(len(self._seed_opinions))]
+            if len(self._seed_opinions) > 0
+            else []
+        )
+        user_indices = rng.choice(
+            len(self._users), size=self._num_active_users, replace=False
+        )
+        rand_users = [self._users[i] for i in user_indices]
         rand_seeds_users = (
             [actor.get_actor_name() for actor in rand_users[: len(rand_topic)]]
             if rand_topic is not None
             else None
         )
+        # the generator is set afterwards, since subclasses may override
+        # make_instance() without the random_state argument
         tm = self._turn_manager_template.make_instance()
+        if self._use_seeded_turn_managers:
+            tm.set_random_state(np.random.default_rng(turn_manager_seq))
         tm.set_actors(rand_users)
 
         return jobs.Discussion(
@@ -178,35 +400,21 @@ class DiscussionExperiment:
             seed_opinions=rand_topic,
             seed_opinion_usernames=rand_seeds_users,
             next_turn_manager=tm,
+            memory=(
+                self._memory_template.make_instance()
+                if self._memory_template is not None
+                else None
+            ),
         )
 
-    def _run_all_discussions(
+    def _run_single_discussion(
         self,
-        discussions: typing.Sequence[jobs.Discussion],
+        discussion: jobs.Discussion,
         output_dir: Path,
         verbose: bool,
-    ) -> None:
-        """
-        Execute all generated discussions and write their outputs to disk.
-
-        :param discussions: List of Discussion instances to run.
-        :type discussions: Sequence[Discussion]
-        :param output_dir: Directory to save output JSON files.
-        :type output_dir: Path
-        :param verbose: Whether to print discussion progress.
-        :type verbose: bool
-        """
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        for i, discussion in tqdm(list(enumerate(discussions))):
-            pylog.info(f"Running experiment {i + 1}/{len(discussions) + 1}...")
-            self._run_single_discussion(
-                discussion=discussion, output_dir=output_dir, verbose=verbose
-            )
-
-    def _run_single_discussion(
-        self, discussion: jobs.Discussion, output_dir: Path, verbose: bool
-    ) -> None:
+        job_id: str | None = None,
+        archive: LogArchive | None = None,
+    ) -> str | None:
         """
         Run a single Discussion and store its results.
 
@@ -216,16 +424,39 @@ class DiscussionExperiment:
         :type output_dir: Path
         :param verbose: Whether to show detailed logging output.
         :type verbose: bool
+        :param job_id: The ID attached to the discussion's log records,
+            and under which it is archived.
+        :type job_id: str | None
+        :param archive: Archive storing the output instead of a JSON file.
+        :type archive: LogArchive | None
+        :return: The location of the output, or None if the discussion
+            failed.
+        :rtype: str | None
         """
-        try:
-            logger.debug(f"Experiment parameters: {str(discussion)}")
+        with log_context(experiment_id=self.experiment_id, job_id=job_id):
+            try:
+                output_path = (
+                    _generate_datetime_filename(output_dir=output_dir)
+                    if archive is None
+                    else None
+                )
+                logs = self._execute_discussion(discussion, verbose)
+                return _write_logs(logs, output_path, job_id, archive)
+            except Exception as e:
+                logger.exception(f"Experiment aborted due to error: {e}")
+                return None
+
+    def _execute_discussion(
+        self, discussion: jobs.Discussion, verbose: bool
+    ) -> jobs.Logs:
+        """
+        Run a single Discussion and return its logs.
+        Exceptions are propagated to the caller.
+        """
+        logger.debug("Experiment parameters: %s", discussion)
 
-            discussion.begin(verbose=verbose)
-            output_path = _generate_datetime_filename(output_dir=output_dir)
-            logs = discussion.get_logs()
-            logs.export(output_path)
-        except Exception as e:
-            logger.exception(f"Experiment aborted due to error: {e}")
+        discussion.begin(verbose=verbose)
+        return discussion.get_logs()
 
 
 class AnnotationExperiment:
@@ -253,8 +484,15 @@ class AnnotationExperiment:
         self.annotators = annotators
         self.history_ctx_len = history_ctx_len
         self.discussion_logs = discussion_logs
+        # attached to the experiment's log records, see log_context
+        self.experiment_id = uuid.uuid4().hex
 
-    def begin(self, output_dir: Path, verbose: bool = True) -> None:
+    def begin(
+        self,
+        output_dir: Path,
+        verbose: bool = True,
+        archive: str | None = None,
+    ) -> None:
         """
         Start the annotation process.
         The method serializes each discussion immediately upon completion.
@@ -264,24 +502,112 @@ class AnnotationExperiment:
         :type output_dir: Path
         :param verbose: Whether to display annotation progress.
         :type verbose: bool, defaults to True
+        :param archive: If given (``"gzip"`` or ``"zstd"``), annotations are
+            appended to compressed shards in *output_dir* (see
+            :class:`LogArchive`), instead of being written to one JSON file
+            each.
+        :type archive: str | None
         """
         output_dir.mkdir(parents=True, exist_ok=True)
 
         annotation_tasks = self._generate_annotation_tasks()
-        self._run_all_annotations(annotation_tasks, output_dir, verbose)
+        self._run_all_annotations(
+            annotation_tasks,
+            output_dir,
+            verbose,
+            _open_archive(output_dir, archive),
+        )
 
-    def _generate_annotation_tasks(self) -> typing.Sequence[jobs.Annotation]:
+    def submit(self, queue: distributed.JobQueue) -> int:
+        """
+        Coordinator mode: add a job for every annotator to a shared queue,
+        to be run by workers calling :meth:`work`. Jobs already in the
+        queue are not added again.
+
+        :param queue: The shared job queue.
+        :type queue: distributed.JobQueue
+        :return: The number of added jobs.
+        :rtype: int
         """
-        Create annotation tasks by pairing each annotator with each discussion.
+        num_submitted = 0
+        for i in range(len(self.annotators)):
+            spec = {
+                "kind": "annotation",
+                "annotator_index": i,
+                "experiment_id": self.experiment_id,
+            }
+            num_submitted += queue.submit(f"annotation-{i:06d}", spec)
+        logger.info(f"Submitted {num_submitted} annotation jobs.")
+        return num_submitted
+
+    def work(
+        self,
+        queue: distributed.JobQueue,
+        output_dir: Path,
+        verbose: bool = True,
+        worker_id: str | None = None,
+        archive: str | None = None,
+    ) -> int:
+        """
+        Worker mode: claim and run annotation jobs from a shared queue
+        until none are pending. The experiment must be configured like the
+        one which submitted the jobs, but its annotators may use different
+        model backends.
+
+        Each annotation is written to ``output_dir/<job id>.json``, or
+        stored under its job ID in an archive.
 
-        :return: List of Annotation tasks.
-        :rtype: Sequence[Annotation]
+        :param queue: The shared job queue.
+        :type queue: distributed.JobQueue
+        :param output_dir: Directory to write annotation outputs.
+        :type output_dir: Path
+        :param verbose: Whether to display annotation progress.
+        :type verbose: bool
+        :param worker_id: Name of the worker in the logs.
+        :type worker_id: str | None
+        :param archive: If given (``"gzip"`` or ``"zstd"``), annotations are
+            appended to compressed shards in *output_dir* (see
+            :class:`LogArchive`), instead of being written to one JSON file
+            each.
+        :type archive: str | None
+        :raises ValueError: if a job was not submitted by an annotation
+            experiment with as many annotators.
+        :return: The number of jobs this worker ran.
+        :rtype: int
+        """
+
+        def validate(spec: dict[str, typing.Any]) -> None:
+            if spec.get("kind") != "annotation" or not (
+                0 <= spec["annotator_index"] < len(self.annotators)
+            ):
+                raise ValueError(
+                    f"Job {spec} does not belong to an annotation experiment "
+                    f"with {len(self.annotators)} annotators."
+                )
+
+        def run(job_id: str, spec: dict[str, typing.Any]) -> str:
+            annotator = self.annotators[spec["annotator_index"]]
+            logs = self._execute_annotation(
+                self._create_annotation_task(annotator), verbose
+            )
+            return _write_logs(
+                logs, output_dir / f"{job_id}.json", job_id, log_archive
+            )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        log_archive = _open_archive(output_dir, archive)
+        return _process_jobs(queue, validate, run, worker_id)
+
+    def _generate_annotation_tasks(self) -> typing.Iterator[jobs.Annotation]:
+        """
+        Lazily create annotation tasks by pairing each annotator with each
+        discussion.
+
+        :return: An iterator over the Annotation tasks.
+        :rtype: Iterator[Annotation]
         """
-        annotation_tasks = []
         for annotator in self.annotators:
-            annotation_task = self._create_annotation_task(annotator)
-            annotation_tasks.append(annotation_task)
-        return annotation_tasks
+            yield self._create_annotation_task(annotator)
 
     def _create_annotation_task(
         self, annotator: actors.Actor
@@ -304,27 +630,43 @@ class AnnotationExperiment:
 
     def _run_all_annotations(
         self,
-        annotation_tasks: typing.Sequence[jobs.Annotation],
+        annotation_tasks: typing.Iterable[jobs.Annotation],
         output_dir: Path,
         verbose: bool = True,
+        archive: LogArchive | None = None,
     ) -> None:
         """
         Execute and store all annotation tasks.
 
-        :param annotation_tasks: List of Annotation objects.
-        :type annotation_tasks: Sequence[Annotation]
+        :param annotation_tasks: The Annotation objects.
+        :type annotation_tasks: Iterable[Annotation]
         :param output_dir: Directory to save results.
         :type output_dir: Path
         :param verbose: Whether to log intermediate steps.
         :type verbose: bool, defaults to true
+        :param archive: Archive storing the outputs instead of JSON files.
+        :type archive: LogArchive | None
         """
-        for annotation_task in tqdm(list(annotation_tasks)):
-            self._run_single_annotation(annotation_task, output_dir, verbose)
+        for i, annotation_task in enumerate(
+            tqdm(annotation_tasks, total=len(self.annotators))
+        ):
+            self._run_single_annotation(
+                annotation_task,
+                output_dir,
+                verbose,
+                f"{self.experiment_id}-annotation-{i:06d}",
+                archive,
+            )
 
         logger.info("Finished annotation generation.")
 
     def _run_single_annotation(
-        self, annotation_task: jobs.Annotation, output_dir: Path, verbose: bool
+        self,
+        annotation_task: jobs.Annotation,
+        output_dir: Path,
+        verbose: bool,
+        job_id: str | None = None,
+        archive: LogArchive | None = None,
     ) -> None:
         """
         Execute one annotation task and write its output.
@@ -335,15 +677,121 @@ class AnnotationExperiment:
         :type output_dir: Path
         :param verbose: Whether to show debug output.
         :type verbose: bool
+        :param job_id: The ID attached to the task's log records, and
+            under which it is archived.
+        :type job_id: str | None
+        :param archive: Archive storing the output instead of a JSON file.
+        :type archive: LogArchive | None
+        """
+        with log_context(experiment_id=self.experiment_id, job_id=job_id):
+            try:
+                output_path = (
+                    _generate_datetime_filename(output_dir=output_dir)
+                    if archive is None
+                    else None
+                )
+                logs = self._execute_annotation(annotation_task, verbose)
+                _write_logs(logs, output_path, job_id, archive)
+            except Exception:
+                logger.exception(
+                    "Annotation experiment aborted due to error."
+                )
+
+    def _execute_annotation(
+        self, annotation_task: jobs.Annotation, verbose: bool
+    ) -> jobs.Logs:
+        """
+        Run one annotation task and return its logs.
+        Exceptions are propagated to the caller.
         """
+        logger.debug("Experiment parameters: %s", annotation_task)
+        annotation_task.begin(verbose=verbose)
+        return annotation_task.get_logs()
+
+
+def _process_jobs(
+    queue: distributed.JobQueue,
+    validate: typing.Callable[[dict[str, typing.Any]], None],
+    run: typing.Callable[[str, dict[str, typing.Any]], str],
+    worker_id: str | None,
+) -> int:
+    """
+    Claim and run jobs until the queue has no pending jobs.
+
+    :param queue: The shared job queue.
+    :type queue: distributed.JobQueue
+    :param validate: Raises a ValueError if this worker can not run a job.
+    :type validate: Callable[[dict[str, Any]], None]
+    :param run: Runs a job given its ID and specification, and returns the
+        location of its output.
+    :type run: Callable[[str, dict[str, Any]], str]
+    :param worker_id: Name of the worker in the logs.
+    :type worker_id: str | None
+    :return: The number of jobs run.
+    :rtype: int
+    """
+    num_jobs = 0
+    while (job := queue.claim(worker_id)) is not None:
+        job_id, spec = job
         try:
-            logger.debug(f"Experiment parameters: {str(annotation_task)}")
-            annotation_task.begin(verbose=verbose)
-            output_path = _generate_datetime_filename(output_dir=output_dir)
-            annotation_logs = annotation_task.get_logs()
-            annotation_logs.export(output_path)
-        except Exception:
-            logger.exception("Annotation experiment aborted due to error.")
+            validate(spec)
+        except ValueError:
+            # the job may still be run by correctly configured workers
+            queue.release(job_id)
+            raise
+
+        # log records of all workers share the coordinator's experiment ID
+        with log_context(
+            experiment_id=spec.get("experiment_id"), job_id=job_id
+        ):
+            logger.info(f"Running job {job_id}...")
+            try:
+                output = run(job_id, spec)
+            except Exception as e:
+                logger.exception(f"Job {job_id} aborted due to error: {e}")
+                queue.fail(job_id, repr(e))
+            else:
+                queue.complete(job_id, {"output": output})
+        num_jobs += 1
+
+    logger.info(f"No pending jobs left, ran {num_jobs} jobs.")
+    return num_jobs
+
+
+def _open_archive(
+    output_dir: Path, compression: str | None
+) -> LogArchive | None:
+    """
+    Open the archive in *output_dir*, or return None if *compression* is
+    None, i.e. outputs are written to JSON files.
+    """
+    if compression is None:
+        return None
+    return LogArchive(output_dir, compression=compression)
+
+
+def _write_logs(
+    logs: jobs.Logs,
+    output_path: Path | None,
+    job_id: str | None,
+    archive: LogArchive | None,
+) -> str:
+    """
+    Store the logs of a job in *archive* if given, or in *output_path*
+    otherwise.
+
+    :return: The location of the output.
+    :rtype: str
+    """
+    if archive is not None:
+        if job_id is None:
+            raise ValueError("Archived outputs need a job ID.")
+        logs.export_to_archive(archive, job_id)
+        return f"{archive.root}:{job_id}"
+
+    assert output_path is not None
+    logs.export(output_path)
+    return str(output_path)
 
 
 def _generate_datetime_filename(
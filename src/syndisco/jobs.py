@@ -22,17 +22,21 @@ Module creating discussions and annotations between LLM Actors.
 import collections
 import collections.abc
 import datetime
+import functools
 import json
 import logging as pylog
 import copy
 import textwrap
-import random
+import time
 import typing
 from pathlib import Path
 
 from tqdm.auto import tqdm
 
-from . import actors, turn_manager
+from . import _serialization, actors, turn_manager
+from .archive import LogArchive
+from .memory import SummaryMemory
+from .logging import log_context
 
 
 logger = pylog.getLogger(Path(__file__).name)
@@ -50,12 +54,16 @@ class Logs:
 
     def __init__(self) -> None:
         self._entries: list[dict[str, str]] = []
+        # whether the entry list may be shared with other instances, in
+        # which case it is copied before being modified
+        self._shared = False
 
     @classmethod
     def from_file(cls, path: str | Path) -> "Logs":
         """
         Load a :class:`DiscussionLogs` from a JSON file previously written
-        by :meth:`to_json_file`.
+        by :meth:`export`. Entries are validated while being decoded,
+        using msgspec or orjson if installed.
 
         :param path: Path to the JSON file.
         :type path: str | Path
@@ -64,31 +72,37 @@ class Logs:
         :return: A populated :class:`DiscussionLogs` instance.
         :rtype: DiscussionLogs
         """
-        with open(path, "r", encoding="utf8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"File is not valid JSON: {e}") from e
+        with open(path, "rb") as f:
+            data = f.read()
 
-        if "logs" not in data:
-            raise ValueError("Missing required key 'logs' in JSON schema.")
-
-        if not isinstance(data["logs"], list):
-            raise ValueError("'logs' must be a list.")
+        instance = Logs()
+        instance._entries = _serialization.decode_log_entries(data)
+        return instance
 
-        required_entry_keys = {"name", "text", "model"}
-        for i, entry in enumerate(data["logs"]):
-            missing = required_entry_keys - entry.keys()
-            if missing:
-                raise ValueError(
-                    f"Log entry {i} is missing required keys: {missing}."
-                )
+    @classmethod
+    def from_archive(
+        cls, archive: LogArchive | str | Path, job_id: str
+    ) -> "Logs":
+        """
+        Load the logs of a single job from an archive written by
+        :meth:`export_to_archive`, decompressing only that job's data.
+
+        :param archive: The archive, or its directory.
+        :type archive: LogArchive | str | Path
+        :param job_id: The ID of the job.
+        :type job_id: str
+        :raises KeyError: if the job is not in the archive.
+        :raises ValueError: if the JSON does not match the expected schema.
+        :return: A populated :class:`DiscussionLogs` instance.
+        :rtype: DiscussionLogs
+        """
+        if not isinstance(archive, LogArchive):
+            archive = LogArchive(archive)
 
         instance = Logs()
-        for entry in data["logs"]:
-            instance.append(
-                name=entry["name"], text=entry["text"], model=entry["model"]
-            )
+        instance._entries = _serialization.decode_log_entries(
+            archive.get(job_id)
+        )
         return instance
 
     def append(
@@ -108,10 +122,24 @@ class Logs:
             Empty string if the user is not an LLM.
         :type prompt: str:
         """
+        if self._shared:
+            self._entries = list(self._entries)
+            self._shared = False
         self._entries.append(
             {"name": name, "text": text, "model": model, "prompt": prompt}
         )
 
+    def _copy_on_write(self) -> "Logs":
+        """
+        Create a copy sharing the entries of these logs, until either of
+        them is appended to.
+        """
+        instance = Logs()
+        instance._entries = self._entries
+        instance._shared = True
+        self._shared = True
+        return instance
+
     def __iter__(self):
         return iter(self._entries)
 
@@ -154,6 +182,7 @@ class Logs:
         self,
         output_path: str | Path,
         timestamp_format: str = "%y-%m-%d-%H-%M",
+        compact: bool = False,
     ) -> None:
         """
         Write the logs (and any *extra* metadata) to a JSON file.
@@ -162,14 +191,42 @@ class Logs:
         :type output_path: str | Path
         :param timestamp_format: strftime format for the timestamp field.
         :type timestamp_format: str, optional
+        :param compact: Whether to write the JSON on a single line, using
+            orjson or msgspec if installed, instead of indenting it. Much
+            faster for large numbers of discussions.
+        :type compact: bool, defaults to False
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         dictionary = self.to_dict(timestamp_format=timestamp_format)
 
-        with open(output_path, "w", encoding="utf8") as fout:
-            json.dump(dictionary, fout, indent=4)
+        if compact:
+            with open(output_path, "wb") as fout:
+                fout.write(_serialization.dumps(dictionary))
+        else:
+            with open(output_path, "w", encoding="utf8") as fout:
+                json.dump(dictionary, fout, indent=4)
+
+    def export_to_archive(
+        self,
+        archive: LogArchive,
+        job_id: str,
+        timestamp_format: str = "%y-%m-%d-%H-%M",
+    ) -> None:
+        """
+        Append the logs to a compressed archive, from which they can be
+        read with :meth:`from_archive`.
+
+        :param archive: The archive.
+        :type archive: LogArchive
+        :param job_id: The ID under which the logs are stored.
+        :type job_id: str
+        :param timestamp_format: strftime format for the timestamp field.
+        :type timestamp_format: str, optional
+        """
+        dictionary = self.to_dict(timestamp_format=timestamp_format)
+        archive.append(job_id, _serialization.dumps(dictionary))
 
     def __str__(self) -> str:
         return json.dumps(self.to_dict(), indent=4)
@@ -211,6 +268,7 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
         seed_opinions: typing.Sequence[str] | None = None,
         seed_opinion_usernames: typing.Sequence[str] | None = None,
         textwrap_len: int = 900000,
+        memory: SummaryMemory | None = None,
     ) -> None:
         """
         Construct the framework for a conversation to take place.
@@ -236,6 +294,10 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
             The maximum column width allowed for the message text. Lines
             exceeding this width will be automatically wrapped.
         :type textwrap_len: int
+        :param memory: Summarizes the comments leaving the context window,
+            so that actors remember the whole discussion without a longer
+            *history_context_len*. None to forget them.
+        :type memory: SummaryMemory | None
         :raises ValueError: if the number of seed opinions and seed
             opinion usernames differ, or if there are more seed opinions
             than participants.
@@ -263,6 +325,7 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
         self._ctx_history: collections.deque[str] = collections.deque(
             maxlen=history_context_len
         )
+        self._memory = memory
 
         # all persistent log state is owned by DiscussionLogs
         self._logs = Logs()
@@ -302,8 +365,11 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
         for opinion, name in zip(
             self._seed_opinions, self._seed_opinion_usernames
         ):
-            self._archive_response(
-                user=actors.Actor(name=name), comment=opinion
+            self._archive_entry(
+                name=name,
+                comment=opinion,
+                model_name="hardcoded",
+                prompt=_SEED_AUTHOR_PROMPT,
             )
 
     def __next__(self) -> dict[str, str]:
@@ -323,7 +389,21 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
             raise StopIteration
 
         actor = self._next_turn_manager.next()
-        res = actor.speak(list(self._ctx_history))
+        with log_context(
+            turn=self._steps_taken,
+            actor=actor.get_actor_name(),
+            model=actor.get_model_name(),
+        ):
+            start_time = time.perf_counter()
+            res = actor.speak(self._get_history())
+            duration = time.perf_counter() - start_time
+            logger.debug(
+                "Turn %d by %s took %.3fs",
+                self._steps_taken,
+                actor.get_actor_name(),
+                duration,
+                extra={"duration_s": duration},
+            )
         self._steps_taken += 1
 
         if res.strip():
@@ -356,6 +436,61 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
                 )
                 print(formatted, "\n")
 
+    def branch(self, num_branches: int) -> list["Discussion"]:
+        """
+        Sample *num_branches* alternative continuations of the next turn,
+        and return one discussion per continuation.
+
+        The next speaker is selected once, and all candidate comments are
+        sampled from a single prompt (see :meth:`Actor.speak_multiple`),
+        which is much cheaper than running each branch from scratch.
+        This discussion is left unchanged.
+
+        :param num_branches: The number of continuations to sample.
+        :type num_branches: int
+        :raises ValueError: if the discussion has already finished.
+        :return: The branched discussions, each one turn ahead of this one.
+        :rtype: list[Discussion]
+        """
+        if self._steps_taken >= self.conv_len:
+            raise ValueError("Can not branch a finished discussion.")
+
+        base = self.fork()
+        actor = base._next_turn_manager.next()
+        responses = actor.speak_multiple(num_branches, base._get_history())
+        base._steps_taken += 1
+
+        branches = []
+        for res in responses:
+            branch = base.fork()
+            if res.strip():
+                branch._archive_response(actor, res)
+            branches.append(branch)
+        return branches
+
+    def fork(self) -> "Discussion":
+        """
+        Create an independent copy of the discussion at its current turn,
+        without re-generating any comments. Both discussions can then be
+        continued separately, e.g. to compare different interventions
+        after a common prefix.
+
+        The copy shares the already generated logs (copy-on-write), the
+        actors and their models with this discussion. The turn manager is
+        copied along with its random generator state, so both copies
+        select the same speakers unless modified.
+
+        :return: The forked discussion.
+        :rtype: Discussion
+        """
+        forked = copy.copy(self)
+        forked._logs = self._logs._copy_on_write()
+        forked._ctx_history = self._ctx_history.copy()
+        forked._next_turn_manager = self._next_turn_manager.fork()
+        if self._memory is not None:
+            forked._memory = self._memory.fork()
+        return forked
+
     def get_logs(self) -> Logs:
         """
         Get the logs of the discussion. Can be used to export the logs
@@ -366,30 +501,6 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
         """
         return copy.deepcopy(self._logs)
 
-    def _add_seed_opinions(self) -> None:
-        if len(self._seed_opinions) > 0:
-            usernames = self._seed_opinion_usernames
-            if usernames is None:
-                if len(self._seed_opinions) > len(self._users):
-                    raise ValueError(
-                        "Not enough users to assign unique usernames "
-                        "for seed opinions."
-                    )
-                usernames = random.sample(
-                    list([user.get_actor_name() for user in self._users]),
-                    len(self._seed_opinions),
-                )
-
-            for username, comment in zip(usernames, self._seed_opinions):
-                seed_user = actors.Actor(
-                    model=None,  # type: ignore
-                    persona={"username": username},
-                    context="",
-                    instructions="",
-                )
-                if comment.strip() != "":
-                    self._archive_response(seed_user, comment)
-
     def _archive_response(self, user: actors.Actor, comment: str) -> None:
         """
         Persist *comment* to the log and the rolling context window.
@@ -402,17 +513,54 @@ class Discussion(collections.abc.Iterator[dict[str, str]]):
         model_name = (
             user._model.get_name() if user._model is not None else "hardcoded"
         )
-        self._logs.append(
+        self._archive_entry(
             name=user.get_actor_name(),
-            text=comment,
-            model=model_name,
+            comment=comment,
+            model_name=model_name,
             prompt=user.get_system_prompt(),
         )
+
+    def _archive_entry(
+        self, name: str, comment: str, model_name: str, prompt: str
+    ) -> None:
+        """
+        Persist a comment, which may not have been written by an actor
+        (e.g. a seed opinion), to the log and the rolling context window.
+
+        :param name: The username of the comment's author.
+        :type name: str
+        :param comment: The new comment.
+        :type comment: str
+        :param model_name: The author's model, or ``"hardcoded"``.
+        :type model_name: str
+        :param prompt: The author's system prompt.
+        :type prompt: str
+        """
+        self._logs.append(
+            name=name, text=comment, model=model_name, prompt=prompt
+        )
         formatted = _format_chat_message(
-            user.get_actor_name(), comment, textwrap_len=self.textwrap_len
+            name, comment, textwrap_len=self.textwrap_len
         )
+        if (
+            self._memory is not None
+            and len(self._ctx_history) == self._ctx_history.maxlen
+        ):
+            # the oldest comment (or, without a window, the new one) is
+            # about to be forgotten
+            self._memory.add(
+                self._ctx_history[0] if self._ctx_history else formatted
+            )
         self._ctx_history.append(formatted)
 
+    def _get_history(self) -> list[str]:
+        """
+        Get the history of the discussion shown to the next speaker.
+        """
+        if self._memory is None:
+            return list(self._ctx_history)
+        return self._memory.get_context(self._ctx_history)
+
 
 class Annotation:
     """
@@ -474,7 +622,7 @@ class Annotation:
             maxlen=self._history_ctx_len
         )
 
-        for message_data in tqdm(self._discussion_logs):
+        for turn, message_data in enumerate(tqdm(self._discussion_logs)):
             username = message_data["name"]
             message = message_data["text"]
 
@@ -482,7 +630,20 @@ class Annotation:
                 username, message, textwrap_len=self.textwrap_len
             )
             ctx_history.append(formatted_message)
-            annotation = self._annotator.speak(list(ctx_history))
+            with log_context(
+                turn=turn,
+                actor=self._annotator.get_actor_name(),
+                model=self._annotator.get_model_name(),
+            ):
+                start_time = time.perf_counter()
+                annotation = self._annotator.speak(list(ctx_history))
+                duration = time.perf_counter() - start_time
+                logger.debug(
+                    "Annotation of turn %d took %.3fs",
+                    turn,
+                    duration,
+                    extra={"duration_s": duration},
+                )
             self._annotation_logs.append(
                 name=username,
                 text=annotation,
@@ -491,7 +652,7 @@ class Annotation:
             )
 
             if verbose:
-                print(textwrap.fill(formatted_message))
+                print(formatted_message)
                 print(annotation)
 
     def get_logs(self) -> Logs:
@@ -506,6 +667,18 @@ class Annotation:
         return copy.deepcopy(self._annotation_logs)
 
 
+# the system prompt of an actor without a model, context or persona,
+# recorded for seed opinions without creating an actor for each of them
+_SEED_AUTHOR_PROMPT = actors.Actor().get_system_prompt()
+
+
+# whitespace replaced by textwrap, see textwrap.TextWrapper._munge_whitespace
+_WHITESPACE_TO_SPACE = str.maketrans(dict.fromkeys("\t\n\x0b\x0c\r", " "))
+
+
+# the same messages are formatted for the context, verbose printing and
+# every annotator, so formatted messages are cached
+@functools.lru_cache(maxsize=1024)
 def _format_chat_message(
     username: str, message: str, textwrap_len: int
 ) -> str:
@@ -525,9 +698,25 @@ def _format_chat_message(
     :rtype: str
     """
     if len(message.strip()) != 0:
-        wrapped_res = textwrap.fill(message, textwrap_len)
+        wrapped_res = _fill(message, textwrap_len)
         formatted_res = f'Comment by user {username}: "\n{wrapped_res}"'
     else:
         formatted_res = ""
 
     return formatted_res
+
+
+def _fill(text: str, width: int) -> str:
+    """
+    Equivalent to :func:`textwrap.fill`, but skips wrapping when the text
+    fits in a single line (e.g. for the default, very large, width).
+    """
+    line = text.expandtabs().translate(_WHITESPACE_TO_SPACE)
+    if len(line) <= width:
+        # textwrap drops the trailing whitespace of the line
+        line = line.rstrip(" ")
+        # ...and at most one trailing chunk of non-ASCII whitespace,
+        # which is left to textwrap
+        if not line[-1:].isspace():
+            return line
+    return textwrap.fill(text, width)
@@ -19,17 +19,39 @@
 Module handling logging for LLM discussion and annotation tasks.
 """
 
+import atexit
+import contextlib
+import contextvars
+import datetime
+import json
 import logging as pylog
+import queue
 import typing
 import warnings
 from pathlib import Path
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    TimedRotatingFileHandler,
+)
 
 import coloredlogs
 
 
 logger = pylog.getLogger(Path(__file__).name)
 
+_LOG_FORMAT = "%(asctime)s %(levelname)-8s %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# fields describing the job being run, attached to every log record
+_LOG_CONTEXT: contextvars.ContextVar[dict[str, typing.Any]] = (
+    contextvars.ContextVar("syndisco_log_context", default={})
+)
+# attributes present on every log record, which are not event fields
+_RECORD_ATTRIBUTES = set(
+    pylog.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
 
 def logging_setup(
     print_to_terminal: bool,
@@ -38,6 +60,9 @@ def logging_setup(
     level: str = "debug",
     use_colors: bool = True,
     log_warnings: bool = True,
+    use_queue: bool = False,
+    queue_size: int = 10000,
+    log_format: str = "text",
 ) -> None:
     """
     Create the logger configuration.
@@ -55,7 +80,29 @@ def logging_setup(
     :type use_colors: bool, defaults to True
     :param log_warnings: whether to log library warnings
     :type log_warnings: bool, defaults to True
+    :param use_queue: whether to format and write the logs in a
+        background thread, so that logging calls only enqueue the record.
+        Records are formatted lazily, so their arguments should not be
+        modified after the logging call.
+    :type use_queue: bool, defaults to False
+    :param queue_size: the maximum number of records waiting to be
+        written when *use_queue* is set. Once the queue is full, new
+        records below the WARNING level are dropped, while warnings and
+        errors wait for space.
+    :type queue_size: int, defaults to 10000
+    :param log_format: ``"text"`` for human-readable lines, or ``"json"``
+        for one JSON object per record, including the fields set by
+        :func:`log_context` (experiment and job IDs, turn, actor, model)
+        and timing fields such as ``duration_s``. Colors are not used
+        for JSON logs.
+    :type log_format: str, defaults to "text"
     """
+    if log_format not in ("text", "json"):
+        raise ValueError(
+            f"Unknown log format {log_format}, expected 'text' or 'json'."
+        )
+    use_json = log_format == "json"
+
     if not print_to_terminal and logs_dir is None:
         warnings.warn(
             "Warning: Both screen-printing and file-printing has "
@@ -76,19 +123,163 @@ def logging_setup(
         else:
             handlers.append(_get_file_handler(Path(logs_dir)))
 
+    for handler in handlers:
+        handler.setFormatter(
+            _JsonFormatter()
+            if use_json
+            else pylog.Formatter(_LOG_FORMAT, _DATE_FORMAT)
+        )
+
+    if use_queue:
+        if use_colors and print_to_terminal and not use_json:
+            handlers[0].setFormatter(
+                coloredlogs.ColoredFormatter(_LOG_FORMAT, _DATE_FORMAT)
+            )
+        handlers = [_start_queue_listener(handlers, queue_size)]
+
+    # the context is read on the calling thread, before any queueing
+    for handler in handlers:
+        handler.addFilter(_ContextFilter())
+
     pylog.basicConfig(
         handlers=handlers,
         level=level,
-        format="%(asctime)s %(levelname)-8s %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+        format=_LOG_FORMAT,
+        datefmt=_DATE_FORMAT,
     )
 
-    if use_colors:
+    # in queue mode, colors are handled by the listener's handlers
+    if use_colors and not use_queue and not use_json:
         coloredlogs.install(level=level)
 
     pylog.captureWarnings(log_warnings)
 
 
+@contextlib.contextmanager
+def log_context(**fields: typing.Any) -> typing.Iterator[None]:
+    """
+    Attach fields to every log record emitted (by the current thread or
+    task) within the context, e.g.
+    ``with log_context(job_id="discussion-000001"): ...``.
+    Contexts can be nested, with inner fields taking precedence.
+
+    :param fields: The fields to attach, e.g. ``experiment_id``,
+        ``job_id``, ``turn``, ``actor`` and ``model``.
+    """
+    token = _LOG_CONTEXT.set({**_LOG_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        _LOG_CONTEXT.reset(token)
+
+
+class _ContextFilter(pylog.Filter):
+    """
+    Copies the fields of the current :func:`log_context` to each record.
+    """
+
+    def filter(self, record: pylog.LogRecord) -> bool:
+        for name, value in _LOG_CONTEXT.get().items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class _JsonFormatter(pylog.Formatter):
+    """
+    Formats each record as a single-line JSON object.
+    """
+
+    def format(self, record: pylog.LogRecord) -> str:
+        event = {
+            "timestamp": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # context fields and any fields passed through `extra`
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES:
+                event[name] = value
+
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    A queue handler which neither formats records, nor blocks on a full
+    queue for records less severe than warnings.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.num_dropped = 0
+        self.listener: QueueListener | None = None
+
+    def prepare(self, record: pylog.LogRecord) -> pylog.LogRecord:
+        # formatting is left to the listener's handlers
+        return record
+
+    def enqueue(self, record: pylog.LogRecord) -> None:
+        if record.levelno >= pylog.WARNING:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.num_dropped += 1
+
+
+class _BlockingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the default would raise if the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        # may be called both explicitly and at exit
+        if self._thread is not None:
+            super().stop()
+
+
+def _start_queue_listener(
+    handlers: list[pylog.Handler], queue_size: int
+) -> _DroppingQueueHandler:
+    """
+    Start a background thread writing the records of the returned handler
+    to *handlers*. The thread is stopped (and the queue flushed) at exit.
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = _DroppingQueueHandler(log_queue)
+    listener = _BlockingQueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    queue_handler.listener = listener
+
+    def stop_listener() -> None:
+        listener.stop()
+        if queue_handler.num_dropped > 0:
+            record = logger.makeRecord(
+                logger.name,
+                pylog.WARNING,
+                __file__,
+                0,
+                "Dropped %d log records due to a full logging queue.",
+                (queue_handler.num_dropped,),
+                None,
+            )
+            for handler in handlers:
+                handler.handle(record)
+
+    atexit.register(stop_listener)
+    return queue_handler
+
+
 def _str_to_log_level(level_str: str):
     match level_str.lower().strip():
         case "debug":
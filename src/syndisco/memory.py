@@ -0,0 +1,200 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module containing long-term memory for discussions, which keeps prompts
+short regardless of the length of the discussion.
+"""
+
+import copy
+import json
+import typing
+import logging as pylog
+from pathlib import Path
+
+from . import model
+
+
+logger = pylog.getLogger(Path(__file__).name)
+
+
+SUMMARY_INSTRUCTIONS = (
+    "You summarize online discussions. Given the summary of a discussion "
+    "so far and its next comments, write an updated summary of at most "
+    "{max_words} words. Keep who said what, the main arguments and any "
+    "open disagreements. Respond only with the summary."
+)
+SUMMARY_TEMPLATE = (
+    "Summary so far: {summary}\nNext comments: {comments}\nUpdated summary:"
+)
+SUMMARY_HEADER = "Summary of earlier comments: {summary}"
+
+
+class SummaryMemory:
+    """
+    A running summary of the comments which no longer fit in the context
+    window of a :class:`Discussion`, written by a (typically small and
+    cheap) summarizer model.
+
+    Comments leaving the window are collected, and summarized together
+    with the previous summary once *update_every* of them accumulate.
+    Actors see the summary, the comments not yet summarized, and the
+    comments in the window, so that the prompt size does not grow with
+    the length of the discussion.
+    """
+
+    def __init__(
+        self,
+        summarizer: model.BaseModel,
+        update_every: int = 5,
+        max_summary_words: int = 150,
+    ):
+        """
+        Create an empty memory.
+
+        :param summarizer: The model writing the summaries.
+        :type summarizer: model.BaseModel
+        :param update_every: The number of comments leaving the context
+            window after which the summary is updated. Each update prompts
+            the summarizer once.
+        :type update_every: int, defaults to 5
+        :param max_summary_words: The length of the summary requested from
+            the summarizer.
+        :type max_summary_words: int, defaults to 150
+        :raises ValueError: if *update_every* or *max_summary_words* is not
+            positive.
+        """
+        if update_every < 1:
+            raise ValueError("update_every must be at least 1.")
+        if max_summary_words < 1:
+            raise ValueError("max_summary_words must be at least 1.")
+
+        self._summarizer = summarizer
+        self.update_every = update_every
+        self.max_summary_words = max_summary_words
+
+        self._summary = ""
+        self._pending: list[str] = []
+        # the number of pending comments triggering the next update
+        self._update_at = update_every
+
+    def add(self, message: str) -> None:
+        """
+        Add a comment which left the context window, updating the summary
+        if enough comments have accumulated.
+
+        :param message: The formatted comment.
+        :type message: str
+        """
+        if not message:
+            return
+        self._pending.append(message)
+        if len(self._pending) >= self._update_at:
+            self.update()
+
+    def update(self) -> None:
+        """
+        Summarize all comments added since the last update.
+
+        If the summarizer returns an empty summary, only the last
+        *update_every* comments are kept, and the update is retried once
+        *update_every* more comments have been added, so that the prompt
+        size stays bounded.
+        """
+        if not self._pending:
+            return
+
+        system_prompt = json.dumps(
+            {
+                "instructions": SUMMARY_INSTRUCTIONS.format(
+                    max_words=self.max_summary_words
+                )
+            }
+        )
+        user_prompt = json.dumps(
+            {
+                "role": "user",
+                "content": SUMMARY_TEMPLATE.format(
+                    summary=self._summary or "<None>",
+                    comments="\n".join(self._pending),
+                ),
+            }
+        )
+        summary = self._summarizer.prompt(system_prompt, user_prompt).strip()
+        if summary:
+            self._summary = summary
+            self._pending = []
+            self._update_at = self.update_every
+        else:
+            num_dropped = max(len(self._pending) - self.update_every, 0)
+            logger.warning(
+                "Summarizer returned an empty summary, dropping the "
+                f"{num_dropped} oldest comments not yet summarized."
+            )
+            self._pending = self._pending[-self.update_every:]
+            self._update_at = 2 * self.update_every
+
+    def get_summary(self) -> str:
+        """
+        Get the current summary.
+
+        :return: The summary, or an empty string if no comment has been
+            summarized yet.
+        :rtype: str
+        """
+        return self._summary
+
+    def get_context(self, recent: typing.Sequence[str]) -> list[str]:
+        """
+        Get the history shown to actors.
+
+        :param recent: The comments in the context window.
+        :type recent: Sequence[str]
+        :return: The summary (if any), followed by the comments not yet
+            summarized and the comments in the context window.
+        :rtype: list[str]
+        """
+        context = []
+        if self._summary:
+            context.append(SUMMARY_HEADER.format(summary=self._summary))
+        context.extend(self._pending)
+        context.extend(recent)
+        return context
+
+    def make_instance(self) -> typing.Self:
+        """
+        Return an empty memory with the same configuration, sharing the
+        summarizer.
+
+        Called once per discussion by :class:`DiscussionExperiment`.
+        """
+        instance = copy.copy(self)
+        instance._summary = ""
+        instance._pending = []
+        instance._update_at = self.update_every
+        return instance
+
+    def fork(self) -> typing.Self:
+        """
+        Return an independent copy of this memory, including its summary.
+        The summarizer is shared, not copied.
+
+        Called by :meth:`Discussion.fork`.
+        """
+        instance = copy.copy(self)
+        instance._pending = list(self._pending)
+        return instance
@@ -20,17 +20,134 @@ Module containing wrappers for local LLMs loaded with various Python libraries.
 """
 
 import abc
+import collections
+import concurrent.futures
+import contextlib
+import json
+import math
+import mmap
+import struct
+import time
 import typing
 import logging
+import threading
+import urllib.error
+import urllib.request
 from pathlib import Path
 
+import accelerate
+import huggingface_hub
 import transformers
 import torch
+import openai
 from openai import OpenAI
 
+from . import _throttling
+
 
 logger = logging.getLogger(Path(__file__).name)
 
+# OpenAIModel instances pointing to the same endpoint share a client (and
+# thus an HTTP connection pool) and a rate limiter
+_CLIENT_POOL: dict[tuple[str, str], OpenAI] = {}
+_RATE_LIMITERS: dict[tuple, _throttling.RateLimiter] = {}
+_CONCURRENCY_LIMITERS: dict[
+    tuple, _throttling.AdaptiveConcurrencyLimiter
+] = {}
+_POOL_LOCK = threading.Lock()
+
+# named configurations for fast inference, selected through the `profile`
+# argument of TransformersModel
+_PERFORMANCE_PROFILES: dict[str, dict[str, typing.Any]] = {
+    "bf16": {
+        "model_kwargs": {
+            "dtype": torch.bfloat16,
+            "attn_implementation": "sdpa",
+        },
+        "generation_kwargs": {},
+        "quantize": False,
+        "compile": False,
+    },
+    "cpu-int8": {
+        "model_kwargs": {"device_map": "cpu", "dtype": torch.float32},
+        "generation_kwargs": {},
+        "quantize": True,
+        "compile": False,
+    },
+    "compiled": {
+        "model_kwargs": {"attn_implementation": "sdpa"},
+        "generation_kwargs": {"cache_implementation": "static"},
+        "quantize": False,
+        "compile": True,
+    },
+}
+
+# draft models for assisted generation, loaded once per checkpoint and
+# dtype, and shared between all TransformersModel instances using them
+_DraftKey = tuple[str, torch.dtype]
+_DRAFT_MODELS: dict[_DraftKey, tuple[typing.Any, typing.Any]] = {}
+# one lock per draft model, so that loading a draft only blocks the
+# instances waiting for the same draft
+_DRAFT_MODEL_LOCKS: dict[_DraftKey, threading.Lock] = {}
+_DRAFT_MODELS_LOCK = threading.Lock()
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+# stands in for the user message when rendering the part of the chat
+# template which only depends on the system prompt
+_USER_PROMPT_SENTINEL = "\x00<syndisco-user-prompt>\x00"
+_PROMPT_PREFIX_CACHE_SIZE = 256
+
+# prompts of different lengths used to warm up models, see
+# TransformersModel._warmup
+_WARMUP_SYSTEM_PROMPT = json.dumps(
+    {"context": "A discussion.", "instructions": "Reply briefly."}
+)
+_WARMUP_USER_PROMPTS = (
+    json.dumps({"role": "user", "content": "Hello."}),
+    json.dumps(
+        {
+            "role": "user",
+            "content": "Comments so far: <None>.\nYour comment:",
+        }
+    ),
+)
+
+# model kwargs which only affect loading the weights, and so are not
+# applied to the config
+_WEIGHT_LOADING_KWARGS = {
+    "attn_implementation",
+    "device_map",
+    "dtype",
+    "quantization_config",
+    "torch_dtype",
+}
+# model kwargs locating the checkpoint, needed for both the config and
+# the weights
+_HUB_KWARGS = {
+    "cache_dir",
+    "force_download",
+    "local_files_only",
+    "proxies",
+    "revision",
+    "subfolder",
+    "token",
+    "trust_remote_code",
+}
+
+# model kwargs which do not require copying the memory-mapped weights
+_MMAP_COMPATIBLE_KWARGS = {"device_map", "attn_implementation"}
+
 
 class BaseModel(abc.ABC):
     """
@@ -42,11 +159,15 @@ class BaseModel(abc.ABC):
         name: str,
         max_out_tokens: int,
         stop_list: list[str] | None = None,
+        stop_sequences: list[str] | None = None,
     ):
         self.name = name
         self.max_out_tokens = max_out_tokens
         # avoid mutable default value problem
         self.stop_list = stop_list if stop_list is not None else []
+        self.stop_sequences = (
+            stop_sequences if stop_sequences is not None else []
+        )
 
     @typing.final
     def prompt(
@@ -61,17 +182,63 @@ class BaseModel(abc.ABC):
         :type system_prompt: str
         :param user_prompt: The user prompt.
         :type user_prompt: str
-        :param stop_words: Strings to be removed after generation.
-        :type stop_words: list[str]
         :return: the model's response
         :rtype: str
         """
         response = self._generate_response(system_prompt, user_prompt)
-        # avoid model collapse attributed to certain strings
-        for remove_word in self.stop_list:
-            response = response.replace(remove_word, "")
+        return self._postprocess_response(response)
 
-        return response
+    @typing.final
+    def prompt_batch(
+        self, prompts: typing.Sequence[tuple[str, str]]
+    ) -> list[str]:
+        """
+        Generate the model's responses for multiple independent prompts.
+        Backends which support batched inference process them together,
+        the rest process them one by one.
+
+        :param prompts: ``(system_prompt, user_prompt)`` pairs.
+        :type prompts: Sequence[tuple[str, str]]
+        :return: The model's response to each prompt, in the same order.
+        :rtype: list[str]
+        """
+        if len(prompts) == 0:
+            return []
+
+        responses = self._generate_batch(prompts)
+        return [self._postprocess_response(r) for r in responses]
+
+    @typing.final
+    def prompt_multiple(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        num_responses: int,
+    ) -> list[str]:
+        """
+        Sample multiple candidate responses to the same prompt.
+        Backends which support it generate all samples in a single request,
+        the rest prompt the model once per sample.
+
+        :param system_prompt: The system prompt.
+        :type system_prompt: str
+        :param user_prompt: The user prompt.
+        :type user_prompt: str
+        :param num_responses: The number of responses to sample.
+        :type num_responses: int
+        :raises ValueError: if *num_responses* is not positive
+        :return: The model's responses
+        :rtype: list[str]
+        """
+        if num_responses < 1:
+            raise ValueError(
+                f"num_responses must be at least 1, but is {num_responses}"
+            )
+
+        responses = self._generate_responses(
+            system_prompt, user_prompt, num_responses
+        )
+        return [self._postprocess_response(r) for r in responses]
 
     @typing.final
     def get_name(self) -> str:
@@ -100,6 +267,54 @@ class BaseModel(abc.ABC):
         """
         raise NotImplementedError("Abstract class call")
 
+    def _generate_batch(
+        self, prompts: typing.Sequence[tuple[str, str]]
+    ) -> list[str]:
+        """
+        Generate responses for multiple prompts. Override in backends
+        supporting batched inference.
+
+        :param prompts: ``(system_prompt, user_prompt)`` pairs.
+        :type prompts: Sequence[tuple[str, str]]
+        :return: The model's responses
+        :rtype: list[str]
+        """
+        return [
+            self._generate_response(system_prompt, user_prompt)
+            for system_prompt, user_prompt in prompts
+        ]
+
+    def _generate_responses(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> list[str]:
+        """
+        Sample multiple responses to a single prompt. Override in backends
+        able to sample them together.
+
+        :param system_prompt: The system prompt.
+        :type system_prompt: str
+        :param user_prompt: The user prompt.
+        :type user_prompt: str
+        :param num_responses: The number of responses to sample.
+        :type num_responses: int
+        :return: The model's responses
+        :rtype: list[str]
+        """
+        return [
+            self._generate_response(system_prompt, user_prompt)
+            for _ in range(num_responses)
+        ]
+
+    def _postprocess_response(self, response: str) -> str:
+        # backends halt generation on a stop sequence, but may still
+        # include the sequence itself (or text decoded after it)
+        response = _truncate_at_stop_sequence(response, self.stop_sequences)
+        # avoid model collapse attributed to certain strings
+        for remove_word in self.stop_list:
+            response = response.replace(remove_word, "")
+
+        return response
+
 
 class TransformersModel(BaseModel):
     """
@@ -115,6 +330,11 @@ class TransformersModel(BaseModel):
         model_kwargs: dict | None = None,
         tokenizer_kwargs: dict | None = None,
         generation_kwargs: dict | None = None,
+        stop_sequences: list[str] | None = None,
+        profile: str | None = None,
+        warmup: bool = False,
+        load_in_background: bool = False,
+        mmap_weights: bool = False,
     ):
         """
         Initialize a HuggingFace Transformers-based language model wrapper.
@@ -157,39 +377,429 @@ class TransformersModel(BaseModel):
             ``model.generate()`` during inference.
             Examples include sampling parameters such as ``temperature``,
             ``top_p``, or ``repetition_penalty``.
+
+            For assisted (speculative) generation, set ``assistant_model`` to
+            the path or HuggingFace identifier of a small draft checkpoint.
+            The draft model proposes tokens which this model verifies, which
+            speeds up generation without changing greedy outputs. Draft
+            models are loaded once and shared between all instances using
+            the same checkpoint and dtype. Drafts with a different tokenizer
+            are supported through universal assisted decoding.
         :type generation_kwargs: dict | None
 
+        :param stop_sequences:
+            Optional list of strings which end generation as soon as the
+            model produces any of them, e.g. ``"User:"`` when the model
+            starts role-playing other participants. The stop sequence
+            and anything after it are not included in the response.
+        :type stop_sequences: list[str] | None
+
+        :param profile:
+            Optional named performance profile, which configures the model
+            for fast inference. Explicit ``model_kwargs`` and
+            ``generation_kwargs`` take precedence over the profile's
+            settings. Available profiles:
+
+            - ``"bf16"``: bfloat16 weights with SDPA attention.
+              Best for modern GPUs.
+            - ``"cpu-int8"``: dynamic int8 quantization of linear layers,
+              for CPU inference.
+            - ``"compiled"``: SDPA attention, a static KV cache and
+              ``torch.compile``.
+
+            The model is warmed up with generations shaped like real turns
+            after loading, so the first turn does not pay one-time (e.g.
+            compilation) costs. None to load the model as-is.
+        :type profile: str | None
+
+        :param warmup:
+            Whether to run generations shaped like real turns after
+            loading, so that the first turn does not pay one-time costs.
+            Always enabled when a profile is used.
+        :type warmup: bool
+
+        :param load_in_background:
+            Whether to load the model in a background thread, so that
+            experiment setup can proceed in the meantime. The constructor
+            returns immediately; :attr:`ready` is a future resolved once
+            the model is loaded, and generation waits for it. The ``model``
+            and ``tokenizer`` attributes are unavailable until then.
+        :type load_in_background: bool
+
+        :param mmap_weights:
+            Whether to memory-map the checkpoint's safetensors files
+            (copy-on-write) instead of copying the weights into memory. The
+            model then runs on the CPU directly on top of the operating
+            system's page cache, so that every process loading the same
+            checkpoint this way, including forked or spawned experiment
+            workers, shares the same physical memory for the weights.
+            Requires a safetensors checkpoint whose weight names match the
+            model's layout (e.g. one written by ``save_pretrained``), and
+            does not support dtype conversion or quantization, which would
+            copy the weights.
+        :type mmap_weights: bool
+
         :raises OSError:
             If the model or tokenizer cannot be loaded from the given path.
 
         :raises ValueError:
             If the provided configuration is invalid / incompatible with the 
-            model.
+            model, or the profile does not exist.
 
         :note:
             The model is moved to the appropriate device automatically using
-            ``device_map="auto"`` and set to evaluation mode.
+            ``device_map="auto"`` (unless overridden by the model kwargs or
+            the profile) and set to evaluation mode.
+
+        :note:
+            The duration of each loading phase (config, weights, tokenizer,
+            assistant_model, optimization, warmup and their total) in
+            seconds is stored in :attr:`load_metrics`.
         """
-        super().__init__(name, max_out_tokens, remove_string_list)
+        super().__init__(
+            name, max_out_tokens, remove_string_list, stop_sequences
+        )
+
+        if profile is not None and profile not in _PERFORMANCE_PROFILES:
+            raise ValueError(
+                f"Unknown performance profile '{profile}'. Available "
+                f"profiles: {list(_PERFORMANCE_PROFILES.keys())}"
+            )
+        profile_settings = _PERFORMANCE_PROFILES.get(profile or "", {})
 
-        model_kwargs = model_kwargs or {}
+        model_kwargs = {
+            "device_map": "auto",
+            **profile_settings.get("model_kwargs", {}),
+            **(model_kwargs or {}),
+        }
         tokenizer_kwargs = tokenizer_kwargs or {}
-        self.generation_kwargs = generation_kwargs or {}
+        self.generation_kwargs = {
+            **profile_settings.get("generation_kwargs", {}),
+            **(generation_kwargs or {}),
+        }
+        self.load_metrics: dict[str, float] = {}
+        self.ready: concurrent.futures.Future[None] = (
+            concurrent.futures.Future()
+        )
 
-        self.model = transformers.AutoModelForCausalLM.from_pretrained(
-            model_path,
-            device_map="auto",
-            **model_kwargs,
-        ).eval()
-        self.tokenizer = transformers.AutoTokenizer.from_pretrained(
+        if mmap_weights:
+            incompatible = set(model_kwargs) - _MMAP_COMPATIBLE_KWARGS
+            if model_kwargs["device_map"] not in ("auto", "cpu"):
+                incompatible.add("device_map")
+            if incompatible:
+                raise ValueError(
+                    "mmap_weights only supports CPU inference without "
+                    "weight conversion. Incompatible model kwargs: "
+                    f"{sorted(incompatible)}"
+                )
+            if profile_settings.get("quantize", False):
+                raise ValueError(
+                    "mmap_weights can not be combined with quantization."
+                )
+        self._weight_mmaps: list[mmap.mmap] = []
+        self._prompt_prefix_cache: collections.OrderedDict[
+            str, tuple[list[int], str] | None
+        ] = collections.OrderedDict()
+
+        load_args = (
             model_path,
-            **tokenizer_kwargs,
+            model_kwargs,
+            tokenizer_kwargs,
+            profile_settings,
+            warmup or profile is not None,
+            mmap_weights,
         )
+        if load_in_background:
+            threading.Thread(
+                target=self._load, args=load_args, daemon=True
+            ).start()
+        else:
+            self._load(*load_args)
+            # surface loading errors directly from the constructor
+            self.ready.result()
+
+    def wait_until_ready(self, timeout: float | None = None) -> None:
+        """
+        Block until the model has finished loading.
+
+        :param timeout: Maximum seconds to wait, None to wait indefinitely.
+        :type timeout: float | None
+        :raises TimeoutError: If the model is not loaded within *timeout*.
+        :raises Exception: Any error raised while loading the model.
+        """
+        self.ready.result(timeout=timeout)
+
+    def _load(
+        self,
+        model_path: str | Path,
+        model_kwargs: dict,
+        tokenizer_kwargs: dict,
+        profile_settings: dict,
+        warmup: bool,
+        mmap_weights: bool,
+    ) -> None:
+        """
+        Load and prepare the model and tokenizer, timing each phase and
+        resolving :attr:`ready` once done.
+        """
+        try:
+            # loaded once, and reused when loading the weights
+            with _timed_phase(self.load_metrics, "config"):
+                config, weight_kwargs = _load_config(model_path, model_kwargs)
+
+            # with a device_map, weights are placed on their devices while
+            # loading, so placement is part of this phase
+            with _timed_phase(self.load_metrics, "weights"):
+                if mmap_weights:
+                    self.model = self._load_mmap_model(
+                        model_path, config, weight_kwargs
+                    )
+                else:
+                    self.model = (
+                        transformers.AutoModelForCausalLM.from_pretrained(
+                            model_path,
+                            config=config,
+                            **weight_kwargs,
+                        )
+                    )
+                self.model.eval()
+
+            with _timed_phase(self.load_metrics, "tokenizer"):
+                self.tokenizer = transformers.AutoTokenizer.from_pretrained(
+                    model_path,
+                    **{"config": config, **tokenizer_kwargs},
+                )
+
+            self._has_chat_template = (
+                getattr(self.tokenizer, "chat_template", None) is not None
+            )
+            if not self._has_chat_template:
+                logger.warning("Tokenizer has no chat template; falling back.")
 
-        model_size = self.model.get_memory_footprint() / 2**20
-        logger.info(f"Model memory footprint: {model_size:.2f} MB")
+            with _timed_phase(self.load_metrics, "assistant_model"):
+                self._resolve_assistant_model()
+
+            self._stopping_criteria = None
+            if self.stop_sequences:
+                self._stopping_criteria = transformers.StoppingCriteriaList(
+                    [
+                        transformers.StopStringCriteria(
+                            self.tokenizer, self.stop_sequences
+                        )
+                    ]
+                )
+
+            with _timed_phase(self.load_metrics, "optimization"):
+                if profile_settings.get("quantize", False):
+                    self.model = torch.ao.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                if profile_settings.get("compile", False):
+                    self.model.forward = torch.compile(self.model.forward)
+
+            model_size = self.model.get_memory_footprint() / 2**20
+            logger.info(f"Model memory footprint: {model_size:.2f} MB")
+
+            if warmup:
+                logger.info("Warming up model...")
+                with _timed_phase(self.load_metrics, "warmup"):
+                    self._warmup()
+
+            self.load_metrics["total"] = sum(self.load_metrics.values())
+            logger.info(
+                f"Loaded model {self.name} in "
+                f"{self.load_metrics['total']:.2f}s",
+                extra={"load_metrics": self.load_metrics},
+            )
+            logger.debug(f"Model load times (s): {self.load_metrics}")
+        except Exception as e:
+            self.ready.set_exception(e)
+        else:
+            self.ready.set_result(None)
 
     def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        self.ready.result()
+        input_ids = self._encode_prompt(system_prompt, user_prompt)
+
+        with torch.inference_mode():
+            inputs = {
+                "input_ids": torch.tensor([input_ids]),
+                "attention_mask": torch.ones(
+                    1, len(input_ids), dtype=torch.long
+                ),
+            }
+            inputs = {
+                key: value.to(self.model.device)
+                for key, value in inputs.items()
+            }
+
+            output_ids = self.model.generate(  # type: ignore
+                **inputs, **self._get_generation_kwargs()
+            )
+
+        # Remove the prompt portion, keep only generated part
+        generated_ids = output_ids[0][inputs["input_ids"].shape[1]:]
+        response = self.tokenizer.decode(
+            generated_ids, skip_special_tokens=True
+        )
+
+        return response.strip()
+
+    def _generate_batch(
+        self, prompts: typing.Sequence[tuple[str, str]]
+    ) -> list[str]:
+        self.ready.result()
+        # assisted generation only supports a batch size of 1
+        if len(prompts) == 1 or "assistant_model" in self.generation_kwargs:
+            return super()._generate_batch(prompts)
+
+        encoded_prompts = [
+            self._encode_prompt(system_prompt, user_prompt)
+            for system_prompt, user_prompt in prompts
+        ]
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        with torch.inference_mode():
+            # decoder-only models need left padding for generation
+            inputs = self.tokenizer.pad(
+                {"input_ids": encoded_prompts},
+                return_tensors="pt",
+                padding_side="left",
+            ).to(self.model.device)
+
+            output_ids = self.model.generate(  # type: ignore
+                **inputs,
+                **self._get_generation_kwargs(
+                    pad_token_id=self.tokenizer.pad_token_id
+                ),
+            )
+
+        generated_ids = output_ids[:, inputs["input_ids"].shape[1]:]
+        responses = self.tokenizer.batch_decode(
+            generated_ids, skip_special_tokens=True
+        )
+        return [response.strip() for response in responses]
+
+    def _generate_responses(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> list[str]:
+        self.ready.result()
+        if num_responses == 1:
+            return super()._generate_responses(
+                system_prompt, user_prompt, num_responses
+            )
+
+        input_ids = self._encode_prompt(system_prompt, user_prompt)
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        with torch.inference_mode():
+            inputs = {
+                "input_ids": torch.tensor([input_ids]),
+                "attention_mask": torch.ones(
+                    1, len(input_ids), dtype=torch.long
+                ),
+            }
+            inputs = {
+                key: value.to(self.model.device)
+                for key, value in inputs.items()
+            }
+
+            # greedy decoding would return the same sequence n times
+            generation_kwargs = self._get_generation_kwargs(
+                do_sample=True, pad_token_id=self.tokenizer.pad_token_id
+            )
+            if "assistant_model" in self.generation_kwargs:
+                # assisted generation supports sampling, but only a single
+                # sequence per call
+                generated_ids = [
+                    self.model.generate(  # type: ignore
+                        **inputs, **generation_kwargs
+                    )[0, len(input_ids):]
+                    for _ in range(num_responses)
+                ]
+            else:
+                output_ids = self.model.generate(  # type: ignore
+                    **inputs,
+                    num_return_sequences=num_responses,
+                    **generation_kwargs,
+                )
+                generated_ids = output_ids[:, len(input_ids):]
+
+        responses = self.tokenizer.batch_decode(
+            generated_ids, skip_special_tokens=True
+        )
+        return [response.strip() for response in responses]
+
+    def _get_generation_kwargs(
+        self, **overrides: typing.Any
+    ) -> dict[str, typing.Any]:
+        """
+        Get the arguments of ``model.generate()``: the defaults, updated
+        with the user's generation kwargs, updated with *overrides*.
+        """
+        return {
+            "max_new_tokens": self.max_out_tokens,
+            "do_sample": False,
+            "pad_token_id": self.tokenizer.eos_token_id,
+            "stopping_criteria": self._stopping_criteria,
+            **self.generation_kwargs,
+            **overrides,
+        }
+
+    def _encode_prompt(
+        self, system_prompt: str, user_prompt: str
+    ) -> list[int]:
+        """
+        Render and tokenize a prompt, reusing the cached, already tokenized
+        part preceding the user message when possible.
+        """
+        prefix = self._get_prompt_prefix(system_prompt, user_prompt)
+        if prefix is None:
+            prompt_text = self._render_prompt(system_prompt, user_prompt)
+            return self.tokenizer(prompt_text).input_ids
+
+        prefix_ids, suffix = prefix
+        return prefix_ids + self._encode_segment(user_prompt + suffix)
+
+    def _get_prompt_prefix(
+        self, system_prompt: str, user_prompt: str
+    ) -> tuple[list[int], str] | None:
+        """
+        Get the tokenized prompt preceding the user message, and the
+        rendered text following it, for a system prompt.
+
+        :return: None if the prompt can not be split without changing its
+            tokenization.
+        """
+        if system_prompt in self._prompt_prefix_cache:
+            self._prompt_prefix_cache.move_to_end(system_prompt)
+            return self._prompt_prefix_cache[system_prompt]
+
+        prefix = None
+        rendered = self._render_prompt(system_prompt, _USER_PROMPT_SENTINEL)
+        if rendered.count(_USER_PROMPT_SENTINEL) == 1:
+            prefix_text, suffix = rendered.split(_USER_PROMPT_SENTINEL)
+            prefix_ids = self.tokenizer(prefix_text).input_ids
+            # tokens may merge across the split point for some tokenizers,
+            # in which case the prompt must be encoded as a whole
+            full_ids = self.tokenizer(
+                self._render_prompt(system_prompt, user_prompt)
+            ).input_ids
+            split_ids = prefix_ids + self._encode_segment(user_prompt + suffix)
+            if split_ids == full_ids:
+                prefix = (prefix_ids, suffix)
+
+        self._prompt_prefix_cache[system_prompt] = prefix
+        if len(self._prompt_prefix_cache) > _PROMPT_PREFIX_CACHE_SIZE:
+            self._prompt_prefix_cache.popitem(last=False)
+        return prefix
+
+    def _encode_segment(self, text: str) -> list[int]:
+        return self.tokenizer(text, add_special_tokens=False).input_ids
+
+    def _render_prompt(self, system_prompt: str, user_prompt: str) -> str:
         # Construct proper message list for chat template
         messages = [
             {"role": "system", "content": system_prompt},
@@ -197,38 +807,114 @@ class TransformersModel(BaseModel):
         ]
 
         # Prefer chat template if available
-        if hasattr(self.tokenizer, "apply_chat_template"):
-            prompt_text = self.tokenizer.apply_chat_template(
+        if self._has_chat_template:
+            return self.tokenizer.apply_chat_template(
                 messages,
                 tokenize=False,
                 add_generation_prompt=True,
             )
-        else:
-            logger.warning("Tokenizer has no chat template; falling back.")
-            prompt_text = (
-                f"System: {system_prompt}\nUser: {user_prompt}\nAssistant:"
+
+        return f"System: {system_prompt}\nUser: {user_prompt}\nAssistant:"
+
+    def _load_mmap_model(
+        self, model_path: str | Path, config: typing.Any, weight_kwargs: dict
+    ) -> typing.Any:
+        """
+        Build the model on top of memory-mapped safetensors weights.
+        """
+        model_dir = Path(model_path)
+        if not model_dir.is_dir():
+            model_dir = Path(
+                huggingface_hub.snapshot_download(
+                    str(model_path),
+                    allow_patterns=["*.json", "*.safetensors"],
+                )
             )
 
-        with torch.inference_mode():
-            inputs = self.tokenizer(prompt_text, return_tensors="pt").to(
-                self.model.device
+        index_path = model_dir / "model.safetensors.index.json"
+        if index_path.is_file():
+            with open(index_path, "r", encoding="utf8") as f:
+                weight_files = sorted(set(json.load(f)["weight_map"].values()))
+        else:
+            weight_files = ["model.safetensors"]
+
+        state_dict = {}
+        for weight_file in weight_files:
+            weights, weight_mmap = _mmap_safetensors(model_dir / weight_file)
+            state_dict.update(weights)
+            self._weight_mmaps.append(weight_mmap)
+
+        config_kwargs = {
+            key: value
+            for key, value in weight_kwargs.items()
+            if key != "device_map"
+        }
+        # parameters are created on the meta device, so that no memory is
+        # allocated for weights which are replaced by the mapped ones
+        with accelerate.init_empty_weights(include_buffers=False):
+            model = transformers.AutoModelForCausalLM.from_config(
+                config, **config_kwargs
             )
+        model.load_state_dict(state_dict, strict=False, assign=True)
+        model.tie_weights()
 
-            output_ids = self.model.generate(  # type: ignore
-                **inputs,
-                max_new_tokens=self.max_out_tokens,
-                do_sample=False,
-                pad_token_id=self.tokenizer.eos_token_id,
-                **self.generation_kwargs,
+        missing = [
+            name for name, param in model.named_parameters() if param.is_meta
+        ]
+        if missing:
+            raise ValueError(
+                "Checkpoint weights do not match the model layout, so they "
+                f"can not be memory-mapped. Missing weights: {missing[:5]}"
             )
+        logger.info(f"Memory-mapped {len(state_dict)} weight tensors")
+        return model
 
-        # Remove the prompt portion, keep only generated part
-        generated_ids = output_ids[0][inputs["input_ids"].shape[1]:]
-        response = self.tokenizer.decode(
-            generated_ids, skip_special_tokens=True
-        )
+    def _warmup(self) -> None:
+        """
+        Run generations shaped like real turns, so that one-time costs
+        (compilation, cache allocation, kernel selection) are not paid
+        during the first turn.
+        """
+        with torch.inference_mode():
+            # after a second input length, torch.compile traces the model
+            # with dynamic shapes, which turns of any length then reuse
+            for user_prompt in _WARMUP_USER_PROMPTS:
+                input_ids = self._encode_prompt(
+                    _WARMUP_SYSTEM_PROMPT, user_prompt
+                )
+                inputs = {
+                    "input_ids": torch.tensor([input_ids]),
+                    "attention_mask": torch.ones(
+                        1, len(input_ids), dtype=torch.long
+                    ),
+                }
+                inputs = {
+                    key: value.to(self.model.device)
+                    for key, value in inputs.items()
+                }
+                self.model.generate(  # type: ignore
+                    **inputs, **self._get_generation_kwargs()
+                )
 
-        return response.strip()
+    def _resolve_assistant_model(self) -> None:
+        """
+        Replace an ``assistant_model`` path in the generation kwargs with
+        the (shared) loaded draft model.
+        """
+        draft_path = self.generation_kwargs.get("assistant_model")
+        if not isinstance(draft_path, (str, Path)):
+            return
+
+        draft_model, draft_tokenizer = _get_draft_model(
+            draft_path, dtype=self.model.dtype
+        )
+        self.generation_kwargs["assistant_model"] = draft_model
+        if draft_tokenizer.get_vocab() != self.tokenizer.get_vocab():
+            self.generation_kwargs.setdefault("tokenizer", self.tokenizer)
+            self.generation_kwargs.setdefault(
+                "assistant_tokenizer", draft_tokenizer
+            )
+        logger.info(f"Using assisted generation with draft model {draft_path}")
 
 
 class OpenAIModel(BaseModel):
@@ -247,6 +933,12 @@ class OpenAIModel(BaseModel):
         max_out_tokens: int,
         temperature: float = 0.0,
         remove_string_list: list[str] | None = None,
+        stop_sequences: list[str] | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_retries: int = 2,
+        max_concurrency: int | None = None,
+        latency_threshold: float | None = None,
     ):
         """Initialize the OpenAI model wrapper.
 
@@ -265,14 +957,71 @@ class OpenAIModel(BaseModel):
         :type temperature: float
         :param remove_string_list: Strings to remove from responses
         :type remove_string_list: list[str] | None
+        :param stop_sequences:
+            Strings which end generation server-side as soon as the model
+            produces them. Passed as the ``stop`` parameter of the API,
+            which accepts at most 4.
+        :type stop_sequences: list[str] | None
+        :param requests_per_minute:
+            Maximum requests per minute sent to the endpoint, shared by all
+            instances with the same endpoint, API key and budgets.
+            None for no limit.
+        :type requests_per_minute: int | None
+        :param tokens_per_minute:
+            Maximum tokens per minute sent to the endpoint. Each request
+            reserves its estimated prompt length plus ``max_out_tokens``,
+            and unused tokens are refunded once the response arrives.
+            None for no limit.
+        :type tokens_per_minute: int | None
+        :param max_retries:
+            How many times a request is retried, with jittered exponential
+            backoff, after a rate-limit (429), server (5xx) or connection
+            error.
+        :type max_retries: int
+        :param max_concurrency:
+            Upper bound for the number of in-flight requests to the
+            endpoint. The actual limit adapts between 1 and this value
+            (AIMD), shrinking on 429/5xx errors and slow responses and
+            growing otherwise. Shared by all instances with the same
+            endpoint, API key and concurrency settings. None to not limit
+            concurrency.
+        :type max_concurrency: int | None
+        :param latency_threshold:
+            Responses slower than this many seconds are treated as a sign of
+            overload by the concurrency limiter. None to only react to
+            errors.
+        :type latency_threshold: float | None
+        :raises ValueError: if more than 4 stop sequences are given.
         """
-        super().__init__(name, max_out_tokens, remove_string_list)
+        if stop_sequences is not None and len(stop_sequences) > 4:
+            raise ValueError(
+                "The OpenAI API accepts at most 4 stop sequences, but "
+                f"{len(stop_sequences)} were given."
+            )
+
+        super().__init__(
+            name, max_out_tokens, remove_string_list, stop_sequences
+        )
 
         self.model_name = model_name
         self.temperature = temperature
-        self.client = OpenAI(
+        self.max_retries = max_retries
+        self.client = _get_shared_client(api_key=api_key, base_url=base_url)
+        self._rate_limiter = _get_shared_rate_limiter(
             api_key=api_key,
             base_url=base_url,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+        self._concurrency_limiter = (
+            _get_shared_concurrency_limiter(
+                api_key=api_key,
+                base_url=base_url,
+                max_concurrency=max_concurrency,
+                latency_threshold=latency_threshold,
+            )
+            if max_concurrency is not None
+            else None
         )
 
         logger.info(f"Initialized OpenAI model: {model_name} at {base_url}")
@@ -287,20 +1036,107 @@ class OpenAIModel(BaseModel):
         :return: The model's response
         :rtype: str
         """
+        response = self._request_completion(system_prompt, user_prompt, 1)
+        return self._validate_response(response)
+
+    def _generate_responses(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> list[str]:
+        """Sample multiple responses with a single request, using the
+        API's ``n`` parameter.
+
+        :param system_prompt: The system prompt.
+        :type system_prompt: str
+        :param user_prompt: The user prompt.
+        :type user_prompt: str
+        :param num_responses: The number of responses to sample.
+        :type num_responses: int
+        :return: The model's responses
+        :rtype: list[str]
+        """
+        response = self._request_completion(
+            system_prompt, user_prompt, num_responses
+        )
+        choices = getattr(response, "choices", None) or []
+        if len(choices) != num_responses:
+            raise ValueError(
+                f"Requested {num_responses} responses, but received "
+                f"{len(choices)}. Full response: {response}"
+            )
+        return [self._validate_choice(choice) for choice in choices]
+
+    def _request_completion(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> typing.Any:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,  # type: ignore
-            max_tokens=self.max_out_tokens,
-            temperature=self.temperature,
+        # rough estimate (~4 characters per token), corrected after the
+        # response reports the actual usage
+        reserved_tokens = (
+            math.ceil((len(system_prompt) + len(user_prompt)) / 4)
+            + self.max_out_tokens * num_responses
+        )
+        # only send n and stop when needed, for endpoints which do not
+        # support them
+        extra_kwargs: dict[str, typing.Any] = {}
+        if num_responses > 1:
+            extra_kwargs["n"] = num_responses
+        if self.stop_sequences:
+            extra_kwargs["stop"] = self.stop_sequences
+
+        def request() -> typing.Any:
+            self._rate_limiter.acquire(reserved_tokens)
+            limiter = self._concurrency_limiter
+            start_time = limiter.acquire() if limiter is not None else 0.0
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,  # type: ignore
+                    max_tokens=self.max_out_tokens,
+                    temperature=self.temperature,
+                    **extra_kwargs,
+                )
+            except Exception as e:
+                if limiter is not None:
+                    limiter.release(
+                        start_time, overloaded=_is_retryable_error(e)
+                    )
+                # failed attempts do not use their tokens, and retries
+                # reserve them again
+                self._rate_limiter.refund(reserved_tokens)
+                raise
+            if limiter is not None:
+                limiter.release(start_time)
+            return response
+
+        response = _throttling.retry_with_backoff(
+            request,
+            is_retryable=_is_retryable_error,
+            max_retries=self.max_retries,
         )
-        response = self._validate_response(response)
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens is not None:
+            self._rate_limiter.refund(reserved_tokens - usage.total_tokens)
+
         return response
 
+    def get_metrics(self) -> dict[str, float]:
+        """
+        Get runtime metrics of the model's connection to the endpoint.
+
+        :return: The current adaptive concurrency limit
+            (``concurrency_limit``) and number of in-flight requests
+            (``in_flight``). Empty if concurrency is not limited.
+        :rtype: dict[str, float]
+        """
+        if self._concurrency_limiter is None:
+            return {}
+        return self._concurrency_limiter.get_metrics()
+
     def _validate_response(self, response: typing.Any) -> str:
         # Validate response object
         if response is None:
@@ -312,8 +1148,9 @@ class OpenAIModel(BaseModel):
                 f" Full response: {response}"
             )
 
-        choice = response.choices[0]
+        return self._validate_choice(response.choices[0])
 
+    def _validate_choice(self, choice: typing.Any) -> str:
         if not hasattr(choice, "message") or choice.message is None:
             raise ValueError(
                 "Malformed response: missing 'message' in first choice. "
@@ -347,3 +1184,307 @@ class OpenAIModel(BaseModel):
             raise ValueError("Model returned empty response")
 
         return content
+
+
+class RemoteModel(BaseModel):
+    """
+    Client for a model served by a local inference daemon
+    (see :mod:`syndisco.server`).
+
+    Lets multiple processes share a single loaded model, avoiding
+    per-process loading times and memory.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str | None = None,
+        remove_string_list: list[str] | None = None,
+        timeout: float = 600.0,
+    ):
+        """
+        Connect to a running model server.
+
+        :param url: The server's base URL, e.g. ``"http://127.0.0.1:8000"``.
+        :type url: str
+        :param name: The pseudoname for this model instance, defaults to the
+            name of the served model.
+        :type name: str | None
+        :param remove_string_list: Strings to remove from responses, in
+            addition to the ones removed by the served model.
+        :type remove_string_list: list[str] | None
+        :param timeout: Seconds to wait for a response before failing.
+        :type timeout: float
+        :raises ConnectionError: If the server can not be reached.
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+        info = self._request("GET", "/info")
+        super().__init__(
+            name if name is not None else info["name"],
+            info["max_out_tokens"],
+            remove_string_list,
+        )
+        logger.info(f"Connected to model server at {self.url}")
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        return self._generate_batch([(system_prompt, user_prompt)])[0]
+
+    def _generate_responses(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> list[str]:
+        # sampled by the served model, instead of repeating its (possibly
+        # greedy) single response
+        return self._generate_batch(
+            [(system_prompt, user_prompt)], num_responses
+        )
+
+    def _generate_batch(
+        self,
+        prompts: typing.Sequence[tuple[str, str]],
+        num_responses: int = 1,
+    ) -> list[str]:
+        payload: dict[str, typing.Any] = {
+            "prompts": [
+                {"system_prompt": system_prompt, "user_prompt": user_prompt}
+                for system_prompt, user_prompt in prompts
+            ]
+        }
+        # only sent when needed, for servers which do not support it
+        if num_responses > 1:
+            payload["num_responses"] = num_responses
+        return self._request("POST", "/generate", payload)["responses"]
+
+    def _request(
+        self, method: str, path: str, payload: dict | None = None
+    ) -> dict[str, typing.Any]:
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(
+            self.url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(
+                f"Model server error ({e.code}): {e.read().decode()}"
+            ) from e
+        except urllib.error.URLError as e:
+            raise ConnectionError(
+                f"Could not reach model server at {self.url}: {e.reason}"
+            ) from e
+
+
+def _mmap_safetensors(
+    path: Path,
+) -> tuple[dict[str, torch.Tensor], mmap.mmap]:
+    """
+    Map a safetensors file into memory without copying its tensors.
+
+    The file is mapped copy-on-write: pages are read from (and shared
+    through) the page cache, and only copied if a tensor is modified.
+
+    :param path: Path to the ``.safetensors`` file.
+    :type path: Path
+    :raises ValueError: If the file contains an unsupported dtype.
+    :return: The tensors by name, and the mapping backing them (which must
+        outlive the tensors).
+    :rtype: tuple[dict[str, torch.Tensor], mmap.mmap]
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+        weight_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        if info["dtype"] not in _SAFETENSORS_DTYPES:
+            raise ValueError(
+                f"Unsupported safetensors dtype {info['dtype']} for {name}"
+            )
+
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        if end == start:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+
+        tensors[name] = torch.frombuffer(
+            weight_mmap,
+            dtype=dtype,
+            count=(end - start) // dtype.itemsize,
+            offset=data_start + start,
+        ).reshape(info["shape"])
+    return tensors, weight_mmap
+
+
+@contextlib.contextmanager
+def _timed_phase(
+    metrics: dict[str, float], phase: str
+) -> typing.Iterator[None]:
+    """
+    Record the wall-clock duration of the enclosed block under *phase*.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics[phase] = time.perf_counter() - start
+
+
+def _load_config(
+    model_path: str | Path, model_kwargs: dict
+) -> tuple[typing.Any, dict]:
+    """
+    Load the config of a checkpoint, applying the config attributes among
+    *model_kwargs* (e.g. ``rope_scaling``), as
+    ``AutoModelForCausalLM.from_pretrained`` does when not given a config.
+
+    :return: The config, and the kwargs left for loading the weights.
+    """
+    config_kwargs = {
+        key: value
+        for key, value in model_kwargs.items()
+        if key not in _WEIGHT_LOADING_KWARGS
+    }
+    config, unused_kwargs = transformers.AutoConfig.from_pretrained(
+        model_path, return_unused_kwargs=True, **config_kwargs
+    )
+    weight_kwargs = {
+        key: value
+        for key, value in model_kwargs.items()
+        if key in _WEIGHT_LOADING_KWARGS or key in _HUB_KWARGS
+    }
+    return config, {**unused_kwargs, **weight_kwargs}
+
+
+def _get_draft_model(
+    model_path: str | Path, dtype: torch.dtype
+) -> tuple[typing.Any, typing.Any]:
+    """
+    Get the draft model and tokenizer of a checkpoint, loading them on
+    first use. Drafts are shared per checkpoint and dtype, so that every
+    main model gets a draft of its own dtype.
+
+    :param model_path: Path or HuggingFace identifier of the checkpoint.
+    :type model_path: str | Path
+    :param dtype: The dtype to load the weights in.
+    :type dtype: torch.dtype
+    :return: The draft model and its tokenizer.
+    :rtype: tuple[Any, Any]
+    """
+    key = (str(model_path), dtype)
+    with _DRAFT_MODELS_LOCK:
+        draft_lock = _DRAFT_MODEL_LOCKS.setdefault(key, threading.Lock())
+
+    with draft_lock:
+        if key not in _DRAFT_MODELS:
+            draft_model = transformers.AutoModelForCausalLM.from_pretrained(
+                model_path, device_map="auto", dtype=dtype
+            ).eval()
+            draft_tokenizer = transformers.AutoTokenizer.from_pretrained(
+                model_path
+            )
+            _DRAFT_MODELS[key] = (draft_model, draft_tokenizer)
+        return _DRAFT_MODELS[key]
+
+
+def _get_shared_client(api_key: str, base_url: str) -> OpenAI:
+    """
+    Get the client used for an endpoint, creating it on first use.
+    Retries are handled by :class:`OpenAIModel`, so they are disabled
+    in the client itself.
+    """
+    key = (base_url, api_key)
+    with _POOL_LOCK:
+        if key not in _CLIENT_POOL:
+            _CLIENT_POOL[key] = OpenAI(
+                api_key=api_key, base_url=base_url, max_retries=0
+            )
+        return _CLIENT_POOL[key]
+
+
+def _get_shared_rate_limiter(
+    api_key: str,
+    base_url: str,
+    requests_per_minute: int | None,
+    tokens_per_minute: int | None,
+) -> _throttling.RateLimiter:
+    """
+    Get the rate limiter for an endpoint and budget, creating it on
+    first use.
+    """
+    key = (base_url, api_key, requests_per_minute, tokens_per_minute)
+    with _POOL_LOCK:
+        if key not in _RATE_LIMITERS:
+            _RATE_LIMITERS[key] = _throttling.RateLimiter(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+        return _RATE_LIMITERS[key]
+
+
+def _get_shared_concurrency_limiter(
+    api_key: str,
+    base_url: str,
+    max_concurrency: int,
+    latency_threshold: float | None,
+) -> _throttling.AdaptiveConcurrencyLimiter:
+    """
+    Get the adaptive concurrency limiter for an endpoint, creating it on
+    first use.
+    """
+    key = (base_url, api_key, max_concurrency, latency_threshold)
+    with _POOL_LOCK:
+        if key not in _CONCURRENCY_LIMITERS:
+            _CONCURRENCY_LIMITERS[key] = (
+                _throttling.AdaptiveConcurrencyLimiter(
+                    max_limit=max_concurrency,
+                    latency_threshold=latency_threshold,
+                )
+            )
+        return _CONCURRENCY_LIMITERS[key]
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """
+    Whether a failed API request should be retried: rate limits (429),
+    server errors (5xx) and connection problems (including timeouts).
+    """
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _truncate_at_stop_sequence(text: str, stop_sequences: list[str]) -> str:
+    """
+    Cut *text* at the earliest occurrence of any of the stop sequences.
+
+    :param text: The generated text.
+    :type text: str
+    :param stop_sequences: The strings marking the end of generation.
+    :type stop_sequences: list[str]
+    :return: The text preceding the first stop sequence, or the whole
+        text if none is present.
+    :rtype: str
+    """
+    cutoff = len(text)
+    for stop_sequence in stop_sequences:
+        index = text.find(stop_sequence)
+        if index != -1:
+            cutoff = min(cutoff, index)
+
+    if cutoff == len(text):
+        return text
+    return text[:cutoff].rstrip()
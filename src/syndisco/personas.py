@@ -0,0 +1,223 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module storing large user populations on disk, creating their
+:class:`Actor` objects only when they take part in a discussion.
+"""
+
+import collections.abc
+import itertools
+import json
+import operator
+import sqlite3
+import typing
+import logging as pylog
+from pathlib import Path
+
+from . import actors
+from . import model
+
+
+logger = pylog.getLogger(Path(__file__).name)
+
+
+_TABLE = "personas"
+# bytes of the database file memory-mapped, instead of read, by SQLite
+_MMAP_SIZE = 1024**3
+_INSERT_BATCH_SIZE = 10000
+
+
+class SQLitePersonaStore(collections.abc.Sequence):
+    """
+    A read-only sequence of users, whose names and personas are stored in
+    an SQLite database. Each access creates a new :class:`Actor`, sharing
+    the store's model, context and instructions, so memory use depends on
+    the number of users in use, not on the size of the population.
+
+    Can be given as the ``users`` of a :class:`DiscussionExperiment`,
+    which only creates the users sampled for each discussion::
+
+        store = SQLitePersonaStore.create(
+            "personas.db", personas, model=llm, context=..., instructions=...
+        )
+        experiment = DiscussionExperiment(users=store, ...)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        model: model.BaseModel | None = None,
+        context: str = "",
+        instructions: str = "",
+    ):
+        """
+        Open a persona store created by :meth:`create`.
+
+        :param path: The database file.
+        :type path: str | Path
+        :param model: The model of all users.
+        :type model: model.BaseModel | None
+        :param context: The context of the discussion, shared by all users.
+        :type context: str
+        :param instructions: The instructions shared by all users.
+        :type instructions: str
+        :raises FileNotFoundError: if the database does not exist.
+        :raises ValueError: if the database is not a persona store.
+        """
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"No persona store at {self.path}")
+
+        self._model = model
+        self.context = context
+        self.instructions = instructions
+
+        self._connection = _connect(self.path, read_only=True)
+        try:
+            count, max_id = self._connection.execute(
+                f"SELECT COUNT(*), MAX(id) FROM {_TABLE}"
+            ).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(
+                f"{self.path} is not a persona store: {e}"
+            ) from e
+
+        # users are looked up by primary key, which requires ids 1..n
+        if count > 0 and max_id != count:
+            raise ValueError(
+                f"Persona ids in {self.path} must be consecutive, "
+                "starting from 1."
+            )
+        self._num_personas = count
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        personas: typing.Iterable[dict[str, typing.Any]],
+        name_key: str = "name",
+        **kwargs: typing.Any,
+    ) -> "SQLitePersonaStore":
+        """
+        Write a population of users to a new persona store, and open it.
+
+        :param path: The database file, which must not exist.
+        :type path: str | Path
+        :param personas: The persona of each user. Iterated once, so it
+            may be a generator over a larger-than-memory population.
+        :type personas: Iterable[dict[str, Any]]
+        :param name_key: The persona attribute holding the user's name,
+            which is not part of the persona itself.
+        :type name_key: str
+        :param kwargs: Arguments of the store, see :meth:`__init__`.
+        :raises FileExistsError: if *path* already exists.
+        :raises KeyError: if a persona has no name.
+        :return: The opened store.
+        :rtype: SQLitePersonaStore
+        """
+        path = Path(path)
+        if path.exists():
+            raise FileExistsError(f"{path} already exists.")
+
+        connection = _connect(path, read_only=False)
+        try:
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE {_TABLE} (id INTEGER PRIMARY KEY, "
+                    "name TEXT NOT NULL, persona TEXT NOT NULL)"
+                )
+                rows = (
+                    (
+                        persona[name_key],
+                        json.dumps(
+                            {
+                                key: value
+                                for key, value in persona.items()
+                                if key != name_key
+                            }
+                        ),
+                    )
+                    for persona in personas
+                )
+                while batch := list(
+                    itertools.islice(rows, _INSERT_BATCH_SIZE)
+                ):
+                    connection.executemany(
+                        f"INSERT INTO {_TABLE} (name, persona) VALUES (?, ?)",
+                        batch,
+                    )
+        finally:
+            connection.close()
+
+        return cls(path, **kwargs)
+
+    def __len__(self) -> int:
+        return self._num_personas
+
+    @typing.overload
+    def __getitem__(self, index: int) -> actors.Actor: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list[actors.Actor]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> actors.Actor | list[actors.Actor]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        # also accepts numpy integers, which SQLite can not bind
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Persona index {index} out of range.")
+
+        name, persona = self._connection.execute(
+            f"SELECT name, persona FROM {_TABLE} WHERE id = ?", (index + 1,)
+        ).fetchone()
+        return actors.Actor(
+            model=self._model,
+            persona=json.loads(persona),
+            context=self.context,
+            instructions=self.instructions,
+            name=name,
+        )
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # connections can not be copied or sent to other processes
+        state = self.__dict__.copy()
+        del state["_connection"]
+        return state
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        self.__dict__.update(state)
+        self._connection = _connect(self.path, read_only=True)
+
+
+def _connect(path: Path, read_only: bool) -> sqlite3.Connection:
+    if read_only:
+        connection = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        connection.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+    else:
+        connection = sqlite3.connect(path)
+    return connection
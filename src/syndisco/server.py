@@ -0,0 +1,340 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module serving a loaded model to other processes over localhost HTTP.
+
+A model is loaded once by the server, and any number of experiment
+processes, notebooks or annotation jobs on the same node can use it through
+:class:`syndisco.RemoteModel`. Concurrent requests are grouped into batches.
+
+The server can be started from the command line::
+
+    python -m syndisco.server --model-path <path> --name <name> \\
+        --max-out-tokens 300 --port 8000
+"""
+
+import argparse
+import json
+import queue
+import threading
+import typing
+import logging
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import model
+
+
+logger = logging.getLogger(Path(__file__).name)
+
+
+class ModelServer:
+    """
+    An HTTP server generating responses with a single, shared model.
+    """
+
+    def __init__(
+        self,
+        served_model: model.BaseModel,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_batch_size: int = 8,
+        batch_timeout: float = 0.01,
+    ):
+        """
+        Create a model server. The server does not accept requests until
+        :meth:`start` or :meth:`serve_forever` is called.
+
+        :param served_model: The model generating the responses.
+        :type served_model: model.BaseModel
+        :param host: The interface to listen on. Defaults to localhost only.
+        :type host: str
+        :param port: The port to listen on, 0 to pick a free port.
+        :type port: int
+        :param max_batch_size: The maximum number of prompts generated
+            together.
+        :type max_batch_size: int
+        :param batch_timeout: How many seconds to wait for more prompts to
+            join a batch, once the first prompt has arrived.
+        :type batch_timeout: float
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+
+        self.model = served_model
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+
+        self._pending: queue.Queue[tuple[str, str, Future]] = queue.Queue()
+        self._stopped = threading.Event()
+        self._batch_thread = threading.Thread(
+            target=self._batch_loop, daemon=True
+        )
+        self._http_thread: threading.Thread | None = None
+        # the HTTP server can only be shut down once it has been started
+        self._serving = False
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """The base URL clients should connect to."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        """
+        Serve requests until :meth:`shutdown` is called (or the process
+        is interrupted).
+        """
+        self._serving = True
+        self._start_batching()
+        logger.info(f"Serving model {self.model.get_name()} at {self.url}")
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._stopped.set()
+            self._fail_pending()
+
+    def start(self) -> None:
+        """
+        Serve requests from a background thread.
+        """
+        # set before the thread runs, so that an immediate shutdown waits
+        # for the server to start and stop
+        self._serving = True
+        self._http_thread = threading.Thread(
+            target=self.serve_forever, daemon=True
+        )
+        self._http_thread.start()
+
+    def shutdown(self) -> None:
+        """
+        Stop serving requests and release the port. The batch being
+        generated is completed, while prompts still waiting for a batch
+        fail with a :class:`RuntimeError`.
+        """
+        if self._serving:
+            self._httpd.shutdown()
+        self._httpd.server_close()
+        self._stopped.set()
+        if self._http_thread is not None:
+            self._http_thread.join()
+        if self._batch_thread.is_alive():
+            self._batch_thread.join()
+        self._fail_pending()
+
+    def generate(
+        self,
+        prompts: typing.Sequence[tuple[str, str]],
+        num_responses: int = 1,
+    ) -> list[str]:
+        """
+        Queue prompts for generation and wait for their responses.
+
+        :param prompts: ``(system_prompt, user_prompt)`` pairs.
+        :type prompts: Sequence[tuple[str, str]]
+        :param num_responses: The number of responses sampled for each
+            prompt (see :meth:`BaseModel.prompt_multiple`).
+        :type num_responses: int, defaults to 1
+        :raises ValueError: if *num_responses* is not positive.
+        :raises RuntimeError: if the server is shut down before the
+            prompts are generated.
+        :return: The model's responses, *num_responses* consecutive
+            responses for each prompt.
+        :rtype: list[str]
+        """
+        if num_responses < 1:
+            raise ValueError(
+                f"num_responses must be at least 1, but is {num_responses}"
+            )
+        if self._stopped.is_set():
+            raise RuntimeError("The model server is shut down.")
+
+        futures = []
+        for system_prompt, user_prompt in prompts:
+            future: Future = Future()
+            self._pending.put(
+                (system_prompt, user_prompt, num_responses, future)
+            )
+            futures.append(future)
+        if self._stopped.is_set():
+            # shut down while queueing, so no batch may pick them up
+            self._fail_pending()
+        return [
+            response for future in futures for response in future.result()
+        ]
+
+    def _start_batching(self) -> None:
+        if not self._batch_thread.is_alive():
+            self._batch_thread.start()
+
+    def _batch_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                batch = [self._pending.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._pending.get(timeout=self.batch_timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _fail_pending(self) -> None:
+        """
+        Fail the prompts still waiting for a batch, so that their
+        requests do not wait forever.
+        """
+        while True:
+            try:
+                *_, future = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            future.set_exception(
+                RuntimeError("The model server is shut down.")
+            )
+
+    def _run_batch(self, batch: list[tuple[str, str, int, Future]]) -> None:
+        logger.debug(f"Generating batch of {len(batch)} prompts")
+        single = [item for item in batch if item[2] == 1]
+        if single:
+            try:
+                responses = self.model.prompt_batch(
+                    [(system, user) for system, user, _, _ in single]
+                )
+            except Exception as e:
+                logger.exception("Batch generation failed.")
+                for *_, future in single:
+                    future.set_exception(e)
+            else:
+                for (*_, future), response in zip(single, responses):
+                    future.set_result([response])
+
+        # the model samples all responses to the same prompt at once
+        for system, user, num_responses, future in batch:
+            if num_responses == 1:
+                continue
+            try:
+                future.set_result(
+                    self.model.prompt_multiple(system, user, num_responses)
+                )
+            except Exception as e:
+                logger.exception("Generation failed.")
+                future.set_exception(e)
+
+
+def _make_handler(server: ModelServer) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/info":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+
+            self._send_json(
+                200,
+                {
+                    "name": server.model.get_name(),
+                    "max_out_tokens": server.model.max_out_tokens,
+                },
+            )
+
+        def do_POST(self) -> None:
+            if self.path != "/generate":
+                self._send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                prompts = [
+                    (entry["system_prompt"], entry["user_prompt"])
+                    for entry in payload["prompts"]
+                ]
+                num_responses = int(payload.get("num_responses", 1))
+                if num_responses < 1:
+                    raise ValueError("num_responses must be positive")
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Malformed request: {e}"})
+                return
+
+            try:
+                responses = server.generate(prompts, num_responses)
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+
+            self._send_json(200, {"responses": responses})
+
+        def log_message(self, format: str, *args: typing.Any) -> None:
+            logger.debug(format % args)
+
+        def _send_json(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return _Handler
+
+
+def main() -> None:
+    """
+    Load a :class:`~syndisco.TransformersModel` and serve it until
+    interrupted.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve a HuggingFace model to SynDisco processes."
+    )
+    parser.add_argument("--model-path", required=True)
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--max-out-tokens", type=int, default=300)
+    parser.add_argument("--profile", default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    served_model = model.TransformersModel(
+        model_path=args.model_path,
+        name=args.name,
+        max_out_tokens=args.max_out_tokens,
+        profile=args.profile,
+    )
+    server = ModelServer(
+        served_model,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down model server.")
+
+
+if __name__ == "__main__":
+    main()
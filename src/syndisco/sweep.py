@@ -0,0 +1,308 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Module running parameter sweeps over discussion experiments.
+"""
+
+import inspect
+import itertools
+import json
+import time
+import typing
+import logging as pylog
+from pathlib import Path
+
+import numpy as np
+from tqdm.auto import tqdm
+
+from . import actors
+from . import experiments
+from . import model
+
+
+logger = pylog.getLogger(Path(__file__).name)
+
+
+_EXPERIMENT_PARAMS = set(
+    inspect.signature(experiments.DiscussionExperiment.__init__).parameters
+) - {"self", "seed"}
+
+
+class DiscussionSweep:
+    """
+    A grid of discussion experiments, varying any of the parameters of
+    :class:`DiscussionExperiment` (e.g. ``history_ctx_len``, ``num_turns``,
+    ``turn_manager`` or ``users`` with different model assignments).
+
+    All configurations share the same seed, so the *i*-th discussion of
+    each configuration uses the same topic and participants wherever
+    the configurations allow it. Models, being held by the users, are
+    loaded once and reused by every configuration.
+
+    Example::
+
+        sweep = DiscussionSweep(
+            grid={
+                "history_ctx_len": [2, 4],
+                "turn_manager": [
+                    RespondTurnManager(p_respond=0.2),
+                    RespondTurnManager(p_respond=0.6),
+                ],
+            },
+            users=users,
+            num_discussions=10,
+            seed=42,
+        )
+        sweep.begin(Path("output/sweep"))
+    """
+
+    def __init__(
+        self,
+        grid: dict[str, typing.Sequence[typing.Any]],
+        seed: int | None = None,
+        **fixed_params: typing.Any,
+    ):
+        """
+        Create a parameter sweep.
+
+        :param grid: The values tried for each varied parameter. Every
+            combination of values is run as a separate experiment.
+        :type grid: dict[str, Sequence[Any]]
+        :param seed: The seed shared by all experiments,
+            see :class:`DiscussionExperiment`. If None, a random seed is
+            drawn once for the whole sweep.
+        :type seed: int | None
+        :param fixed_params: Parameters of :class:`DiscussionExperiment`
+            common to all experiments, e.g. ``users``.
+        :raises ValueError: if a parameter is unknown, both varied and
+            fixed, or has no values.
+        """
+        for name in list(grid) + list(fixed_params):
+            if name not in _EXPERIMENT_PARAMS:
+                raise ValueError(
+                    f"Unknown experiment parameter '{name}'. Valid "
+                    f"parameters are: {sorted(_EXPERIMENT_PARAMS)}"
+                )
+
+        overlapping = set(grid) & set(fixed_params)
+        if overlapping:
+            raise ValueError(
+                f"Parameters {sorted(overlapping)} are both varied and fixed."
+            )
+
+        for name, values in grid.items():
+            if len(values) == 0:
+                raise ValueError(f"No values given for parameter '{name}'.")
+
+        self._grid = {name: list(values) for name, values in grid.items()}
+        self._fixed_params = fixed_params
+        # drawn once, so that all experiments share it
+        self.seed = (
+            seed if seed is not None else np.random.SeedSequence().entropy
+        )
+
+    def plan(self) -> list[dict[str, typing.Any]]:
+        """
+        Expand the grid into the parameters of each experiment. Identical
+        combinations (e.g. from repeated values) are only included once.
+
+        :return: The varied parameters of each experiment, in run order.
+        :rtype: list[dict[str, Any]]
+        """
+        names = list(self._grid)
+        plan = []
+        seen = set()
+        for values in itertools.product(*self._grid.values()):
+            config = dict(zip(names, values))
+            key = json.dumps(
+                {name: _describe(value) for name, value in config.items()},
+                sort_keys=True,
+            )
+            if key not in seen:
+                seen.add(key)
+                plan.append(config)
+        return plan
+
+    def begin(
+        self,
+        output_dir: Path,
+        verbose: bool = True,
+        archive: str | None = None,
+    ) -> None:
+        """
+        Run every experiment of the sweep, one discussion at a time,
+        under a single progress bar.
+
+        The discussions of the *i*-th experiment are written to
+        ``output_dir/config_<i>``, and the varied parameters of every
+        experiment to ``output_dir/plan.json``.
+
+        :param output_dir: The directory of the sweep's outputs.
+        :type output_dir: Path
+        :param verbose: Whether to print the discussions' comments.
+        :type verbose: bool
+        :param archive: If given (``"gzip"`` or ``"zstd"``), each
+            configuration's discussions are appended to compressed shards
+            in its directory (see :class:`LogArchive`), instead of being
+            written to one JSON file each.
+        :type archive: str | None
+        """
+        plan = self.plan()
+        sweep_experiments = [
+            experiments.DiscussionExperiment(
+                **self._fixed_params, **config, seed=self.seed
+            )
+            for config in plan
+        ]
+        config_dirs = [
+            output_dir / f"config_{i:03d}" for i in range(len(plan))
+        ]
+        self._write_plan(plan, config_dirs, output_dir)
+
+        total = sum(exp.num_discussions for exp in sweep_experiments)
+        logger.info(
+            f"Starting sweep of {len(plan)} configurations "
+            f"({total} discussions)."
+        )
+        with tqdm(total=total) as progress:
+            for config, experiment, config_dir in zip(
+                plan, sweep_experiments, config_dirs
+            ):
+                self._run_experiment(
+                    config, experiment, config_dir, verbose, archive, progress
+                )
+        logger.info("Finished sweep.")
+
+    def _run_experiment(
+        self,
+        config: dict[str, typing.Any],
+        experiment: experiments.DiscussionExperiment,
+        output_dir: Path,
+        verbose: bool,
+        archive: str | None,
+        progress: tqdm,
+    ) -> None:
+        params = {name: _describe(value) for name, value in config.items()}
+        logger.info(f"Running configuration {output_dir.name}: {params}")
+        start_time = time.perf_counter()
+        for _ in experiment.run_discussions(
+            output_dir, verbose=verbose, archive=archive
+        ):
+            progress.update(1)
+        logger.info(
+            f"Finished configuration {output_dir.name} in "
+            f"{time.perf_counter() - start_time:.1f}s"
+        )
+
+    def _write_plan(
+        self,
+        plan: list[dict[str, typing.Any]],
+        config_dirs: list[Path],
+        output_dir: Path,
+    ) -> None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "seed": self.seed,
+            "fixed": {
+                name: _describe(value)
+                for name, value in self._fixed_params.items()
+            },
+            "configs": [
+                {
+                    "name": config_dir.name,
+                    "params": {
+                        name: _describe(value)
+                        for name, value in config.items()
+                    },
+                }
+                for config, config_dir in zip(plan, config_dirs)
+            ],
+        }
+        with open(output_dir / "plan.json", "w", encoding="utf8") as fout:
+            json.dump(manifest, fout, indent=4)
+
+
+def _describe(
+    value: typing.Any, _visiting: frozenset[int] = frozenset()
+) -> typing.Any:
+    """
+    Describe a parameter value with JSON-serializable data, which is
+    equal for values configuring the same work. Values which cannot be
+    described are identified by their object, so that they are never
+    mistaken for each other.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if isinstance(value, Path):
+        return str(value)
+
+    if isinstance(value, actors.Actor):
+        return {
+            "name": value.get_actor_name(),
+            "model": _describe(value._model, _visiting),
+            "prompt": value.get_system_prompt(),
+        }
+
+    if isinstance(value, model.BaseModel):
+        # models are shared, not copied, between configurations, and their
+        # name alone does not identify their weights or settings
+        return _identify(value)
+
+    if id(value) in _visiting:
+        return _identify(value)
+    _visiting = _visiting | {id(value)}
+
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    if isinstance(value, (list, tuple)):
+        return [_describe(item, _visiting) for item in value]
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(
+            (_describe(item, _visiting) for item in value),
+            key=lambda item: json.dumps(item, sort_keys=True),
+        )
+
+    if isinstance(value, dict):
+        return {str(k): _describe(v, _visiting) for k, v in value.items()}
+
+    try:
+        attributes = vars(value)
+    except TypeError:
+        return _identify(value)
+
+    # configuration objects (e.g. turn managers) are described by their
+    # settings; generators are skipped, since the sweep seeds them per run
+    settings = {
+        name.lstrip("_"): _describe(setting, _visiting)
+        for name, setting in attributes.items()
+        if not isinstance(setting, np.random.Generator)
+    }
+    return {"type": type(value).__name__, **settings}
+
+
+def _identify(value: typing.Any) -> dict[str, typing.Any]:
+    """
+    Describe a value by its object, so that it only equals itself.
+    """
+    return {"type": type(value).__name__, "id": id(value)}
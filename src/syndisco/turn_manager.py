@@ -27,16 +27,27 @@ from collections.abc import Iterable
 
 import numpy as np
 
+from . import _sampling
 from .actors import Actor
 
 
+# tries before falling back to sampling without the last speaker in O(n)
+_MAX_REJECTIONS = 32
+# excitation scale below which excitations are renormalized
+_MIN_EXCITATION_SCALE = 1e-150
+
+
 class TurnManager(Iterable, abc.ABC):
     """
     An abstract class specifying the selection of the next speaker in a
     :class:`Discussion`.
     """
 
-    def __init__(self, actors: Iterable[Actor] | None = None):
+    def __init__(
+        self,
+        actors: Iterable[Actor] | None = None,
+        random_state: np.random.Generator | None = None,
+    ):
         """
         Construct a new TurnManager.
 
@@ -44,12 +55,18 @@ class TurnManager(Iterable, abc.ABC):
             Can be left null if the participants are to be decided
             after this object's creation.
         :type actors: Iterable[Actor]
+        :param random_state: The generator used for any random choices.
+            A new, unseeded generator is used if None.
+        :type random_state: np.random.Generator | None
         """
         if actors is None:
             self._actors = []
         else:
             self._actors = list(actors)
 
+        self._rng = random_state or np.random.default_rng()
+        self._on_actors_changed()
+
     @typing.final
     def set_actors(self, actors: typing.Sequence[Actor]) -> None:
         """
@@ -59,6 +76,7 @@ class TurnManager(Iterable, abc.ABC):
         :type names: Sequence[Actor]
         """
         self._actors = list(actors)
+        self._on_actors_changed()
 
     @typing.final
     def next(self) -> Actor:
@@ -78,7 +96,9 @@ class TurnManager(Iterable, abc.ABC):
             )
         return self._next_impl()
 
-    def make_instance(self) -> typing.Self:
+    def make_instance(
+        self, random_state: np.random.Generator | None = None
+    ) -> typing.Self:
         """
         Return a fresh copy of this manager with static configuration
         preserved and per-discussion state reset.
@@ -86,18 +106,55 @@ class TurnManager(Iterable, abc.ABC):
         Called once per discussion by :class:`DiscussionExperiment`.
         Subclasses with additional stateful attributes should override
         this method and reset those attributes on the returned instance.
+
+        :param random_state: The generator of the new instance. If None,
+            the generator is shared with this manager.
+        :type random_state: np.random.Generator | None
         """
         instance = copy.copy(self)
         instance._actors = []
+        instance._on_actors_changed()
+        if random_state is not None:
+            instance.set_random_state(random_state)
         # subclasses with extra mutable state should override this
         return instance
 
+    @typing.final
+    def set_random_state(self, random_state: np.random.Generator) -> None:
+        """
+        Replace the generator used for any random choices, e.g. with a
+        seeded one.
+
+        :param random_state: The new generator.
+        :type random_state: np.random.Generator
+        """
+        self._rng = random_state
+
+    def fork(self) -> typing.Self:
+        """
+        Return an independent copy of this manager, including its
+        per-discussion state (turn counters, previous speakers, random
+        generator state). The actors themselves are shared, not copied.
+
+        Called by :meth:`Discussion.fork`.
+        """
+        # the actors (and their models) must not be copied
+        memo = {id(actor): actor for actor in self._actors}
+        return copy.deepcopy(self, memo)
+
     def __iter__(self):
         return self
 
     def __next__(self):
         return self.next()
 
+    def _on_actors_changed(self) -> None:
+        """
+        Called whenever the participants are set. Subclasses precomputing
+        per-actor data (e.g. sampling tables) should override this, so
+        that no turn needs to scan all actors.
+        """
+
     @abc.abstractmethod
     def _next_impl(self) -> Actor:
         raise NotImplementedError("Abstract method called")
@@ -114,13 +171,11 @@ class QueueTurnManager(TurnManager):
         randomize_first_speaker: bool = False,
         random_state: np.random.Generator | None = None,
     ):
-        super().__init__(actors)
+        super().__init__(actors, random_state=random_state)
 
         self._randomize_first_speaker = randomize_first_speaker
         self._curr_turn = None
 
-        self._rng = random_state or np.random.default_rng()
-
     def _next_impl(self):
         if self._curr_turn is None:
             # the second condition exists just show the linter shuts up
@@ -134,8 +189,10 @@ class QueueTurnManager(TurnManager):
         self._curr_turn += 1
         return self._actors[self._curr_turn % len(self._actors)]
 
-    def make_instance(self):
-        instance = super().make_instance()
+    def make_instance(
+        self, random_state: np.random.Generator | None = None
+    ) -> typing.Self:
+        instance = super().make_instance(random_state)
         instance._curr_turn = None
         return instance
 
@@ -152,7 +209,7 @@ class RespondTurnManager(TurnManager):
         p_respond: float = 0.5,
         random_state: np.random.Generator | None = None,
     ):
-        super().__init__(actors)
+        super().__init__(actors, random_state=random_state)
 
         # Keep assertions for robust input validation
         assert (
@@ -170,12 +227,13 @@ class RespondTurnManager(TurnManager):
 
         self._chance_to_respond = p_respond
 
-        self._rng = random_state or np.random.default_rng()
         self._last_speaker: Actor | None = None
         self._second_to_last_speaker: Actor | None = None
 
-    def make_instance(self) -> typing.Self:
-        instance = super().make_instance()
+    def make_instance(
+        self, random_state: np.random.Generator | None = None
+    ) -> typing.Self:
+        instance = super().make_instance(random_state)
         instance._last_speaker = None
         instance._second_to_last_speaker = None
         # We rely on copy.copy() to handle the copying of the generator
@@ -214,13 +272,39 @@ class RespondTurnManager(TurnManager):
         """Return True if the last speaker should respond again."""
         return self._rng.random() < self.chance_to_respond
 
+    def _on_actors_changed(self) -> None:
+        # positions of the actors, if each actor appears only once
+        positions = {id(actor): i for i, actor in enumerate(self._actors)}
+        self._positions = (
+            positions if len(positions) == len(self._actors) else None
+        )
+
     def _random_actor(self, exclude: Actor | None = None) -> Actor:
         """Select a random actor, optionally excluding one."""
+        num_actors = len(self._actors)
         if exclude is None:
-            num_actors = len(self._actors)
             random_index = self._rng.integers(low=0, high=num_actors)
             return self._actors[random_index]
 
+        exclude_index = (
+            self._positions.get(id(exclude))
+            if self._positions is not None
+            else None
+        )
+        if (
+            exclude_index is not None
+            and self._actors[exclude_index] is exclude
+        ):
+            # draw among the other actors by skipping over the excluded
+            # one, which picks the same actor as drawing from a list of
+            # candidates without it, but in constant time
+            if num_actors == 1:
+                return exclude
+            random_index = self._rng.integers(low=0, high=num_actors - 1)
+            if random_index >= exclude_index:
+                random_index += 1
+            return self._actors[random_index]
+
         candidates = [actor for actor in self._actors if actor != exclude]
 
         if not candidates:
@@ -243,4 +327,255 @@ class RandomTurnManager(RespondTurnManager):
         random_seed: int | None = None,
         random_state: np.random.Generator | None = None,
     ):
+        if random_state is None and random_seed is not None:
+            random_state = np.random.default_rng(random_seed)
         super().__init__(actors=actors, p_respond=0, random_state=random_state)
+
+
+class WeightedTurnManager(TurnManager):
+    """
+    Chooses the next participant with probability proportional to their
+    activity level, excluding the last speaker.
+
+    Speakers are drawn from an alias table built once per set of
+    participants, so that each turn takes constant time regardless of the
+    number of participants.
+    """
+
+    def __init__(
+        self,
+        actors: Iterable[Actor] | None = None,
+        activity: typing.Mapping[str, float] | None = None,
+        default_activity: float = 1.0,
+        random_state: np.random.Generator | None = None,
+    ):
+        """
+        Construct a new WeightedTurnManager.
+
+        :param actors: The participants.
+        :type actors: Iterable[Actor] | None
+        :param activity: The relative activity level of participants,
+            by actor name. Participants with twice the activity speak
+            twice as often.
+        :type activity: Mapping[str, float] | None
+        :param default_activity: The activity level of participants not
+            in *activity*.
+        :type default_activity: float
+        :param random_state: The generator used for any random choices.
+        :type random_state: np.random.Generator | None
+        :raises ValueError: if an activity level is negative.
+        """
+        self._activity = dict(activity) if activity is not None else {}
+        self._default_activity = default_activity
+        if any(level < 0 for level in self._activity.values()) or (
+            default_activity < 0
+        ):
+            raise ValueError("Activity levels must be non-negative.")
+
+        self._table: _sampling.AliasTable | None = None
+        self._last_index: int | None = None
+        super().__init__(actors, random_state=random_state)
+
+    def get_weights(self) -> list[float]:
+        """
+        Get the activity level of each participant, in order.
+
+        :return: The activity levels.
+        :rtype: list[float]
+        """
+        return [
+            self._activity.get(actor.get_actor_name(), self._default_activity)
+            for actor in self._actors
+        ]
+
+    def _on_actors_changed(self) -> None:
+        self._last_index = None
+        self._table = (
+            _sampling.AliasTable(self.get_weights()) if self._actors else None
+        )
+
+    def _next_impl(self) -> Actor:
+        assert self._table is not None
+        next_index = self._sample_index()
+        self._last_index = next_index
+        return self._actors[next_index]
+
+    def _sample_index(self) -> int:
+        # rejecting the last speaker yields the distribution without them,
+        # and only takes a few tries unless they hold most of the weight
+        for _ in range(_MAX_REJECTIONS):
+            index = self._table.sample(self._rng)
+            if index != self._last_index:
+                return index
+
+        weights = np.asarray(self.get_weights())
+        weights[self._last_index] = 0
+        if weights.sum() == 0:
+            # nobody else can speak
+            return self._last_index
+        return int(self._rng.choice(len(weights), p=weights / weights.sum()))
+
+
+class HawkesTurnManager(TurnManager):
+    """
+    Chooses the next participant according to a self-exciting (Hawkes)
+    process, excluding the last speaker.
+
+    Each participant speaks with probability proportional to their
+    intensity, i.e. their baseline activity plus an excitation which
+    decays geometrically every turn. Speaking excites the speaker
+    (``self_excitation``), and replying to someone excites the participant
+    replied to (``reply_excitation``), so that active participants and
+    back-and-forth exchanges persist for a while.
+
+    Baseline activity is sampled from an alias table built once per set of
+    participants, and excitations from a Fenwick tree updated in place.
+    The decay is applied to all excitations at once through a shared
+    scale, so each turn takes O(log n) time for n participants,
+    regardless of the length of the discussion.
+    """
+
+    def __init__(
+        self,
+        actors: Iterable[Actor] | None = None,
+        activity: typing.Mapping[str, float] | None = None,
+        default_activity: float = 1.0,
+        self_excitation: float = 0.5,
+        reply_excitation: float = 1.0,
+        decay: float = 0.8,
+        random_state: np.random.Generator | None = None,
+    ):
+        """
+        Construct a new HawkesTurnManager.
+
+        :param actors: The participants.
+        :type actors: Iterable[Actor] | None
+        :param activity: The baseline activity level of participants, by
+            actor name. At least one participant needs a positive level.
+        :type activity: Mapping[str, float] | None
+        :param default_activity: The baseline activity level of
+            participants not in *activity*.
+        :type default_activity: float
+        :param self_excitation: The intensity added to a participant after
+            they speak.
+        :type self_excitation: float
+        :param reply_excitation: The intensity added to the previous
+            speaker when another participant replies to them.
+        :type reply_excitation: float
+        :param decay: The factor by which excitations are multiplied every
+            turn, in (0, 1].
+        :type decay: float
+        :param random_state: The generator used for any random choices.
+        :type random_state: np.random.Generator | None
+        :raises ValueError: if a parameter is out of range.
+        """
+        self._activity = dict(activity) if activity is not None else {}
+        self._default_activity = default_activity
+        if any(level < 0 for level in self._activity.values()) or (
+            default_activity < 0
+        ):
+            raise ValueError("Activity levels must be non-negative.")
+        if self_excitation < 0 or reply_excitation < 0:
+            raise ValueError("Excitations must be non-negative.")
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], but is {decay}")
+
+        self._self_excitation = self_excitation
+        self._reply_excitation = reply_excitation
+        self._decay = decay
+
+        self._baseline: _sampling.AliasTable | None = None
+        # excitations divided by the current scale
+        self._excitation = _sampling.FenwickTree([])
+        self._scale = 1.0
+        self._last_index: int | None = None
+        super().__init__(actors, random_state=random_state)
+
+    def get_intensities(self) -> list[float]:
+        """
+        Get the current intensity of each participant, in order. The
+        probability of speaking next is proportional to it (except for the
+        last speaker, who can not speak twice in a row).
+
+        :return: The intensities.
+        :rtype: list[float]
+        """
+        return [
+            baseline + self._scale * excitation
+            for baseline, excitation in zip(
+                self._get_baselines(), self._excitation.values()
+            )
+        ]
+
+    def _get_baselines(self) -> list[float]:
+        return [
+            self._activity.get(actor.get_actor_name(), self._default_activity)
+            for actor in self._actors
+        ]
+
+    def _on_actors_changed(self) -> None:
+        self._last_index = None
+        self._scale = 1.0
+        self._excitation = _sampling.FenwickTree([0.0] * len(self._actors))
+        self._baseline = (
+            _sampling.AliasTable(self._get_baselines())
+            if self._actors
+            else None
+        )
+
+    def _next_impl(self) -> Actor:
+        next_index = self._sample_index()
+        self._excite(next_index)
+        self._last_index = next_index
+        return self._actors[next_index]
+
+    def _sample_index(self) -> int:
+        for _ in range(_MAX_REJECTIONS):
+            index = self._sample_any()
+            if index != self._last_index:
+                return index
+
+        intensities = np.asarray(self.get_intensities())
+        intensities[self._last_index] = 0
+        if intensities.sum() == 0:
+            return self._last_index
+        return int(
+            self._rng.choice(
+                len(intensities), p=intensities / intensities.sum()
+            )
+        )
+
+    def _sample_any(self) -> int:
+        assert self._baseline is not None
+        excitation_total = self._scale * self._excitation.total
+        if (
+            self._rng.random() * (self._baseline.total + excitation_total)
+            < self._baseline.total
+        ):
+            return self._baseline.sample(self._rng)
+        return self._excitation.sample(self._rng)
+
+    def _excite(self, speaker_index: int) -> None:
+        # decaying all excitations only changes their shared scale, and new
+        # excitations are stored relative to it
+        self._scale *= self._decay
+        if self._scale < _MIN_EXCITATION_SCALE:
+            self._renormalize()
+
+        self._excitation.add(
+            speaker_index, self._self_excitation / self._scale
+        )
+        if self._last_index is not None and self._last_index != speaker_index:
+            self._excitation.add(
+                self._last_index, self._reply_excitation / self._scale
+            )
+
+    def _renormalize(self) -> None:
+        """
+        Fold the scale into the stored excitations, before it underflows.
+        Takes O(n) time, but only once every many turns.
+        """
+        self._excitation = _sampling.FenwickTree(
+            [value * self._scale for value in self._excitation.values()]
+        )
+        self._scale = 1.0
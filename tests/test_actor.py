@@ -22,6 +22,9 @@ Uses DummyModel — a deterministic stub that returns preset strings on
 successive calls — so tests are hermetic and never hit a real LLM.
 """
 
+import copy
+import pickle
+
 import pytest
 from syndisco import Actor
 
@@ -107,6 +110,29 @@ class TestActorConstruction:
     def test_is_annotator_true_when_set(self, annotator_actor) -> None:
         assert annotator_actor.is_annotator is True
 
+    def test_has_no_instance_dict(self, actor) -> None:
+        assert not hasattr(actor, "__dict__")
+        with pytest.raises(AttributeError):
+            actor.nickname = "Al"
+
+    def test_shares_equal_prompt_components(self, dummy_model) -> None:
+        # built at runtime, so that they are distinct objects
+        context = "".join(["A ", "forum."])
+        other_context = "".join(["A ", "forum."])
+        assert context is not other_context
+
+        first = Actor(model=dummy_model, context=context)
+        second = Actor(model=dummy_model, context=other_context)
+        assert first.context is second.context
+
+    def test_copies_and_pickles(self, actor) -> None:
+        for restored in (
+            copy.deepcopy(actor),
+            pickle.loads(pickle.dumps(actor)),
+        ):
+            assert restored.get_actor_name() == "Alice"
+            assert restored.get_system_prompt() == actor.get_system_prompt()
+
 
 class TestGetSystemPrompt:
     def test_returns_string(self, actor) -> None:
@@ -259,3 +285,20 @@ class TestSpeak:
     def test_annotator_speak_produces_output(self, annotator_actor) -> None:
         result = annotator_actor.speak(history=["Alice: Interesting point."])
         assert isinstance(result, str) and len(result) > 0
+
+
+class TestSpeakMultiple:
+    def test_returns_requested_number_of_responses(self, actor) -> None:
+        assert actor.speak_multiple(3) == [
+            "First response.",
+            "Second response.",
+            "Third response.",
+        ]
+
+    def test_invalid_number_of_responses_raises(self, actor) -> None:
+        with pytest.raises(ValueError):
+            actor.speak_multiple(0)
+
+    def test_no_model_raises(self) -> None:
+        with pytest.raises(ValueError):
+            Actor(name="Nobody").speak_multiple(2)
@@ -0,0 +1,178 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the compressed, sharded log archives.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from syndisco import (
+    AnnotationExperiment,
+    DiscussionExperiment,
+    JobQueue,
+    LogArchive,
+    Logs,
+    RespondTurnManager,
+)
+from .dummy import DummyActor
+
+
+def make_logs(text: str = "Hello") -> Logs:
+    logs = Logs()
+    logs.append(name="Alice", text=text, model="m", prompt="p")
+    logs.append(name="Bob", text="Hi", model="m")
+    return logs
+
+
+class TestLogArchive:
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path)
+        archive.append("job-1", b'{"a": 1}')
+        archive.append("job-2", b'{"b": 2}')
+        assert archive.get("job-1") == b'{"a": 1}'
+        assert archive.get("job-2") == b'{"b": 2}'
+        assert archive.job_ids() == ["job-1", "job-2"]
+        assert "job-1" in archive
+        assert "job-3" not in archive
+
+    def test_missing_job_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(KeyError):
+            LogArchive(tmp_path).get("missing")
+
+    def test_latest_write_wins(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path)
+        archive.append("job", b"1")
+        archive.append("job", b"2")
+        assert archive.get("job") == b"2"
+        assert len(archive) == 1
+
+    def test_shards_roll_over(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path, max_shard_bytes=1, writer_id="w")
+        for i in range(3):
+            archive.append(f"job-{i}", b"data")
+        assert len(list(tmp_path.glob("shard-w-*"))) == 3
+        assert archive.get("job-1") == b"data"
+
+    def test_shard_is_jsonl(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path, writer_id="w")
+        archive.append("job-1", b'{"a": 1}')
+        archive.append("job-2", b'{"b": 2}')
+        (shard,) = tmp_path.glob("shard-w-*")
+        lines = gzip.decompress(shard.read_bytes()).splitlines()
+        assert [json.loads(line) for line in lines] == [{"a": 1}, {"b": 2}]
+
+    def test_writers_share_archive(self, tmp_path: Path) -> None:
+        LogArchive(tmp_path, writer_id="w1").append("job-1", b"1")
+        LogArchive(tmp_path, writer_id="w2").append("job-2", b"2")
+        reader = LogArchive(tmp_path)
+        assert reader.get("job-1") == b"1"
+        assert reader.get("job-2") == b"2"
+
+    def test_latest_write_wins_across_writers(self, tmp_path: Path) -> None:
+        LogArchive(tmp_path, writer_id="w2").append("job", b"1")
+        LogArchive(tmp_path, writer_id="w1").append("job", b"2")
+        assert LogArchive(tmp_path).get("job") == b"2"
+
+    def test_sees_later_writes(self, tmp_path: Path) -> None:
+        reader = LogArchive(tmp_path)
+        reader.job_ids()
+        LogArchive(tmp_path, writer_id="other").append("job", b"1")
+        assert reader.get("job") == b"1"
+
+    def test_corrupt_index_line_skipped(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path, writer_id="w")
+        archive.append("job", b"1")
+        with open(tmp_path / "index-w.jsonl", "a") as fout:
+            fout.write('{"job_id": "partial", "sh')
+        assert LogArchive(tmp_path).job_ids() == ["job"]
+
+    def test_zstd(self, tmp_path: Path) -> None:
+        pytest.importorskip("zstandard")
+        archive = LogArchive(tmp_path, compression="zstd")
+        archive.append("job", b"data")
+        assert LogArchive(tmp_path).get("job") == b"data"
+
+    def test_unknown_compression(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            LogArchive(tmp_path, compression="bz2")
+
+
+class TestLogsArchive:
+
+    def test_logs_round_trip(self, tmp_path: Path) -> None:
+        archive = LogArchive(tmp_path)
+        make_logs("first").export_to_archive(archive, "job-1")
+        make_logs("second").export_to_archive(archive, "job-2")
+        assert Logs.from_archive(tmp_path, "job-2") == make_logs("second")
+        assert Logs.from_archive(archive, "job-1") == make_logs("first")
+
+    def test_discussion_experiment_archive(self, tmp_path: Path) -> None:
+        experiment = DiscussionExperiment(
+            users=[DummyActor(name=f"User{i}") for i in range(3)],
+            turn_manager=RespondTurnManager(p_respond=0.5),
+            num_discussions=3,
+            num_turns=2,
+        )
+        experiment.begin(tmp_path, verbose=False, archive="gzip")
+
+        assert not list(tmp_path.glob("*.json"))
+        archive = LogArchive(tmp_path)
+        prefix = f"{experiment.experiment_id}-discussion"
+        assert archive.job_ids() == [f"{prefix}-{i:06d}" for i in range(3)]
+        assert len(Logs.from_archive(archive, f"{prefix}-000000")) == 2
+
+    def test_reruns_share_archive(self, tmp_path: Path) -> None:
+        for _ in range(2):
+            DiscussionExperiment(
+                users=[DummyActor(name=f"User{i}") for i in range(3)],
+                num_discussions=2,
+                num_turns=2,
+            ).begin(tmp_path, verbose=False, archive="gzip")
+        assert len(LogArchive(tmp_path)) == 4
+
+    def test_annotation_experiment_archive(self, tmp_path: Path) -> None:
+        experiment = AnnotationExperiment(
+            annotators=[DummyActor(name="Annotator", is_annotator=True)],
+            discussion_logs=make_logs(),
+        )
+        experiment.begin(tmp_path, verbose=False, archive="gzip")
+        logs = Logs.from_archive(
+            tmp_path, f"{experiment.experiment_id}-annotation-000000"
+        )
+        assert len(logs) == 2
+
+    def test_workers_share_archive(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path / "queue")
+        experiment = DiscussionExperiment(
+            users=[DummyActor(name=f"User{i}") for i in range(3)],
+            num_discussions=4,
+            num_turns=2,
+            seed=3,
+        )
+        experiment.submit(queue)
+        out = tmp_path / "out"
+        experiment.work(queue, out, verbose=False, archive="gzip")
+
+        archive = LogArchive(out)
+        assert archive.job_ids() == [f"discussion-{i:06d}" for i in range(4)]
+        assert queue.counts()["done"] == 4
@@ -0,0 +1,229 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the file-based JobQueue and the coordinator/worker modes
+of the experiments.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from syndisco import (
+    AnnotationExperiment,
+    DiscussionExperiment,
+    JobQueue,
+    Logs,
+    RespondTurnManager,
+)
+from .dummy import DummyActor
+
+
+def make_experiment(seed: int | None = 7) -> DiscussionExperiment:
+    return DiscussionExperiment(
+        users=[DummyActor(name=f"User{i}") for i in range(4)],
+        seed_opinions=["Seed A.", "Seed B."],
+        turn_manager=RespondTurnManager(p_respond=0.5),
+        num_discussions=6,
+        num_turns=3,
+        seed=seed,
+    )
+
+
+class TestJobQueue:
+
+    def test_submit_is_idempotent(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        assert queue.submit("a", {"x": 1})
+        assert not queue.submit("a", {"x": 2})
+        assert queue.counts()["pending"] == 1
+
+    def test_claim_returns_spec(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("a", {"x": 1})
+        assert queue.claim() == ("a", {"x": 1})
+        assert queue.get_state("a") == "claimed"
+        assert queue.claim() is None
+
+    def test_complete_is_idempotent(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("a", {})
+        queue.claim()
+        queue.complete("a", {"output": "first"})
+        queue.complete("a", {"output": "second"})
+        assert queue.get_state("a") == "done"
+        done = json.loads((tmp_path / "done" / "a.json").read_text())
+        assert done == {"output": "first"}
+
+    def test_done_job_not_resubmitted(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("a", {})
+        queue.claim()
+        queue.complete("a")
+        assert not queue.submit("a", {})
+        assert queue.claim() is None
+
+    def test_fail(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("a", {})
+        queue.claim()
+        queue.fail("a", "boom")
+        assert queue.get_state("a") == "failed"
+        assert queue.claim() is None
+
+    def test_release(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("a", {})
+        queue.claim()
+        queue.release("a")
+        assert queue.claim() == ("a", {})
+
+    def test_requeue_stale(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("old", {})
+        queue.submit("new", {})
+        queue.claim()
+        queue.claim()
+        an_hour_ago = time.time() - 3600
+        os.utime(tmp_path / "claimed" / "new.json")
+        os.utime(
+            tmp_path / "claimed" / "old.json", (an_hour_ago, an_hour_ago)
+        )
+        assert queue.requeue_stale(max_age=60) == ["old"]
+        assert queue.get_state("old") == "pending"
+        assert queue.get_state("new") == "claimed"
+
+    def test_requeued_job_completed_meanwhile_not_claimed(
+        self, tmp_path: Path
+    ) -> None:
+        queue = JobQueue(tmp_path)
+        queue.submit("slow", {})
+        queue.claim()
+        an_hour_ago = time.time() - 3600
+        os.utime(
+            tmp_path / "claimed" / "slow.json", (an_hour_ago, an_hour_ago)
+        )
+        queue.requeue_stale(max_age=60)
+        # the slow worker finishes after its job was requeued
+        queue.complete("slow")
+        assert queue.claim() is None
+        assert queue.get_state("slow") == "done"
+        assert not list((tmp_path / "claimed").glob("*.json"))
+
+    def test_each_job_claimed_once(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        for i in range(50):
+            queue.submit(f"job-{i:02d}", {"i": i})
+
+        claims: list[str] = []
+        lock = threading.Lock()
+
+        def worker():
+            while (job := JobQueue(tmp_path).claim()) is not None:
+                with lock:
+                    claims.append(job[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claims) == [f"job-{i:02d}" for i in range(50)]
+
+
+class TestDistributedDiscussionExperiment:
+
+    def test_submit_requires_seed(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            make_experiment(seed=None).submit(JobQueue(tmp_path))
+
+    def test_submit_is_idempotent(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path)
+        assert make_experiment().submit(queue) == 6
+        assert make_experiment().submit(queue) == 0
+
+    def test_workers_run_every_job(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path / "queue")
+        make_experiment().submit(queue)
+
+        num_jobs = [
+            make_experiment().work(
+                queue, tmp_path / f"out{i}", verbose=False, worker_id=str(i)
+            )
+            for i in range(2)
+        ]
+        assert sum(num_jobs) == 6
+        assert queue.counts()["done"] == 6
+        assert len(list(tmp_path.glob("out*/*.json"))) == 6
+
+    def test_worker_output_matches_local_discussion(
+        self, tmp_path: Path
+    ) -> None:
+        queue = JobQueue(tmp_path / "queue")
+        make_experiment().submit(queue)
+        make_experiment().work(queue, tmp_path / "out", verbose=False)
+
+        local = make_experiment().get_discussion(4)
+        local.begin(verbose=False)
+        remote = Logs.from_file(tmp_path / "out" / "discussion-000004.json")
+        assert [e["name"] for e in remote] == [
+            e["name"] for e in local.get_logs()
+        ]
+
+    def test_worker_with_other_seed_raises(self, tmp_path: Path) -> None:
+        queue = JobQueue(tmp_path / "queue")
+        make_experiment(seed=1).submit(queue)
+        with pytest.raises(ValueError):
+            make_experiment(seed=2).work(queue, tmp_path / "out")
+        assert queue.counts()["pending"] == 6
+
+    def test_failed_job_marked(self, tmp_path: Path, monkeypatch) -> None:
+        queue = JobQueue(tmp_path / "queue")
+        experiment = make_experiment()
+        experiment.submit(queue)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("model crashed")
+
+        monkeypatch.setattr(experiment, "_execute_discussion", fail)
+        assert experiment.work(queue, tmp_path / "out", verbose=False) == 6
+        assert queue.counts()["failed"] == 6
+
+
+class TestDistributedAnnotationExperiment:
+
+    def test_workers_run_every_job(self, tmp_path: Path) -> None:
+        logs = Logs()
+        logs.append(name="User0", text="Hello.", model="dummy")
+        experiment = AnnotationExperiment(
+            annotators=[
+                DummyActor(name=f"Ann{i}", is_annotator=True)
+                for i in range(3)
+            ],
+            discussion_logs=logs,
+        )
+        queue = JobQueue(tmp_path / "queue")
+        assert experiment.submit(queue) == 3
+        assert experiment.work(queue, tmp_path / "out", verbose=False) == 3
+        assert queue.counts()["done"] == 3
+        assert len(list((tmp_path / "out").glob("*.json"))) == 3
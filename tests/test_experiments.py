@@ -316,6 +316,132 @@ class TestDiscussionExperimentBegin:
         )
         exp.begin(discussions_output_dir=out, verbose=False)
 
+    def test_discussions_created_lazily(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        exp = DiscussionExperiment(
+            users=make_users(3),
+            num_discussions=3,
+            num_turns=2,
+            num_active_users=2,
+        )
+        events = []
+        get_discussion = exp.get_discussion
+        run_single_discussion = exp._run_single_discussion
+
+        def spy_get_discussion(index):
+            events.append(("create", index))
+            return get_discussion(index)
+
+        def spy_run_single_discussion(**kwargs):
+            events.append(("run",))
+            return run_single_discussion(**kwargs)
+
+        monkeypatch.setattr(exp, "get_discussion", spy_get_discussion)
+        monkeypatch.setattr(
+            exp, "_run_single_discussion", spy_run_single_discussion
+        )
+        exp.begin(discussions_output_dir=tmp_path, verbose=False)
+        assert events == [
+            ("create", 0),
+            ("run",),
+            ("create", 1),
+            ("run",),
+            ("create", 2),
+            ("run",),
+        ]
+
+    def test_run_discussions_yields_outputs(self, tmp_path: Path) -> None:
+        exp = DiscussionExperiment(
+            users=make_users(3),
+            num_discussions=2,
+            num_turns=2,
+            num_active_users=2,
+        )
+        outputs = list(exp.run_discussions(tmp_path, verbose=False))
+        assert len(outputs) == exp.num_discussions
+        assert all(Path(output).is_file() for output in outputs)
+
+
+class TestDiscussionExperimentSeed:
+
+    @staticmethod
+    def describe(discussion) -> tuple:
+        """The participants, seeds and speaker order of a discussion."""
+        speakers = [entry["name"] for entry in discussion]
+        return (
+            [user.get_actor_name() for user in discussion._users],
+            [entry["text"] for entry in discussion.get_logs()][:1],
+            speakers,
+        )
+
+    @staticmethod
+    def make_experiment(seed: int | None = 42) -> DiscussionExperiment:
+        return DiscussionExperiment(
+            users=make_users(6),
+            seed_opinions=["Seed A.", "Seed B.", "Seed C."],
+            turn_manager=RespondTurnManager(p_respond=0.5),
+            num_discussions=10,
+            num_turns=8,
+            num_active_users=3,
+            seed=seed,
+        )
+
+    def test_same_seed_reproduces_discussions(self) -> None:
+        first = self.make_experiment()
+        second = self.make_experiment()
+        for i in range(10):
+            assert self.describe(first.get_discussion(i)) == self.describe(
+                second.get_discussion(i)
+            )
+
+    def test_legacy_make_instance_override(self) -> None:
+        class LegacyTurnManager(RespondTurnManager):
+            def make_instance(self):
+                return super().make_instance()
+
+        for seed in (None, 42):
+            exp = DiscussionExperiment(
+                users=make_users(4),
+                turn_manager=LegacyTurnManager(p_respond=0.5),
+                num_discussions=2,
+                num_turns=4,
+                seed=seed,
+            )
+            discussion = exp.get_discussion(0)
+            assert len([entry for entry in discussion]) == 4
+
+        # the users' responses differ between runs, their order does not
+        first = self.describe(exp.get_discussion(1))
+        second = self.describe(exp.get_discussion(1))
+        assert (first[0], first[2]) == (second[0], second[2])
+
+    def test_discussion_independent_of_generation_order(self) -> None:
+        exp = self.make_experiment()
+        in_order = [self.describe(exp.get_discussion(i)) for i in range(10)]
+        assert self.describe(exp.get_discussion(7)) == in_order[7]
+
+    def test_discussions_differ_between_indices(self) -> None:
+        exp = self.make_experiment()
+        described = [self.describe(exp.get_discussion(i)) for i in range(10)]
+        assert len({repr(d) for d in described}) > 1
+
+    def test_different_seeds_differ(self) -> None:
+        first = self.make_experiment(seed=1)
+        second = self.make_experiment(seed=2)
+        assert [
+            self.describe(first.get_discussion(i)) for i in range(10)
+        ] != [self.describe(second.get_discussion(i)) for i in range(10)]
+
+    def test_random_seed_is_recorded(self) -> None:
+        exp = self.make_experiment(seed=None)
+        assert isinstance(exp.seed, int)
+
+    def test_out_of_range_index_raises(self) -> None:
+        exp = self.make_experiment()
+        with pytest.raises(IndexError):
+            exp.get_discussion(10)
+
 
 class TestAnnotationExperimentConstruction:
 
@@ -25,12 +25,14 @@ tests, which use pytest's tmp_path fixture.
 
 import collections.abc
 import json
+import textwrap
 import pytest
 from pathlib import Path
 from datetime import datetime
 
 from .dummy import DummyActor
-from syndisco import Discussion, Logs, RespondTurnManager, Annotation
+from syndisco import Actor, Discussion, Logs, RespondTurnManager, Annotation
+from syndisco.jobs import _fill, _format_chat_message
 
 
 def make_logs(entries: list[tuple[str, str, str]] | None = None):
@@ -136,6 +138,20 @@ class TestLogsConstruction:
         logs.append(name="Alice", text="Hi", model="gpt")
         assert {"name", "text", "model"}.issubset(logs[0].keys())
 
+    def test_copy_on_write_shares_entries(self) -> None:
+        logs = make_logs([("A", "t", "m")])
+        copied = logs._copy_on_write()
+        assert copied == logs
+        assert copied._entries is logs._entries
+
+    def test_copy_on_write_copies_on_append(self) -> None:
+        logs = make_logs([("A", "t", "m")])
+        copied = logs._copy_on_write()
+        copied.append(name="B", text="u")
+        logs.append(name="C", text="v")
+        assert [e["name"] for e in logs] == ["A", "C"]
+        assert [e["name"] for e in copied] == ["A", "B"]
+
 
 class TestLogsAccess:
 
@@ -319,6 +335,18 @@ class TestDiscussionConstruction:
         )
         assert d is not None
 
+    def test_seed_entries_are_hardcoded(self) -> None:
+        d = make_discussion(
+            conv_len=0,
+            seed_opinions=["Seed one."],
+            seed_opinion_usernames=["User0"],
+        )
+        entry = d.get_logs()[0]
+        assert entry["name"] == "User0"
+        assert entry["text"] == "Seed one."
+        assert entry["model"] == "hardcoded"
+        assert entry["prompt"] == Actor(name="User0").get_system_prompt()
+
     def test_mismatched_seed_counts_raise(self) -> None:
         actors = [DummyActor("A"), DummyActor("B")]
         tm = RespondTurnManager(actors, p_respond=0)
@@ -590,6 +618,102 @@ class TestDiscussionGetLogs:
         assert logs1 is not logs2
 
 
+class TestDiscussionFork:
+
+    def test_fork_shares_generated_logs(self) -> None:
+        d = make_discussion(conv_len=4)
+        next(d)
+        next(d)
+        forked = d.fork()
+        assert forked.get_logs() == d.get_logs()
+        assert forked._logs._entries is d._logs._entries
+
+    def test_fork_does_not_prompt_actors(self) -> None:
+        d = make_discussion(conv_len=4)
+        next(d)
+        calls = [user._model.call_count for user in d._users]
+        d.fork()
+        assert [user._model.call_count for user in d._users] == calls
+
+    def test_appending_copies_shared_logs(self) -> None:
+        d = make_discussion(conv_len=4)
+        next(d)
+        forked = d.fork()
+        next(forked)
+        assert len(forked.get_logs()) == 2
+        assert len(d.get_logs()) == 1
+
+    def test_fork_continues_from_same_turn(self) -> None:
+        d = make_discussion(conv_len=4)
+        next(d)
+        forked = d.fork()
+        assert len(list(forked)) == 3
+        assert len(list(d)) == 3
+
+    def test_fork_selects_same_speakers(self) -> None:
+        d = make_discussion(conv_len=6, num_actors=4)
+        next(d)
+        forked = d.fork()
+        names = [entry["name"] for entry in d]
+        assert [entry["name"] for entry in forked] == names
+
+    def test_fork_copies_context_history(self) -> None:
+        d = make_discussion(conv_len=4)
+        next(d)
+        forked = d.fork()
+        next(forked)
+        assert len(d._ctx_history) == 1
+        assert len(forked._ctx_history) == 2
+
+
+class TestDiscussionBranch:
+
+    def test_returns_one_discussion_per_branch(self) -> None:
+        d = make_discussion(conv_len=3)
+        branches = d.branch(3)
+        assert len(branches) == 3
+        assert all(isinstance(b, Discussion) for b in branches)
+
+    def test_branches_differ_only_in_last_turn(self) -> None:
+        d = make_discussion(
+            conv_len=3,
+            seed_opinions=["Seed."],
+            seed_opinion_usernames=["User0"],
+        )
+        next(d)
+        branches = d.branch(2)
+        logs = [b.get_logs() for b in branches]
+        assert logs[0].to_list()[:-1] == logs[1].to_list()[:-1]
+        assert logs[0][-1]["name"] == logs[1][-1]["name"]
+        assert logs[0][-1]["text"] != logs[1][-1]["text"]
+
+    def test_original_discussion_unchanged(self) -> None:
+        d = make_discussion(conv_len=3)
+        next(d)
+        logs_before = d.get_logs()
+        d.branch(2)
+        assert d.get_logs() == logs_before
+        assert len(list(d)) == 2
+
+    def test_branch_counts_as_turn(self) -> None:
+        d = make_discussion(conv_len=3)
+        branch = d.branch(2)[0]
+        assert len(list(branch)) == 2
+
+    def test_branches_continue_independently(self) -> None:
+        d = make_discussion(conv_len=3)
+        first, second = d.branch(2)
+        list(first)
+        assert len(first.get_logs()) == 3
+        assert len(second.get_logs()) == 1
+
+    def test_finished_discussion_raises(self) -> None:
+        d = make_discussion(conv_len=2)
+        list(d)
+        with pytest.raises(ValueError):
+            d.branch(2)
+
+
 class TestAnnotationConstruction:
 
     def test_constructs_with_logs(self) -> None:
@@ -745,3 +869,27 @@ class TestAnnotationGetLogs:
 
         entry = ann.get_logs()[0]
         assert "ANNOTATOR_PROMPT" in entry["prompt"]
+
+
+class TestFormatChatMessage:
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "A short comment.",
+            "  Leading spaces and trailing ones   ",
+            "Tabs\tand\nnewlines\r\nin it\n",
+            "Unicode whitespace at the end \u3000",
+        ],
+    )
+    @pytest.mark.parametrize("width", [5, 20, 900000])
+    def test_fill_matches_textwrap(self, text: str, width: int) -> None:
+        assert _fill(text, width) == textwrap.fill(text, width)
+
+    def test_whitespace_message_is_empty(self) -> None:
+        assert _format_chat_message("User0", " \n ", 900000) == ""
+
+    def test_formatted_message_is_reused(self) -> None:
+        first = _format_chat_message("User0", "A reused comment.", 900000)
+        second = _format_chat_message("User0", "A reused comment.", 900000)
+        assert first is second
@@ -0,0 +1,217 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the logging configuration.
+"""
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from syndisco import Discussion, QueueTurnManager, log_context, logging_setup
+from syndisco.logging import (
+    _ContextFilter,
+    _DroppingQueueHandler,
+    _JsonFormatter,
+    _start_queue_listener,
+)
+from .dummy import DummyActor
+
+
+def make_record(level: int, msg: str = "message") -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+
+@pytest.fixture
+def queue_logger():
+    """A logger writing to a list through a queue listener."""
+    records: list[str] = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(self.format(record))
+
+    queue_handler = _start_queue_listener([ListHandler()], queue_size=100)
+    test_logger = logging.getLogger("syndisco-queue-test")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.addHandler(queue_handler)
+    yield test_logger, queue_handler.listener, records
+    test_logger.removeHandler(queue_handler)
+    queue_handler.listener.stop()  # type: ignore
+
+
+@pytest.fixture
+def json_logger():
+    """A logger writing JSON events, with context fields, to a list."""
+    records: list[dict] = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(json.loads(self.format(record)))
+
+    handler = ListHandler()
+    handler.setFormatter(_JsonFormatter())
+    handler.addFilter(_ContextFilter())
+    # the logger of the syndisco.jobs module
+    test_logger = logging.getLogger("jobs.py")
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.addHandler(handler)
+    yield test_logger, records
+    test_logger.removeHandler(handler)
+    test_logger.setLevel(logging.NOTSET)
+
+
+class TestQueueLogging:
+
+    def test_logging_setup_writes_through_queue(self, tmp_path: Path) -> None:
+        script = (
+            "import logging\n"
+            "from syndisco import logging_setup\n"
+            "logging_setup(print_to_terminal=False, write_to_file=True, "
+            f"logs_dir={str(tmp_path)!r}, use_queue=True)\n"
+            "root = logging.getLogger()\n"
+            "assert len(root.handlers) == 1, root.handlers\n"
+            "assert isinstance(root.handlers[0], "
+            "logging.handlers.QueueHandler)\n"
+            "logging.getLogger('test').debug('Turn %d of %s', 3, 'disc')\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        # the queue is flushed at exit
+        text = (tmp_path / "log").read_text()
+        assert "DEBUG" in text
+        assert "Turn 3 of disc" in text
+
+    def test_records_reach_handlers(self, queue_logger) -> None:
+        test_logger, listener, records = queue_logger
+        test_logger.debug("Turn %d", 1)
+        test_logger.warning("Slow response")
+        listener.stop()
+        assert records == ["Turn 1", "Slow response"]
+
+    def test_listener_stop_is_idempotent(self, queue_logger) -> None:
+        _, listener, _ = queue_logger
+        listener.stop()
+        listener.stop()
+
+
+class TestDroppingQueueHandler:
+
+    def test_drops_debug_records_when_full(self) -> None:
+        handler = _DroppingQueueHandler(queue.Queue(maxsize=2))
+        for _ in range(5):
+            handler.handle(make_record(logging.DEBUG))
+        assert handler.queue.qsize() == 2
+        assert handler.num_dropped == 3
+
+    def test_warnings_wait_for_space(self) -> None:
+        log_queue: queue.Queue = queue.Queue(maxsize=1)
+        handler = _DroppingQueueHandler(log_queue)
+        handler.handle(make_record(logging.DEBUG))
+
+        thread = threading.Thread(
+            target=handler.handle, args=(make_record(logging.WARNING),)
+        )
+        thread.start()
+        thread.join(timeout=0.1)
+        assert thread.is_alive()
+
+        log_queue.get()
+        thread.join(timeout=5)
+        assert log_queue.get().levelno == logging.WARNING
+        assert handler.num_dropped == 0
+
+    def test_records_not_formatted_when_enqueued(self) -> None:
+        handler = _DroppingQueueHandler(queue.Queue())
+        record = logging.LogRecord(
+            "test", logging.INFO, __file__, 0, "%s", ("arg",), None
+        )
+        handler.handle(record)
+        enqueued = handler.queue.get()
+        assert enqueued.msg == "%s"
+        assert enqueued.args == ("arg",)
+
+
+class TestJsonLogging:
+
+    def test_rejects_unknown_format(self) -> None:
+        with pytest.raises(ValueError):
+            logging_setup(
+                print_to_terminal=False, write_to_file=False, log_format="xml"
+            )
+
+    def test_event_fields(self, json_logger) -> None:
+        test_logger, records = json_logger
+        test_logger.info("Took %.1fs", 1.5, extra={"duration_s": 1.5})
+        (event,) = records
+        assert event["level"] == "INFO"
+        assert event["logger"] == "jobs.py"
+        assert event["message"] == "Took 1.5s"
+        assert event["duration_s"] == 1.5
+        assert "timestamp" in event
+
+    def test_exception_included(self, json_logger) -> None:
+        test_logger, records = json_logger
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            test_logger.exception("Failed")
+        assert "RuntimeError: boom" in records[0]["exception"]
+
+    def test_context_nests_and_resets(self, json_logger) -> None:
+        test_logger, records = json_logger
+        with log_context(experiment_id="exp", job_id="job-1"):
+            with log_context(job_id="job-2", turn=3):
+                test_logger.info("inner")
+            test_logger.info("outer")
+        test_logger.info("none")
+
+        assert records[0]["experiment_id"] == "exp"
+        assert records[0]["job_id"] == "job-2"
+        assert records[0]["turn"] == 3
+        assert records[1]["job_id"] == "job-1"
+        assert "turn" not in records[1]
+        assert "job_id" not in records[2]
+
+    def test_discussion_turns_carry_context(self, json_logger) -> None:
+        _, records = json_logger
+        users = [DummyActor("Alice"), DummyActor("Bob")]
+        discussion = Discussion(
+            next_turn_manager=QueueTurnManager(actors=users),
+            users=users,
+            conv_len=2,
+        )
+        with log_context(experiment_id="exp", job_id="discussion-1"):
+            discussion.begin(verbose=False)
+
+        turns = [event for event in records if "duration_s" in event]
+        assert [event["turn"] for event in turns] == [0, 1]
+        assert [event["actor"] for event in turns] == ["Alice", "Bob"]
+        assert all(event["model"] == "dummy" for event in turns)
+        assert all(event["job_id"] == "discussion-1" for event in turns)
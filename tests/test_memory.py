@@ -0,0 +1,199 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the summarizing discussion memory.
+"""
+
+import json
+
+import pytest
+
+from syndisco import (
+    Actor,
+    Discussion,
+    DiscussionExperiment,
+    QueueTurnManager,
+    SummaryMemory,
+)
+from .dummy import DummyModel
+
+
+class RecordingModel(DummyModel):
+    """DummyModel which also records the user prompts it receives."""
+
+    def __init__(self, responses: list[str]) -> None:
+        super().__init__(responses)
+        self.user_prompts: list[str] = []
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        self.user_prompts.append(json.loads(user_prompt)["content"])
+        return super()._generate_response(system_prompt, user_prompt)
+
+
+def make_discussion(
+    memory: SummaryMemory | None,
+    user_model: DummyModel,
+    conv_len: int = 6,
+    history_context_len: int = 2,
+) -> Discussion:
+    users = [
+        Actor(model=user_model, name="Alice"),
+        Actor(model=user_model, name="Bob"),
+    ]
+    return Discussion(
+        next_turn_manager=QueueTurnManager(users),
+        users=users,
+        conv_len=conv_len,
+        history_context_len=history_context_len,
+        memory=memory,
+    )
+
+
+class TestSummaryMemory:
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            SummaryMemory(DummyModel(["s"]), update_every=0)
+        with pytest.raises(ValueError):
+            SummaryMemory(DummyModel(["s"]), max_summary_words=0)
+
+    def test_summarizes_every_few_comments(self) -> None:
+        summarizer = RecordingModel(["First summary.", "Second summary."])
+        memory = SummaryMemory(summarizer, update_every=2)
+
+        memory.add("c1")
+        assert summarizer.call_count == 0
+        assert memory.get_context(["c2"]) == ["c1", "c2"]
+
+        memory.add("c2")
+        assert summarizer.call_count == 1
+        assert "c1\nc2" in summarizer.user_prompts[0]
+        assert memory.get_summary() == "First summary."
+        assert memory.get_context(["c3"]) == [
+            "Summary of earlier comments: First summary.",
+            "c3",
+        ]
+
+        memory.add("c3")
+        memory.add("c4")
+        # the previous summary is updated, not replaced
+        assert "First summary." in summarizer.user_prompts[1]
+        assert memory.get_summary() == "Second summary."
+
+    def test_ignores_empty_comments(self) -> None:
+        summarizer = DummyModel(["Summary."])
+        memory = SummaryMemory(summarizer, update_every=1)
+        memory.add("")
+        assert summarizer.call_count == 0
+
+    def test_keeps_comments_on_empty_summary(self) -> None:
+        memory = SummaryMemory(DummyModel(["  "]), update_every=1)
+        memory.add("c1")
+        assert memory.get_summary() == ""
+        assert memory.get_context([]) == ["c1"]
+
+    def test_empty_summaries_keep_prompt_bounded(self) -> None:
+        summarizer = RecordingModel(["  "])
+        memory = SummaryMemory(summarizer, update_every=2)
+        for i in range(10):
+            memory.add(f"c{i}")
+        # retried every 2 comments, on the last 4 comments at most
+        assert summarizer.call_count == 5
+        assert "Next comments: c6\nc7\nc8\nc9\n" in summarizer.user_prompts[-1]
+        assert memory.get_context([]) == ["c8", "c9"]
+
+    def test_make_instance_is_empty(self) -> None:
+        memory = SummaryMemory(DummyModel(["Summary."]), update_every=1)
+        memory.add("c1")
+        instance = memory.make_instance()
+        assert instance.get_summary() == ""
+        assert instance.update_every == 1
+
+    def test_fork_is_independent(self) -> None:
+        memory = SummaryMemory(DummyModel(["S1.", "S2."]), update_every=2)
+        memory.add("c1")
+        forked = memory.fork()
+        forked.add("c2")
+        assert forked.get_summary() == "S1."
+        assert memory.get_summary() == ""
+        assert memory.get_context([]) == ["c1"]
+
+
+class TestDiscussionMemory:
+
+    def test_prompt_size_is_bounded(self) -> None:
+        user_model = RecordingModel(["A comment."])
+        memory = SummaryMemory(DummyModel(["Summary."]), update_every=2)
+        discussion = make_discussion(memory, user_model, conv_len=20)
+        discussion.begin(verbose=False)
+
+        # at most the summary, one unsummarized comment and the window
+        last_prompt = user_model.user_prompts[-1]
+        assert last_prompt.count("Comment by user") <= 3
+        assert "Summary of earlier comments: Summary." in last_prompt
+
+    def test_no_memory_forgets(self) -> None:
+        user_model = RecordingModel(["A comment."])
+        discussion = make_discussion(None, user_model)
+        discussion.begin(verbose=False)
+        assert "Summary" not in user_model.user_prompts[-1]
+        assert user_model.user_prompts[-1].count("Comment by user") == 2
+
+    def test_no_window_summarizes_every_comment(self) -> None:
+        user_model = RecordingModel(["A comment."])
+        summarizer = DummyModel(["Summary."])
+        memory = SummaryMemory(summarizer, update_every=1)
+        discussion = make_discussion(
+            memory, user_model, conv_len=3, history_context_len=0
+        )
+        discussion.begin(verbose=False)
+        assert summarizer.call_count == 3
+
+    def test_fork_copies_memory(self) -> None:
+        user_model = RecordingModel(["A comment."])
+        memory = SummaryMemory(DummyModel(["Summary."]), update_every=1)
+        discussion = make_discussion(memory, user_model)
+        for _ in range(3):
+            next(discussion)
+
+        forked = discussion.fork()
+        assert forked._memory is not discussion._memory
+        assert forked._memory.get_summary() == "Summary."
+
+    def test_experiment_gives_each_discussion_a_memory(self) -> None:
+        user_model = DummyModel(["A comment."])
+        memory = SummaryMemory(DummyModel(["Summary."]), update_every=1)
+        experiment = DiscussionExperiment(
+            users=[
+                Actor(model=user_model, name=f"User{i}") for i in range(3)
+            ],
+            num_discussions=2,
+            history_ctx_len=1,
+            memory=memory,
+            seed=0,
+        )
+        first = experiment.get_discussion(0)
+        second = experiment.get_discussion(1)
+        assert first._memory is not None
+        assert first._memory is not second._memory
+        assert first._memory is not memory
+
+        first.begin(verbose=False)
+        assert first._memory.get_summary() == "Summary."
+        assert second._memory.get_summary() == ""
+        assert memory.get_summary() == ""
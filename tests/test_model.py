@@ -0,0 +1,764 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the model wrappers.
+
+BaseModel behaviour is tested through DummyModel. TransformersModel is
+tested against a tiny, randomly initialized GPT-2 checkpoint written to a
+temporary directory, and OpenAIModel against a fake completions client, so
+no network access or real LLM is required.
+"""
+
+import ctypes
+import multiprocessing
+import time
+import types
+from pathlib import Path
+
+import openai
+import pytest
+import tokenizers
+import torch
+import transformers
+
+from syndisco import BaseModel, OpenAIModel, TransformersModel
+from syndisco._throttling import RateLimiter
+
+
+CHAT_TEMPLATE = (
+    "{% for m in messages %}{{ m['role'] }}: {{ m['content'] }}\n"
+    "{% endfor %}{% if add_generation_prompt %}assistant:{% endif %}"
+)
+
+
+class EchoModel(BaseModel):
+    """Returns the same canned response on every call."""
+
+    def __init__(self, response: str, **kwargs) -> None:
+        super().__init__("echo", 5, **kwargs)
+        self._response = response
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        return self._response
+
+
+def make_tiny_checkpoint(path: Path) -> Path:
+    """Write a character-level tokenizer and a tiny GPT-2 model to *path*."""
+    characters = [chr(c) for c in range(32, 127)] + ["\n"]
+    vocab = {
+        token: i for i, token in enumerate(["<unk>", "<eos>"] + characters)
+    }
+    tokenizer = tokenizers.Tokenizer(
+        tokenizers.models.WordLevel(vocab, unk_token="<unk>")
+    )
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Split(
+        "", "isolated"
+    )
+    tokenizer.decoder = tokenizers.decoders.Fuse()
+    fast_tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, eos_token="<eos>", unk_token="<unk>"
+    )
+    fast_tokenizer.chat_template = CHAT_TEMPLATE
+
+    config = transformers.GPT2Config(
+        vocab_size=len(vocab),
+        n_positions=512,
+        n_embd=16,
+        n_layer=1,
+        n_head=2,
+        bos_token_id=1,
+        eos_token_id=1,
+    )
+    torch.manual_seed(0)
+    model = transformers.GPT2LMHeadModel(config)
+
+    model.save_pretrained(path)
+    fast_tokenizer.save_pretrained(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def tiny_checkpoint(tmp_path_factory) -> Path:
+    return make_tiny_checkpoint(tmp_path_factory.mktemp("tiny-gpt2"))
+
+
+class TestBaseModelStopSequences:
+
+    def test_no_stop_sequences_returns_full_response(self) -> None:
+        model = EchoModel("Hello there. User: hi")
+        assert model.prompt("sys", "usr") == "Hello there. User: hi"
+
+    def test_truncates_at_stop_sequence(self) -> None:
+        model = EchoModel("Hello there. User: hi", stop_sequences=["User:"])
+        assert model.prompt("sys", "usr") == "Hello there."
+
+    def test_truncates_at_earliest_stop_sequence(self) -> None:
+        model = EchoModel(
+            "Hello. Bob: hey Alice: hi", stop_sequences=["Alice:", "Bob:"]
+        )
+        assert model.prompt("sys", "usr") == "Hello."
+
+    def test_stop_sequences_applied_before_removal(self) -> None:
+        model = EchoModel(
+            "<s>Hello</s> User: hi",
+            stop_list=["<s>", "</s>"],
+            stop_sequences=["User:"],
+        )
+        assert model.prompt("sys", "usr") == "Hello"
+
+    def test_stop_sequences_default_empty(self) -> None:
+        assert EchoModel("Hello").stop_sequences == []
+
+
+class TestTransformersModelStopSequences:
+
+    def test_generates_without_stop_sequences(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 20)
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_stop_sequence_ends_generation(self, tiny_checkpoint) -> None:
+        full = TransformersModel(tiny_checkpoint, "tiny", 20).prompt(
+            "sys", "hello"
+        )
+        stop = full[len(full) // 2:][:2]
+        expected = full[: full.find(stop)].rstrip()
+
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 20, stop_sequences=[stop]
+        )
+        assert model.prompt("sys", "hello") == expected
+
+    def test_stop_sequence_saves_generated_tokens(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        full = TransformersModel(tiny_checkpoint, "tiny", 20).prompt(
+            "sys", "hello"
+        )
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 20, stop_sequences=[full[:2]]
+        )
+
+        generated_lengths = []
+        original_generate = model.model.generate
+
+        def spy_generate(*args, **kwargs):
+            output = original_generate(*args, **kwargs)
+            generated_lengths.append(
+                output.shape[1] - kwargs["input_ids"].shape[1]
+            )
+            return output
+
+        monkeypatch.setattr(model.model, "generate", spy_generate)
+        model.prompt("sys", "hello")
+        assert generated_lengths[0] < 20
+
+
+def chat_completion(*contents: str, total_tokens: int = 10):
+    """A minimal stand-in for an OpenAI chat completion response."""
+    return types.SimpleNamespace(
+        choices=[
+            types.SimpleNamespace(
+                message=types.SimpleNamespace(content=content)
+            )
+            for content in contents
+        ],
+        usage=types.SimpleNamespace(total_tokens=total_tokens),
+    )
+
+
+def api_status_error(status_code: int) -> openai.APIStatusError:
+    response = types.SimpleNamespace(
+        status_code=status_code, headers={}, request=None
+    )
+    return openai.APIStatusError(
+        "error", response=response, body=None  # type: ignore
+    )
+
+
+class FakeCompletions:
+    """Raises the given errors in order, then returns a completion."""
+
+    def __init__(
+        self,
+        errors: list[Exception] | None = None,
+        contents: tuple[str, ...] = ("Hello.",),
+    ) -> None:
+        self.errors = list(errors or [])
+        self.contents = contents
+        self.calls: list[dict] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.errors:
+            raise self.errors.pop(0)
+        return chat_completion(*self.contents)
+
+
+def make_openai_model(completions: FakeCompletions, **kwargs) -> OpenAIModel:
+    kwargs.setdefault("base_url", "http://localhost:1234/v1")
+    model = OpenAIModel(
+        model_name="gpt",
+        api_key="key",
+        name="gpt",
+        max_out_tokens=10,
+        **kwargs,
+    )
+    model.client = types.SimpleNamespace(  # type: ignore
+        chat=types.SimpleNamespace(completions=completions)
+    )
+    return model
+
+
+class TestOpenAIModel:
+
+    def test_instances_share_client_per_endpoint(self) -> None:
+        a = OpenAIModel("gpt", "key", "http://localhost:1/v1", "a", 10)
+        b = OpenAIModel("gpt", "key", "http://localhost:1/v1", "b", 10)
+        c = OpenAIModel("gpt", "key", "http://localhost:2/v1", "c", 10)
+        assert a.client is b.client
+        assert a.client is not c.client
+
+    def test_instances_share_rate_limiter_per_budget(self) -> None:
+        a = OpenAIModel(
+            "gpt", "k", "http://localhost:1/v1", "a", 10,
+            requests_per_minute=60,
+        )
+        b = OpenAIModel(
+            "gpt", "k", "http://localhost:1/v1", "b", 10,
+            requests_per_minute=60,
+        )
+        assert a._rate_limiter is b._rate_limiter
+
+    def test_stop_sequences_sent_to_api(self) -> None:
+        completions = FakeCompletions()
+        model = make_openai_model(completions, stop_sequences=["User:"])
+        model.prompt("sys", "usr")
+        assert completions.calls[0]["stop"] == ["User:"]
+
+    def test_stop_omitted_without_stop_sequences(self) -> None:
+        completions = FakeCompletions()
+        make_openai_model(completions).prompt("sys", "usr")
+        assert "stop" not in completions.calls[0]
+
+    def test_too_many_stop_sequences_raise(self) -> None:
+        with pytest.raises(ValueError):
+            make_openai_model(
+                FakeCompletions(), stop_sequences=["a", "b", "c", "d", "e"]
+            )
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503])
+    def test_retries_transient_errors(self, status_code, monkeypatch) -> None:
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        completions = FakeCompletions([api_status_error(status_code)] * 2)
+        model = make_openai_model(completions)
+        assert model.prompt("sys", "usr") == "Hello."
+        assert len(completions.calls) == 3
+
+    def test_does_not_retry_client_errors(self, monkeypatch) -> None:
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        completions = FakeCompletions([api_status_error(400)])
+        model = make_openai_model(completions)
+        with pytest.raises(openai.APIStatusError):
+            model.prompt("sys", "usr")
+        assert len(completions.calls) == 1
+
+    def test_gives_up_after_max_retries(self, monkeypatch) -> None:
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        completions = FakeCompletions([api_status_error(429)] * 5)
+        model = make_openai_model(completions, max_retries=1)
+        with pytest.raises(openai.APIStatusError):
+            model.prompt("sys", "usr")
+        assert len(completions.calls) == 2
+
+    def test_failed_attempts_refund_reserved_tokens(
+        self, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        completions = FakeCompletions([api_status_error(429)] * 2)
+        model = make_openai_model(completions)
+        model._rate_limiter = RateLimiter(
+            tokens_per_minute=1000, clock=lambda: 0.0
+        )
+        model.prompt("sys", "usr")
+        bucket = model._rate_limiter._token_bucket
+        # only the tokens reported by the successful attempt are used
+        assert bucket._tokens == 1000 - 10
+
+    def test_metrics_empty_without_concurrency_limit(self) -> None:
+        model = make_openai_model(FakeCompletions())
+        assert model.get_metrics() == {}
+
+    def test_concurrency_limit_shrinks_on_rate_limit(
+        self, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        completions = FakeCompletions([api_status_error(429)])
+        model = make_openai_model(
+            completions, base_url="http://localhost:3/v1", max_concurrency=8
+        )
+        model._concurrency_limiter._limit = 8.0  # type: ignore
+        model.prompt("sys", "usr")
+        metrics = model.get_metrics()
+        assert metrics["concurrency_limit"] < 8
+        assert metrics["in_flight"] == 0
+
+
+class TestTransformersModelAssistedGeneration:
+
+    def test_draft_model_path_is_loaded(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint,
+            "tiny",
+            20,
+            generation_kwargs={"assistant_model": str(tiny_checkpoint)},
+        )
+        assert isinstance(
+            model.generation_kwargs["assistant_model"],
+            transformers.PreTrainedModel,
+        )
+
+    def test_draft_model_shared_between_instances(
+        self, tiny_checkpoint
+    ) -> None:
+        kwargs = {"assistant_model": tiny_checkpoint}
+        a = TransformersModel(
+            tiny_checkpoint, "a", 20, generation_kwargs=dict(kwargs)
+        )
+        b = TransformersModel(
+            tiny_checkpoint, "b", 20, generation_kwargs=dict(kwargs)
+        )
+        assert (
+            a.generation_kwargs["assistant_model"]
+            is b.generation_kwargs["assistant_model"]
+        )
+
+    def test_draft_model_matches_main_model_dtype(
+        self, tiny_checkpoint
+    ) -> None:
+        kwargs = {"assistant_model": tiny_checkpoint}
+        full = TransformersModel(
+            tiny_checkpoint, "full", 20, generation_kwargs=dict(kwargs)
+        )
+        half = TransformersModel(
+            tiny_checkpoint,
+            "half",
+            20,
+            model_kwargs={"dtype": torch.bfloat16},
+            generation_kwargs=dict(kwargs),
+        )
+        assert full.generation_kwargs["assistant_model"].dtype == (
+            torch.float32
+        )
+        assert half.generation_kwargs["assistant_model"].dtype == (
+            torch.bfloat16
+        )
+
+    def test_assisted_greedy_output_matches_plain(
+        self, tiny_checkpoint
+    ) -> None:
+        plain = TransformersModel(tiny_checkpoint, "plain", 20)
+        assisted = TransformersModel(
+            tiny_checkpoint,
+            "assisted",
+            20,
+            generation_kwargs={"assistant_model": tiny_checkpoint},
+        )
+        assert assisted.prompt("sys", "hello") == plain.prompt(
+            "sys", "hello"
+        )
+
+
+class TestTransformersModelProfiles:
+
+    def test_unknown_profile_raises(self, tiny_checkpoint) -> None:
+        with pytest.raises(ValueError):
+            TransformersModel(tiny_checkpoint, "tiny", 20, profile="fastest")
+
+    def test_bf16_profile_sets_dtype(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5, profile="bf16")
+        assert model.model.dtype == torch.bfloat16
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_explicit_kwargs_override_profile(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint,
+            "tiny",
+            5,
+            model_kwargs={"dtype": torch.float32},
+            profile="bf16",
+        )
+        assert model.model.dtype == torch.float32
+
+    def test_cpu_int8_profile_quantizes_linear_layers(
+        self, tiny_checkpoint
+    ) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 5, profile="cpu-int8"
+        )
+        assert not any(
+            type(module) is torch.nn.Linear
+            for module in model.model.modules()
+        )
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_compiled_profile_compiles_and_warms_up(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        compiled = []
+
+        def fake_compile(func):
+            compiled.append(func)
+            return func
+
+        monkeypatch.setattr(torch, "compile", fake_compile)
+        generate_calls = []
+        original_generate = transformers.GPT2LMHeadModel.generate
+
+        def spy_generate(self, *args, **kwargs):
+            generate_calls.append(kwargs)
+            return original_generate(self, *args, **kwargs)
+
+        monkeypatch.setattr(
+            transformers.GPT2LMHeadModel, "generate", spy_generate
+        )
+
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 5, profile="compiled"
+        )
+        assert len(compiled) == 1
+        assert len(generate_calls) == 2
+        assert all(
+            call["cache_implementation"] == "static"
+            and call["max_new_tokens"] == 5
+            for call in generate_calls
+        )
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_compiled_profile_first_turn_does_not_recompile(
+        self, tiny_checkpoint
+    ) -> None:
+        torch._dynamo.reset()
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 5, profile="compiled"
+        )
+        graphs = torch._dynamo.utils.counters["stats"]["unique_graphs"]
+        model.prompt("A system prompt.", "hello")
+        model.prompt("sys", "a much longer user prompt " * 5)
+        assert (
+            torch._dynamo.utils.counters["stats"]["unique_graphs"] == graphs
+        )
+
+    def test_no_warmup_without_profile(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        warmups = []
+        monkeypatch.setattr(
+            TransformersModel, "_warmup", lambda self: warmups.append(1)
+        )
+        TransformersModel(tiny_checkpoint, "tiny", 5)
+        assert warmups == []
+
+
+class TestPromptBatch:
+
+    def test_empty_batch(self) -> None:
+        assert EchoModel("Hello").prompt_batch([]) == []
+
+    def test_postprocessing_applied_to_each_response(self) -> None:
+        model = EchoModel("Hi User: there", stop_sequences=["User:"])
+        assert model.prompt_batch([("s", "a"), ("s", "b")]) == ["Hi", "Hi"]
+
+    def test_transformers_batch_matches_single_prompts(
+        self, tiny_checkpoint
+    ) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 10)
+        prompts = [("sys", "hi"), ("system prompt", "a longer message")]
+        expected = [model.prompt(*prompt) for prompt in prompts]
+        assert model.prompt_batch(prompts) == expected
+
+
+class TestTransformersModelLoading:
+
+    def test_load_metrics_recorded(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5)
+        for phase in ["config", "weights", "tokenizer", "total"]:
+            assert model.load_metrics[phase] >= 0
+        assert "warmup" not in model.load_metrics
+
+    def test_config_loaded_once(self, tiny_checkpoint, monkeypatch) -> None:
+        loaded = []
+        original_from_pretrained = transformers.AutoConfig.from_pretrained
+
+        def spy_from_pretrained(*args, **kwargs):
+            loaded.append(args)
+            return original_from_pretrained(*args, **kwargs)
+
+        monkeypatch.setattr(
+            transformers.AutoConfig, "from_pretrained", spy_from_pretrained
+        )
+        TransformersModel(tiny_checkpoint, "tiny", 5)
+        TransformersModel(tiny_checkpoint, "tiny", 5, mmap_weights=True)
+        assert len(loaded) == 2
+
+    def test_config_overrides_applied(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint,
+            "tiny",
+            5,
+            model_kwargs={"resid_pdrop": 0.25, "dtype": torch.bfloat16},
+        )
+        assert model.model.config.resid_pdrop == 0.25
+        assert model.model.dtype == torch.bfloat16
+
+    def test_warmup_recorded_when_enabled(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5, warmup=True)
+        assert model.load_metrics["warmup"] >= 0
+
+    def test_ready_resolved_after_foreground_load(
+        self, tiny_checkpoint
+    ) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5)
+        assert model.ready.done()
+
+    def test_background_load(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 5, load_in_background=True
+        )
+        model.wait_until_ready(timeout=60)
+        assert model.ready.done()
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_prompt_waits_for_background_load(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 5, load_in_background=True
+        )
+        assert isinstance(model.prompt("sys", "hello"), str)
+
+    def test_background_load_errors_surface(self, tmp_path) -> None:
+        model = TransformersModel(
+            tmp_path / "missing", "tiny", 5, load_in_background=True
+        )
+        with pytest.raises(OSError):
+            model.wait_until_ready(timeout=60)
+        with pytest.raises(OSError):
+            model.prompt("sys", "hello")
+
+    def test_foreground_load_errors_raise(self, tmp_path) -> None:
+        with pytest.raises(OSError):
+            TransformersModel(tmp_path / "missing", "tiny", 5)
+
+
+class TestTransformersModelMmapWeights:
+
+    def test_output_matches_regular_loading(self, tiny_checkpoint) -> None:
+        regular = TransformersModel(tiny_checkpoint, "tiny", 10)
+        mapped = TransformersModel(
+            tiny_checkpoint, "tiny", 10, mmap_weights=True
+        )
+        assert mapped.prompt("sys", "hello") == regular.prompt(
+            "sys", "hello"
+        )
+
+    def test_weights_are_backed_by_file_mapping(
+        self, tiny_checkpoint
+    ) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 10, mmap_weights=True
+        )
+        (weight_mmap,) = model._weight_mmaps
+        start = ctypes.addressof(ctypes.c_char.from_buffer(weight_mmap))
+        end = start + len(weight_mmap)
+
+        for name, param in model.model.named_parameters():
+            assert start <= param.data_ptr() < end, name
+
+    def test_tied_weights_shared(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 10, mmap_weights=True
+        )
+        assert (
+            model.model.lm_head.weight.data_ptr()
+            == model.model.transformer.wte.weight.data_ptr()
+        )
+
+    def test_incompatible_model_kwargs_raise(self, tiny_checkpoint) -> None:
+        with pytest.raises(ValueError):
+            TransformersModel(
+                tiny_checkpoint,
+                "tiny",
+                10,
+                model_kwargs={"dtype": torch.bfloat16},
+                mmap_weights=True,
+            )
+
+    def test_quantization_profile_raises(self, tiny_checkpoint) -> None:
+        with pytest.raises(ValueError):
+            TransformersModel(
+                tiny_checkpoint,
+                "tiny",
+                10,
+                profile="cpu-int8",
+                mmap_weights=True,
+            )
+
+    def test_forked_worker_uses_mapped_weights(self, tiny_checkpoint) -> None:
+        model = TransformersModel(
+            tiny_checkpoint, "tiny", 10, mmap_weights=True
+        )
+        expected = model.prompt("sys", "hello")
+
+        # forked children inherit the mapping instead of reloading weights
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        worker = context.Process(
+            target=lambda: sender.send(model.prompt("sys", "hello"))
+        )
+        worker.start()
+        result = receiver.recv()
+        worker.join()
+        assert result == expected
+
+
+class TestTransformersModelPromptCache:
+
+    def test_encoding_matches_full_tokenization(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5)
+        for user_prompt in ["hi", "a longer message", ""]:
+            rendered = model._render_prompt("sys", user_prompt)
+            expected = model.tokenizer(rendered).input_ids
+            assert model._encode_prompt("sys", user_prompt) == expected
+
+    def test_prefix_cached_per_system_prompt(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5)
+        model._encode_prompt("sys", "first")
+
+        calls = []
+        render = model._render_prompt
+        monkeypatch.setattr(
+            model,
+            "_render_prompt",
+            lambda *args: calls.append(args) or render(*args),
+        )
+        model._encode_prompt("sys", "second")
+        assert calls == []
+
+        model._encode_prompt("other sys", "second")
+        assert calls
+
+    def test_output_unchanged_by_cache(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 10)
+        first = model.prompt("sys", "hello")
+        assert model.prompt("sys", "hello") == first
+
+    def test_fallback_without_chat_template(self, tiny_checkpoint) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 5)
+        model.tokenizer.chat_template = None
+        model._has_chat_template = False
+        assert model._render_prompt("sys", "hi") == (
+            "System: sys\nUser: hi\nAssistant:"
+        )
+        expected = model.tokenizer(
+            "System: sys\nUser: hi\nAssistant:"
+        ).input_ids
+        assert model._encode_prompt("sys", "hi") == expected
+
+
+class TestPromptMultiple:
+
+    def test_postprocessing_applied_to_each_response(self) -> None:
+        model = EchoModel("Hi User: there", stop_sequences=["User:"])
+        assert model.prompt_multiple("s", "u", 2) == ["Hi", "Hi"]
+
+    def test_invalid_number_of_responses_raises(self) -> None:
+        with pytest.raises(ValueError):
+            EchoModel("Hi").prompt_multiple("s", "u", 0)
+
+    def test_transformers_samples_in_one_call(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        model = TransformersModel(tiny_checkpoint, "tiny", 10)
+        calls = []
+        generate = model.model.generate
+
+        def spy_generate(**kwargs):
+            calls.append(kwargs)
+            return generate(**kwargs)
+
+        monkeypatch.setattr(model.model, "generate", spy_generate)
+        responses = model.prompt_multiple("sys", "hello", 4)
+        assert len(responses) == 4
+        assert all(isinstance(response, str) for response in responses)
+        assert len(calls) == 1
+        assert calls[0]["num_return_sequences"] == 4
+        assert calls[0]["do_sample"]
+
+    def test_transformers_assisted_generation_samples(
+        self, tiny_checkpoint, monkeypatch
+    ) -> None:
+        model = TransformersModel(
+            tiny_checkpoint,
+            "tiny",
+            20,
+            generation_kwargs={"assistant_model": tiny_checkpoint},
+        )
+        calls = []
+        generate = model.model.generate
+
+        def spy_generate(**kwargs):
+            calls.append(kwargs)
+            return generate(**kwargs)
+
+        monkeypatch.setattr(model.model, "generate", spy_generate)
+        torch.manual_seed(0)
+        responses = model.prompt_multiple("sys", "hello", 4)
+        assert len(responses) == 4
+        assert len(set(responses)) > 1
+        assert len(calls) == 4
+        assert all(call["do_sample"] for call in calls)
+
+    def test_transformers_user_generation_kwargs_override_defaults(
+        self, tiny_checkpoint
+    ) -> None:
+        model = TransformersModel(
+            tiny_checkpoint,
+            "tiny",
+            20,
+            generation_kwargs={"do_sample": True, "max_new_tokens": 3},
+        )
+        assert len(model.prompt("sys", "hello")) <= 3
+        assert len(model.prompt_multiple("sys", "hello", 2)) == 2
+
+    def test_openai_sends_n(self) -> None:
+        completions = FakeCompletions(contents=("a", "b"))
+        model = make_openai_model(completions)
+        assert model.prompt_multiple("sys", "usr", 2) == ["a", "b"]
+        assert completions.calls[0]["n"] == 2
+
+    def test_openai_single_response_omits_n(self) -> None:
+        completions = FakeCompletions()
+        model = make_openai_model(completions)
+        model.prompt_multiple("sys", "usr", 1)
+        assert "n" not in completions.calls[0]
+
+    def test_openai_missing_choices_raise(self) -> None:
+        completions = FakeCompletions()
+        model = make_openai_model(completions)
+        with pytest.raises(ValueError):
+            model.prompt_multiple("sys", "usr", 3)
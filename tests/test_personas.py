@@ -0,0 +1,129 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the on-disk persona store.
+"""
+
+import copy
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from syndisco import DiscussionExperiment, SQLitePersonaStore
+from .dummy import DummyModel
+
+
+def make_personas(num_personas: int):
+    for i in range(num_personas):
+        yield {"name": f"User{i}", "age": str(20 + i), "sex": "female"}
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SQLitePersonaStore:
+    return SQLitePersonaStore.create(
+        tmp_path / "personas.db",
+        make_personas(25),
+        model=DummyModel(["Hello."]),
+        context="A forum.",
+        instructions="Be polite.",
+    )
+
+
+class TestSQLitePersonaStore:
+
+    def test_length(self, store: SQLitePersonaStore) -> None:
+        assert len(store) == 25
+
+    def test_creates_actors(self, store: SQLitePersonaStore) -> None:
+        actor = store[3]
+        assert actor.get_actor_name() == "User3"
+        assert actor.persona == {"age": "23", "sex": "female"}
+        assert actor.context == "A forum."
+        assert actor.instructions == "Be polite."
+        assert actor.speak() == "Hello."
+
+    def test_shares_prompt_components(
+        self, store: SQLitePersonaStore
+    ) -> None:
+        assert store[0].context is store[1].context
+        assert store[0]._model is store[1]._model
+
+    def test_negative_and_slice_indices(
+        self, store: SQLitePersonaStore
+    ) -> None:
+        assert store[-1].get_actor_name() == "User24"
+        assert [a.get_actor_name() for a in store[1:4]] == [
+            "User1",
+            "User2",
+            "User3",
+        ]
+
+    def test_out_of_range(self, store: SQLitePersonaStore) -> None:
+        with pytest.raises(IndexError):
+            store[25]
+
+    def test_reopen(self, store: SQLitePersonaStore) -> None:
+        reopened = SQLitePersonaStore(store.path)
+        assert len(reopened) == 25
+        assert reopened[7].get_actor_name() == "User7"
+
+    def test_copy_reconnects(self, store: SQLitePersonaStore) -> None:
+        copied = copy.deepcopy(store)
+        assert copied[2].get_actor_name() == "User2"
+
+    def test_create_refuses_existing_file(
+        self, store: SQLitePersonaStore
+    ) -> None:
+        with pytest.raises(FileExistsError):
+            SQLitePersonaStore.create(store.path, make_personas(1))
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            SQLitePersonaStore(tmp_path / "missing.db")
+
+    def test_non_consecutive_ids(self, tmp_path: Path) -> None:
+        path = tmp_path / "personas.db"
+        SQLitePersonaStore.create(path, make_personas(3))
+        with sqlite3.connect(path) as connection:
+            connection.execute("DELETE FROM personas WHERE id = 2")
+        connection.close()
+        with pytest.raises(ValueError):
+            SQLitePersonaStore(path)
+
+    def test_not_a_store(self, tmp_path: Path) -> None:
+        path = tmp_path / "other.db"
+        sqlite3.connect(path).close()
+        with pytest.raises(ValueError):
+            SQLitePersonaStore(path)
+
+    def test_experiment_samples_from_store(
+        self, store: SQLitePersonaStore
+    ) -> None:
+        experiment = DiscussionExperiment(
+            users=store,
+            num_active_users=3,
+            num_discussions=2,
+            num_turns=3,
+            seed=0,
+        )
+        discussion = experiment.get_discussion(1)
+        discussion.begin(verbose=False)
+        names = {entry["name"] for entry in discussion.get_logs()}
+        assert names <= {f"User{i}" for i in range(25)}
+        assert len(discussion.get_logs()) == 3
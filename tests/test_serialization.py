@@ -0,0 +1,95 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the JSON serialization backends.
+
+Every test runs against each installed backend, with the faster ones
+disabled in turn to exercise the fallbacks.
+"""
+
+import json
+
+import pytest
+
+from syndisco import Logs, _serialization
+
+
+@pytest.fixture(params=["orjson", "msgspec", "json"])
+def backend(request, monkeypatch) -> str:
+    """Force a backend by disabling the ones preferred over it."""
+    name = request.param
+    if name != "json":
+        pytest.importorskip(name)
+    if name in ("msgspec", "json"):
+        monkeypatch.setattr(_serialization, "orjson", None)
+    if name == "json":
+        monkeypatch.setattr(_serialization, "msgspec", None)
+    assert _serialization.get_backend() == name
+    return name
+
+
+def make_logs() -> Logs:
+    logs = Logs()
+    logs.append(name="Alice", text="Héllo\n\"there\"", model="m", prompt="p")
+    logs.append(name="Bob", text="Hi", model="hardcoded")
+    return logs
+
+
+class TestSerialization:
+
+    def test_dumps_is_compact_json(self, backend: str) -> None:
+        data = {"logs": [{"name": "Alice", "text": "Héllo"}]}
+        encoded = _serialization.dumps(data)
+        assert b"\n" not in encoded
+        assert json.loads(encoded) == data
+
+    def test_loads_rejects_invalid_json(self, backend: str) -> None:
+        with pytest.raises(ValueError):
+            _serialization.loads(b"{not json")
+
+    def test_compact_export_round_trip(self, backend: str, tmp_path) -> None:
+        logs = make_logs()
+        out = tmp_path / "logs.json"
+        logs.export(out, compact=True)
+        assert len(out.read_text(encoding="utf8").splitlines()) == 1
+        assert Logs.from_file(out) == logs
+
+    def test_indented_export_round_trip(self, backend: str, tmp_path) -> None:
+        logs = make_logs()
+        out = tmp_path / "logs.json"
+        logs.export(out)
+        assert Logs.from_file(out) == logs
+
+    def test_missing_prompt_defaults_to_empty(self, backend: str) -> None:
+        data = b'{"logs": [{"name": "A", "text": "t", "model": "m"}]}'
+        (entry,) = _serialization.decode_log_entries(data)
+        assert entry["prompt"] == ""
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            b"[]",
+            b'{"logs": {}}',
+            b'{"logs": ["entry"]}',
+            b'{"logs": [{"name": "A", "text": "t"}]}',
+            b'{"logs": [{"name": "A", "text": 1, "model": "m"}]}',
+        ],
+    )
+    def test_rejects_invalid_schema(self, backend: str, document) -> None:
+        with pytest.raises(ValueError):
+            _serialization.decode_log_entries(document)
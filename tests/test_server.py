@@ -0,0 +1,246 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for ModelServer and its RemoteModel client.
+
+Servers run in a background thread on a free localhost port and serve
+deterministic stub models.
+"""
+
+import threading
+
+import pytest
+
+from syndisco import BaseModel, ModelServer, RemoteModel
+
+
+class UpperModel(BaseModel):
+    """Responds with the upper-cased user prompt, recording batch sizes."""
+
+    def __init__(self) -> None:
+        super().__init__("upper", 42, stop_list=["!"])
+        self.batch_sizes: list[int] = []
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        return user_prompt.upper()
+
+    def _generate_batch(self, prompts):
+        self.batch_sizes.append(len(prompts))
+        return super()._generate_batch(prompts)
+
+
+class SamplingModel(UpperModel):
+    """Numbers each sampled response, recording how many were sampled."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.num_sampled: list[int] = []
+
+    def _generate_responses(
+        self, system_prompt: str, user_prompt: str, num_responses: int
+    ) -> list[str]:
+        self.num_sampled.append(num_responses)
+        return [f"{user_prompt.upper()}{i}" for i in range(num_responses)]
+
+
+class FailingModel(BaseModel):
+    def __init__(self) -> None:
+        super().__init__("failing", 5)
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        raise RuntimeError("out of memory")
+
+
+class BlockingModel(BaseModel):
+    """Echoes the user prompt once released, signalling when it starts."""
+
+    def __init__(self) -> None:
+        super().__init__("blocking", 5)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _generate_response(self, system_prompt: str, user_prompt: str) -> str:
+        self.started.set()
+        self.release.wait()
+        return user_prompt
+
+
+@pytest.fixture()
+def served_model():
+    return UpperModel()
+
+
+@pytest.fixture()
+def server(served_model):
+    server = ModelServer(served_model, port=0, batch_timeout=0.05)
+    server.start()
+    yield server
+    server.shutdown()
+
+
+class TestModelServer:
+
+    def test_invalid_batch_size_raises(self, served_model) -> None:
+        with pytest.raises(ValueError):
+            ModelServer(served_model, port=0, max_batch_size=0)
+
+    def test_generate_returns_responses_in_order(self, server) -> None:
+        assert server.generate([("s", "a"), ("s", "b")]) == ["A", "B"]
+
+    def test_concurrent_prompts_are_batched(
+        self, server, served_model
+    ) -> None:
+        results = {}
+
+        def worker(i):
+            results[i] = server.generate([("s", f"p{i}")])[0]
+
+        threads = [
+            threading.Thread(target=worker, args=(i,)) for i in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {i: f"P{i}" for i in range(6)}
+        assert max(served_model.batch_sizes) > 1
+
+    def test_batches_respect_max_size(self, served_model) -> None:
+        server = ModelServer(
+            served_model, port=0, max_batch_size=2, batch_timeout=0.05
+        )
+        server.start()
+        try:
+            server.generate([("s", str(i)) for i in range(5)])
+        finally:
+            server.shutdown()
+        assert max(served_model.batch_sizes) <= 2
+
+    def test_generate_multiple_responses(self) -> None:
+        sampling_model = SamplingModel()
+        server = ModelServer(sampling_model, port=0, batch_timeout=0.05)
+        server.start()
+        try:
+            responses = server.generate([("s", "a"), ("s", "b")], 2)
+        finally:
+            server.shutdown()
+        assert responses == ["A0", "A1", "B0", "B1"]
+        assert sampling_model.num_sampled == [2, 2]
+
+    def test_invalid_num_responses_raises(self, server) -> None:
+        with pytest.raises(ValueError):
+            server.generate([("s", "a")], 0)
+
+    def test_shutdown_without_start(self, served_model) -> None:
+        server = ModelServer(served_model, port=0)
+        thread = threading.Thread(target=server.shutdown, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    def test_generate_after_shutdown_raises(self, served_model) -> None:
+        server = ModelServer(served_model, port=0)
+        server.start()
+        server.shutdown()
+        with pytest.raises(RuntimeError):
+            server.generate([("s", "a")])
+
+    def test_shutdown_fails_queued_prompts(self) -> None:
+        blocking_model = BlockingModel()
+        server = ModelServer(blocking_model, port=0, max_batch_size=1)
+        server.start()
+        results = {}
+
+        def worker(name):
+            try:
+                results[name] = server.generate([("s", name)])[0]
+            except RuntimeError as e:
+                results[name] = e
+
+        generating = threading.Thread(target=worker, args=("a",))
+        generating.start()
+        blocking_model.started.wait(timeout=5)
+        queued = threading.Thread(target=worker, args=("b",))
+        queued.start()
+        while server._pending.empty():
+            threading.Event().wait(0.01)
+
+        stopping = threading.Thread(target=server.shutdown)
+        stopping.start()
+        server._stopped.wait(timeout=5)
+        blocking_model.release.set()
+        for thread in (stopping, generating, queued):
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+        # the batch being generated completes, the rest fail
+        assert results["a"] == "a"
+        assert isinstance(results["b"], RuntimeError)
+
+
+class TestRemoteModel:
+
+    def test_uses_served_model_info(self, server) -> None:
+        remote = RemoteModel(server.url)
+        assert remote.get_name() == "upper"
+        assert remote.max_out_tokens == 42
+
+    def test_name_can_be_overridden(self, server) -> None:
+        assert RemoteModel(server.url, name="alias").get_name() == "alias"
+
+    def test_prompt(self, server) -> None:
+        assert RemoteModel(server.url).prompt("sys", "hello") == "HELLO"
+
+    def test_server_side_postprocessing_applied(self, server) -> None:
+        assert RemoteModel(server.url).prompt("sys", "hi!") == "HI"
+
+    def test_client_side_removal_applied(self, server) -> None:
+        remote = RemoteModel(server.url, remove_string_list=["L"])
+        assert remote.prompt("sys", "hello") == "HEO"
+
+    def test_prompt_batch(self, server) -> None:
+        remote = RemoteModel(server.url)
+        assert remote.prompt_batch([("s", "a"), ("s", "b")]) == ["A", "B"]
+
+    def test_prompt_multiple_sampled_by_server(self) -> None:
+        sampling_model = SamplingModel()
+        server = ModelServer(sampling_model, port=0)
+        server.start()
+        try:
+            responses = RemoteModel(server.url).prompt_multiple(
+                "sys", "hi", 3
+            )
+        finally:
+            server.shutdown()
+        assert responses == ["HI0", "HI1", "HI2"]
+        assert sampling_model.num_sampled == [3]
+
+    def test_server_errors_raise(self) -> None:
+        server = ModelServer(FailingModel(), port=0)
+        server.start()
+        try:
+            remote = RemoteModel(server.url)
+            with pytest.raises(RuntimeError, match="out of memory"):
+                remote.prompt("sys", "hello")
+        finally:
+            server.shutdown()
+
+    def test_unreachable_server_raises(self) -> None:
+        with pytest.raises(ConnectionError):
+            RemoteModel("http://127.0.0.1:1", timeout=1)
@@ -0,0 +1,184 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for DiscussionSweep.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from syndisco import (
+    DiscussionSweep,
+    RespondTurnManager,
+    SummaryMemory,
+    WeightedTurnManager,
+)
+from .dummy import DummyActor, DummyModel
+
+
+def make_users(n: int = 4) -> list[DummyActor]:
+    return [DummyActor(name=f"User{i}") for i in range(n)]
+
+
+class TestDiscussionSweepConstruction:
+
+    def test_unknown_parameter_raises(self) -> None:
+        with pytest.raises(ValueError):
+            DiscussionSweep(grid={"p_respond": [0.1]}, users=make_users())
+
+    def test_parameter_both_varied_and_fixed_raises(self) -> None:
+        with pytest.raises(ValueError):
+            DiscussionSweep(
+                grid={"num_turns": [2, 3]}, users=make_users(), num_turns=4
+            )
+
+    def test_empty_values_raise(self) -> None:
+        with pytest.raises(ValueError):
+            DiscussionSweep(grid={"num_turns": []}, users=make_users())
+
+    def test_random_seed_drawn_once(self) -> None:
+        sweep = DiscussionSweep(grid={"num_turns": [2]}, users=make_users())
+        assert isinstance(sweep.seed, int)
+
+
+class TestDiscussionSweepPlan:
+
+    def test_plan_is_cartesian_product(self) -> None:
+        sweep = DiscussionSweep(
+            grid={"num_turns": [2, 3], "history_ctx_len": [1, 2, 3]},
+            users=make_users(),
+        )
+        plan = sweep.plan()
+        assert len(plan) == 6
+        assert {"num_turns": 3, "history_ctx_len": 1} in plan
+
+    def test_duplicate_values_deduplicated(self) -> None:
+        sweep = DiscussionSweep(
+            grid={"num_turns": [2, 2, 3]}, users=make_users()
+        )
+        assert sweep.plan() == [{"num_turns": 2}, {"num_turns": 3}]
+
+    def test_equivalent_turn_managers_deduplicated(self) -> None:
+        sweep = DiscussionSweep(
+            grid={
+                "turn_manager": [
+                    RespondTurnManager(p_respond=0.2),
+                    RespondTurnManager(p_respond=0.2),
+                    RespondTurnManager(p_respond=0.6),
+                ]
+            },
+            users=make_users(),
+        )
+        assert len(sweep.plan()) == 2
+
+    def test_nested_settings_distinguish_turn_managers(self) -> None:
+        sweep = DiscussionSweep(
+            grid={
+                "turn_manager": [
+                    WeightedTurnManager(activity={"u0": 1}),
+                    WeightedTurnManager(activity={"u0": 50}),
+                ]
+            },
+            users=make_users(),
+        )
+        assert len(sweep.plan()) == 2
+
+    def test_different_summarizers_not_deduplicated(self) -> None:
+        sweep = DiscussionSweep(
+            grid={
+                "memory": [
+                    SummaryMemory(DummyModel(["a"])),
+                    SummaryMemory(DummyModel(["b"])),
+                ]
+            },
+            users=make_users(),
+        )
+        assert len(sweep.plan()) == 2
+
+    def test_pools_differing_in_model_not_deduplicated(self) -> None:
+        pools = []
+        for _ in range(2):
+            model = DummyModel(["a"])
+            users = make_users()
+            for user in users:
+                user._model = model
+            pools.append(users)
+        sweep = DiscussionSweep(grid={"users": pools})
+        assert len(sweep.plan()) == 2
+
+    def test_repeated_object_deduplicated(self) -> None:
+        memory = SummaryMemory(DummyModel(["a"]))
+        sweep = DiscussionSweep(
+            grid={"memory": [memory, memory]}, users=make_users()
+        )
+        assert len(sweep.plan()) == 1
+
+
+class TestDiscussionSweepBegin:
+
+    def make_sweep(self) -> DiscussionSweep:
+        return DiscussionSweep(
+            grid={"num_turns": [2, 3], "history_ctx_len": [1, 2]},
+            users=make_users(),
+            num_discussions=1,
+            seed=0,
+        )
+
+    def test_writes_one_directory_per_config(self, tmp_path: Path) -> None:
+        self.make_sweep().begin(tmp_path, verbose=False)
+        config_dirs = sorted(p for p in tmp_path.iterdir() if p.is_dir())
+        assert len(config_dirs) == 4
+        assert all(list(d.glob("*.json")) for d in config_dirs)
+
+    def test_writes_plan(self, tmp_path: Path) -> None:
+        self.make_sweep().begin(tmp_path, verbose=False)
+        manifest = json.loads((tmp_path / "plan.json").read_text())
+        assert manifest["seed"] == 0
+        assert manifest["configs"][0] == {
+            "name": "config_000",
+            "params": {"num_turns": 2, "history_ctx_len": 1},
+        }
+        assert [u["name"] for u in manifest["fixed"]["users"]] == [
+            f"User{i}" for i in range(4)
+        ]
+
+    def test_configs_follow_parameters(self, tmp_path: Path) -> None:
+        self.make_sweep().begin(tmp_path, verbose=False)
+        manifest = json.loads((tmp_path / "plan.json").read_text())
+        for config in manifest["configs"]:
+            output = next((tmp_path / config["name"]).glob("*.json"))
+            logs = json.loads(output.read_text())["logs"]
+            assert len(logs) == config["params"]["num_turns"]
+
+    def test_configs_share_discussion_participants(
+        self, tmp_path: Path
+    ) -> None:
+        sweep = self.make_sweep()
+        sweep.begin(tmp_path, verbose=False)
+        participants = [
+            {
+                entry["name"]
+                for entry in json.loads(next(d.glob("*.json")).read_text())[
+                    "logs"
+                ]
+            }
+            for d in sorted(p for p in tmp_path.iterdir() if p.is_dir())
+        ]
+        assert all(p == participants[0] for p in participants)
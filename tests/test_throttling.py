@@ -0,0 +1,312 @@
+# SynDisco: Automated experiment creation and execution using only LLM agents
+# Copyright (C) 2025 Dimitris Tsirmpas
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# You may contact the author at dim.tsirmpas@aueb.gr
+"""
+Test suite for the rate limiting and retry utilities.
+
+A fake clock replaces real time, so that no test actually sleeps.
+"""
+
+import random
+import threading
+
+import pytest
+
+from syndisco._throttling import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    TokenBucket,
+    retry_with_backoff,
+)
+
+
+class FakeClock:
+    """A clock which only advances when something sleeps on it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TransientError(Exception):
+    pass
+
+
+class FatalError(Exception):
+    pass
+
+
+def flaky(num_failures: int, error: type[Exception] = TransientError):
+    """Return a function which fails *num_failures* times, then succeeds."""
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= num_failures:
+            raise error("failure")
+        return "ok"
+
+    func.calls = calls  # type: ignore
+    return func
+
+
+class TestTokenBucket:
+
+    def test_starts_full(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(10, 1, clock=clock, sleep=clock.sleep)
+        for _ in range(10):
+            bucket.acquire()
+        assert clock.sleeps == []
+
+    def test_blocks_when_empty(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(2, 1, clock=clock, sleep=clock.sleep)
+        bucket.acquire(2)
+        bucket.acquire(1)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_refill_is_capped_at_capacity(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(2, 1, clock=clock, sleep=clock.sleep)
+        clock.now = 100
+        bucket.acquire(2)
+        bucket.acquire(1)
+        assert clock.now == pytest.approx(101.0)
+
+    def test_oversized_request_is_clamped(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(5, 1, clock=clock, sleep=clock.sleep)
+        bucket.acquire(50)
+        assert clock.sleeps == []
+
+    def test_release_returns_tokens(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(5, 1, clock=clock, sleep=clock.sleep)
+        bucket.acquire(5)
+        bucket.release(3)
+        bucket.acquire(3)
+        assert clock.sleeps == []
+
+    def test_invalid_capacity_raises(self) -> None:
+        with pytest.raises(ValueError):
+            TokenBucket(0, 1)
+
+
+class TestRateLimiter:
+
+    def test_no_limits_never_blocks(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+        for _ in range(1000):
+            limiter.acquire(10_000)
+        assert clock.sleeps == []
+
+    def test_requests_per_minute(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(
+            requests_per_minute=60, clock=clock, sleep=clock.sleep
+        )
+        for _ in range(61):
+            limiter.acquire(1)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_tokens_per_minute(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(
+            tokens_per_minute=600, clock=clock, sleep=clock.sleep
+        )
+        limiter.acquire(600)
+        limiter.acquire(100)
+        assert clock.now == pytest.approx(10.0)
+
+    def test_refund_frees_token_budget(self) -> None:
+        clock = FakeClock()
+        limiter = RateLimiter(
+            tokens_per_minute=600, clock=clock, sleep=clock.sleep
+        )
+        limiter.acquire(600)
+        limiter.refund(500)
+        limiter.acquire(500)
+        assert clock.sleeps == []
+
+
+class TestRetryWithBackoff:
+
+    def test_returns_on_first_success(self) -> None:
+        clock = FakeClock()
+        func = flaky(0)
+        result = retry_with_backoff(
+            func, lambda e: True, max_retries=3, sleep=clock.sleep
+        )
+        assert result == "ok"
+        assert clock.sleeps == []
+
+    def test_retries_retryable_errors(self) -> None:
+        clock = FakeClock()
+        func = flaky(2)
+        result = retry_with_backoff(
+            func,
+            lambda e: isinstance(e, TransientError),
+            max_retries=3,
+            sleep=clock.sleep,
+        )
+        assert result == "ok"
+        assert len(func.calls) == 3  # type: ignore
+        assert len(clock.sleeps) == 2
+
+    def test_raises_after_max_retries(self) -> None:
+        clock = FakeClock()
+        func = flaky(10)
+        with pytest.raises(TransientError):
+            retry_with_backoff(
+                func, lambda e: True, max_retries=2, sleep=clock.sleep
+            )
+        assert len(func.calls) == 3  # type: ignore
+
+    def test_non_retryable_error_raises_immediately(self) -> None:
+        clock = FakeClock()
+        func = flaky(1, error=FatalError)
+        with pytest.raises(FatalError):
+            retry_with_backoff(
+                func,
+                lambda e: isinstance(e, TransientError),
+                max_retries=5,
+                sleep=clock.sleep,
+            )
+        assert clock.sleeps == []
+
+    def test_delays_are_jittered_and_bounded(self) -> None:
+        clock = FakeClock()
+        retry_with_backoff(
+            flaky(6),
+            lambda e: True,
+            max_retries=6,
+            base_delay=1.0,
+            max_delay=4.0,
+            sleep=clock.sleep,
+            rng=random.Random(0),
+        )
+        ceilings = [1.0, 2.0, 4.0, 4.0, 4.0, 4.0]
+        for delay, ceiling in zip(clock.sleeps, ceilings):
+            assert 0 <= delay <= ceiling
+        assert len(set(clock.sleeps)) > 1
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    def test_starts_at_min_limit(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(max_limit=10, min_limit=2)
+        assert limiter.limit == 2
+
+    def test_invalid_limits_raise(self) -> None:
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(max_limit=2, min_limit=3)
+
+    def test_invalid_backoff_factor_raises(self) -> None:
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(max_limit=2, backoff_factor=1.5)
+
+    def test_additive_increase_on_success(self) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(max_limit=10, clock=clock)
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+        assert 2 < limiter.limit < 10
+
+    def test_increase_capped_at_max_limit(self) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(max_limit=3, clock=clock)
+        for _ in range(100):
+            limiter.release(limiter.acquire())
+        assert limiter.limit == 3
+
+    def test_multiplicative_decrease_on_overload(self) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=16, initial_limit=16, clock=clock
+        )
+        start = limiter.acquire()
+        clock.now += 1
+        limiter.release(start, overloaded=True)
+        assert limiter.limit == 8
+
+    def test_decrease_bounded_by_min_limit(self) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=16, min_limit=2, initial_limit=4, clock=clock
+        )
+        for _ in range(5):
+            start = limiter.acquire()
+            clock.now += 1
+            limiter.release(start, overloaded=True)
+        assert limiter.limit == 2
+
+    def test_requests_from_before_decrease_do_not_decrease_again(
+        self,
+    ) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=16, initial_limit=16, clock=clock
+        )
+        starts = [limiter.acquire() for _ in range(4)]
+        clock.now += 1
+        for start in starts:
+            limiter.release(start, overloaded=True)
+        assert limiter.limit == 8
+
+    def test_slow_requests_count_as_overload(self) -> None:
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=16, initial_limit=16, latency_threshold=2, clock=clock
+        )
+        start = limiter.acquire()
+        clock.now += 5
+        limiter.release(start)
+        assert limiter.limit == 8
+
+    def test_metrics_report_limit_and_in_flight(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, initial_limit=3)
+        limiter.acquire()
+        assert limiter.get_metrics() == {
+            "concurrency_limit": 3,
+            "in_flight": 1,
+        }
+
+    def test_blocks_when_limit_reached(self) -> None:
+        limiter = AdaptiveConcurrencyLimiter(max_limit=1)
+        start = limiter.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(timeout=0.1)
+
+        limiter.release(start)
+        assert acquired.wait(timeout=5)
+        thread.join()
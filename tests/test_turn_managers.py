@@ -29,7 +29,10 @@ from syndisco import (
     Actor,
     DiscussionExperiment,
     RandomTurnManager,
+    WeightedTurnManager,
+    HawkesTurnManager,
 )
+from syndisco._sampling import AliasTable, FenwickTree
 
 
 @pytest.fixture
@@ -128,6 +131,65 @@ class TestSuperclass:
         assert second in actors
 
 
+class TestFork:
+    @pytest.mark.parametrize(
+        "make_tm",
+        [
+            lambda a: QueueTurnManager(
+                a,
+                randomize_first_speaker=True,
+                random_state=np.random.default_rng(0),
+            ),
+            lambda a: RespondTurnManager(
+                a, p_respond=0.5, random_state=np.random.default_rng(0)
+            ),
+            lambda a: RandomTurnManager(
+                a, random_state=np.random.default_rng(0)
+            ),
+        ],
+    )
+    def test_fork_continues_identically(self, actors, make_tm):
+        tm = make_tm(actors)
+        for _ in range(3):
+            tm.next()
+
+        forked = tm.fork()
+        assert [forked.next() for _ in range(20)] == [
+            tm.next() for _ in range(20)
+        ]
+
+    def test_fork_shares_actors(self, actors):
+        tm = RespondTurnManager(actors)
+        tm.next()
+        forked = tm.fork()
+        assert all(a is b for a, b in zip(forked._actors, actors))
+        assert forked._last_speaker is tm._last_speaker
+
+    def test_fork_is_independent(self, actors):
+        tm = QueueTurnManager(actors)
+        forked = tm.fork()
+        forked.next()
+        assert tm.next() is actors[0]
+
+
+class TestRandomState:
+    def test_make_instance_uses_given_generator(self, actors):
+        tm = RespondTurnManager(actors)
+        rng = np.random.default_rng(0)
+        assert tm.make_instance(rng)._rng is rng
+
+    def test_make_instance_shares_generator_by_default(self, actors):
+        tm = QueueTurnManager(actors)
+        assert tm.make_instance()._rng is tm._rng
+
+    def test_random_turn_manager_honors_seed(self, actors):
+        tm1 = RandomTurnManager(actors, random_seed=3)
+        tm2 = RandomTurnManager(actors, random_seed=3)
+        assert [tm1.next() for _ in range(30)] == [
+            tm2.next() for _ in range(30)
+        ]
+
+
 class TestRounRobin:
     def test_round_robin_cycles(self, actors):
         rr = QueueTurnManager(actors)
@@ -304,8 +366,8 @@ class TestNoDuplicateActors:
         Each Discussion created by _create_synthetic_discussion must
         contain no duplicate Actor instances (by identity).
         """
-        for _ in range(20):
-            discussion = minimal_experiment._create_synthetic_discussion()
+        for i in range(20):
+            discussion = minimal_experiment._create_synthetic_discussion(i)
             user_ids = [id(u) for u in discussion._users]
             assert len(user_ids) == len(set(user_ids)), (
                 "Duplicate Actor objects found in discussion._users. "
@@ -317,8 +379,8 @@ class TestNoDuplicateActors:
         The TurnManager's internal actor list must not contain the same
         Actor object more than once after _create_synthetic_discussion.
         """
-        for _ in range(20):
-            discussion = minimal_experiment._create_synthetic_discussion()
+        for i in range(20):
+            discussion = minimal_experiment._create_synthetic_discussion(i)
             tm_actor_ids = [
                 id(a) for a in discussion._next_turn_manager._actors
             ]
@@ -331,8 +393,8 @@ class TestNoDuplicateActors:
         Since each fixture actor has a unique name, no name should repeat
         within a single discussion's participant list.
         """
-        for _ in range(20):
-            discussion = minimal_experiment._create_synthetic_discussion()
+        for i in range(20):
+            discussion = minimal_experiment._create_synthetic_discussion(i)
             names = [u.get_actor_name() for u in discussion._users]
             counts = Counter(names)
             duplicates = {n: c for n, c in counts.items() if c > 1}
@@ -352,8 +414,8 @@ class TestNoDuplicateActors:
             num_discussions=10,
             num_turns=2,
         )
-        for _ in range(10):
-            discussion = exp._create_synthetic_discussion()
+        for i in range(10):
+            discussion = exp._create_synthetic_discussion(i)
             assert len(discussion._users) == num_active
 
     def test_discussion_draws_from_provided_pool(self, actors):
@@ -368,8 +430,8 @@ class TestNoDuplicateActors:
             num_turns=2,
         )
         actor_ids = {id(a) for a in actors}
-        for _ in range(10):
-            discussion = exp._create_synthetic_discussion()
+        for i in range(10):
+            discussion = exp._create_synthetic_discussion(i)
             for user in discussion._users:
                 assert (
                     id(user) in actor_ids
@@ -398,7 +460,7 @@ class TestExperimentValidation:
             num_discussions=1,
             num_turns=2,
         )
-        discussion = exp._create_synthetic_discussion()
+        discussion = exp._create_synthetic_discussion(0)
         user_ids = [id(u) for u in discussion._users]
         assert len(user_ids) == len(set(user_ids))
 
@@ -539,3 +601,211 @@ class TestRandomTurnManager:
 
         for _ in range(20):
             assert tm2.next() in actors
+
+
+class TestConstantTimeSampling:
+
+    @staticmethod
+    def reference_random_actor(actors, rng, exclude):
+        """The previous, candidate-list based selection."""
+        candidates = [actor for actor in actors if actor != exclude]
+        return candidates[rng.integers(low=0, high=len(candidates))]
+
+    def test_exclusion_matches_candidate_list(self, actors):
+        tm = RespondTurnManager(
+            actors, p_respond=0.3, random_state=np.random.default_rng(5)
+        )
+        reference_rng = np.random.default_rng(5)
+        for exclude in actors * 20:
+            expected = self.reference_random_actor(
+                actors, reference_rng, exclude
+            )
+            assert tm._random_actor(exclude=exclude) is expected
+
+    def test_duplicate_actors_are_all_excluded(self):
+        alice, bob = DummyActor("Alice"), DummyActor("Bob")
+        tm = RandomTurnManager([alice, alice, bob], random_seed=0)
+        for _ in range(50):
+            assert tm._random_actor(exclude=alice) is bob
+
+    def test_unknown_excluded_actor(self, actors):
+        tm = RandomTurnManager(actors, random_seed=0)
+        outsider = DummyActor("Outsider")
+        assert tm._random_actor(exclude=outsider) in actors
+
+    def test_set_actors_updates_positions(self, actors):
+        tm = RandomTurnManager(actors[:2], random_seed=0)
+        tm.set_actors(actors[2:])
+        for _ in range(20):
+            assert tm._random_actor(exclude=actors[2]) in actors[3:]
+
+
+class TestAliasTable:
+
+    def test_matches_weights(self):
+        table = AliasTable([1, 2, 0, 5])
+        rng = np.random.default_rng(0)
+        counts = Counter(table.sample(rng) for _ in range(40000))
+        assert counts[2] == 0
+        for index, weight in [(0, 1), (1, 2), (3, 5)]:
+            assert counts[index] / 40000 == pytest.approx(weight / 8, abs=0.01)
+
+    @pytest.mark.parametrize("weights", [[], [0, 0], [1, -1], [np.inf]])
+    def test_invalid_weights(self, weights):
+        with pytest.raises(ValueError):
+            AliasTable(weights)
+
+
+class TestWeightedTurnManager:
+
+    def test_no_consecutive_repetition(self, actors):
+        tm = WeightedTurnManager(
+            actors,
+            activity={"User0": 50},
+            random_state=np.random.default_rng(0),
+        )
+        assert_no_consecutive_repetition([tm.next() for _ in range(500)])
+
+    def test_activity_levels(self, actors):
+        tm = WeightedTurnManager(
+            actors,
+            activity={"User0": 4, "User1": 0},
+            random_state=np.random.default_rng(0),
+        )
+        counts = Counter(tm.next().get_actor_name() for _ in range(5000))
+        assert counts["User1"] == 0
+        # User0 can not speak twice in a row, so it takes about 40% of the
+        # turns, and each of the other active users about 20%
+        assert counts["User0"] / 5000 == pytest.approx(0.4, abs=0.03)
+        assert counts["User2"] / 5000 == pytest.approx(0.2, abs=0.03)
+
+    def test_dominant_speaker_falls_back(self):
+        alice, bob = DummyActor("Alice"), DummyActor("Bob")
+        tm = WeightedTurnManager(
+            [alice, bob],
+            activity={"Alice": 1e9},
+            random_state=np.random.default_rng(0),
+        )
+        assert [tm.next() for _ in range(4)] == [alice, bob, alice, bob]
+
+    def test_single_active_speaker_repeats(self):
+        alice, bob = DummyActor("Alice"), DummyActor("Bob")
+        tm = WeightedTurnManager(
+            [alice, bob],
+            activity={"Bob": 0},
+            random_state=np.random.default_rng(0),
+        )
+        assert [tm.next() for _ in range(3)] == [alice] * 3
+
+    def test_negative_activity_rejected(self):
+        with pytest.raises(ValueError):
+            WeightedTurnManager(activity={"User0": -1})
+
+    def test_make_instance_and_fork(self, actors):
+        tm = WeightedTurnManager(
+            activity={"User0": 2}, random_state=np.random.default_rng(0)
+        )
+        instance = tm.make_instance()
+        instance.set_actors(actors)
+        instance.next()
+        forked = instance.fork()
+        assert [forked.next() for _ in range(20)] == [
+            instance.next() for _ in range(20)
+        ]
+
+    def test_in_experiment(self, actors):
+        experiment = DiscussionExperiment(
+            users=actors,
+            turn_manager=WeightedTurnManager(activity={"User0": 3}),
+            num_active_users=3,
+            num_discussions=2,
+            num_turns=4,
+            seed=1,
+        )
+        discussion = experiment.get_discussion(0)
+        discussion.begin(verbose=False)
+        assert len(discussion.get_logs()) == 4
+
+
+class TestFenwickTree:
+
+    def test_add_and_total(self):
+        tree = FenwickTree([1.0, 0.0, 2.0])
+        tree.add(1, 3.0)
+        assert tree.values() == [1.0, 3.0, 2.0]
+        assert tree.total == 6.0
+
+    def test_sample_matches_values(self):
+        tree = FenwickTree([0.0] * 7)
+        tree.add(2, 1.0)
+        tree.add(6, 3.0)
+        rng = np.random.default_rng(0)
+        counts = Counter(tree.sample(rng) for _ in range(20000))
+        assert set(counts) == {2, 6}
+        assert counts[6] / 20000 == pytest.approx(0.75, abs=0.02)
+
+
+class TestHawkesTurnManager:
+
+    def make(self, actors, **kwargs):
+        return HawkesTurnManager(
+            actors, random_state=np.random.default_rng(0), **kwargs
+        )
+
+    def test_no_consecutive_repetition(self, actors):
+        tm = self.make(actors, self_excitation=10)
+        assert_no_consecutive_repetition([tm.next() for _ in range(500)])
+
+    def test_excitation_and_decay(self, actors):
+        tm = self.make(
+            actors, self_excitation=2, reply_excitation=1, decay=0.5
+        )
+        first = tm.next()
+        second = tm.next()
+        intensities = dict(zip(actors, tm.get_intensities()))
+        # the first speaker's own excitation decayed once, and it was
+        # replied to by the second speaker
+        assert intensities[first] == pytest.approx(1 + 2 * 0.5 + 1)
+        assert intensities[second] == pytest.approx(1 + 2)
+
+    def test_replies_create_exchanges(self, actors):
+        tm = self.make(actors, reply_excitation=50, decay=0.9)
+        speakers = [tm.next() for _ in range(300)]
+        back_and_forth = sum(
+            speakers[i] is speakers[i - 2] for i in range(2, len(speakers))
+        )
+        # far more than the 1 in 4 of uniformly random speakers
+        assert back_and_forth > 0.4 * len(speakers)
+
+    def test_renormalization_keeps_intensities(self, actors):
+        tm = self.make(actors, decay=0.1)
+        for _ in range(200):
+            tm.next()
+        assert tm._scale >= 1e-150
+        assert all(np.isfinite(tm.get_intensities()))
+        assert min(tm.get_intensities()) >= 1
+
+    def test_fork_continues_identically(self, actors):
+        tm = self.make(actors)
+        for _ in range(5):
+            tm.next()
+        forked = tm.fork()
+        assert [forked.next() for _ in range(20)] == [
+            tm.next() for _ in range(20)
+        ]
+
+    def test_make_instance_resets_excitation(self, actors):
+        tm = self.make(actors)
+        for _ in range(5):
+            tm.next()
+        instance = tm.make_instance()
+        instance.set_actors(actors)
+        assert instance.get_intensities() == [1.0] * len(actors)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"decay": 0}, {"decay": 1.5}, {"self_excitation": -1}],
+    )
+    def test_invalid_parameters(self, kwargs):
+        with pytest.raises(ValueError):
+            HawkesTurnManager(**kwargs)